@@ -0,0 +1,3 @@
+"""
+omega_numpy_container — Omega Phi 8888 Hz engines and the Leidenfrost vortex.
+"""
@@ -2,10 +2,13 @@ import os
 import sys
 import time
 import math
-from typing import Tuple
+import threading
+from typing import Optional, Tuple
 
 import numpy as np
-from omega_vortex_drop import LeidenfrostVortex, PHI
+
+from sky import sky_profiler, sky_metrics, adaptive_blocks
+from .omega_vortex_drop import LeidenfrostVortex, PHI
 
 OMEGA_ROOT = os.path.dirname(os.path.abspath(__file__))
 SESSION_FILE = os.path.join(OMEGA_ROOT, "omega_session_omega.txt")
@@ -16,14 +19,23 @@ DT = 1.0 / TARGET_HZ
 SAMPLE_RATE = 44100
 CONTROL_HZ = 1000.0  # control loop for parameter updates
 
-# Try to get sounddevice
-try:
-    import sounddevice as sd  # type: ignore
-    HAS_SD = True
-    SD_IMPORT_ERROR = None
-except Exception as e:  # pragma: no cover
-    HAS_SD = False
-    SD_IMPORT_ERROR = e
+# sounddevice is imported on first use (stream start), not at import.
+_SD = None
+SD_IMPORT_ERROR: Optional[BaseException] = None
+
+
+def load_sounddevice():
+    """
+    The sounddevice module, or None (see SD_IMPORT_ERROR) when unavailable.
+    """
+    global _SD, SD_IMPORT_ERROR
+    if _SD is None and SD_IMPORT_ERROR is None:
+        try:
+            import sounddevice  # type: ignore
+            _SD = sounddevice
+        except Exception as e:  # pragma: no cover
+            SD_IMPORT_ERROR = e
+    return _SD
 
 
 def load_session(path: str) -> str:
@@ -114,8 +126,10 @@ class OmegaAudioEngine:
     - Amplitudes are smoothed per block to avoid static hiss.
     """
 
-    def __init__(self, sample_rate: int, top_hz: float):
+    def __init__(self, sample_rate: int, top_hz: float, start_stream: bool = True,
+                 metrics: Optional[sky_metrics.EngineMetrics] = None):
         self.sample_rate = sample_rate
+        self.metrics = metrics or sky_metrics.EngineMetrics()
         self.freqs = build_phi_octave_freqs(top_hz)
 
         self._amps = np.zeros(4, dtype=np.float64)
@@ -127,71 +141,87 @@ class OmegaAudioEngine:
         self._panL = np.sqrt(0.5 * (1.0 - self._pan))  # constant-power panning
         self._panR = np.sqrt(0.5 * (1.0 + self._pan))
 
-        self._lock = None  # created after numpy import
         self._global_gain = 0.8
         self._smoothing = 0.08  # 0..1, per audio block
 
-        import threading  # local import to avoid confusion
         self._lock = threading.Lock()
         self._stream = None
         self._running = False
 
-        if HAS_SD:
+        if start_stream and load_sounddevice() is not None:
             self._start_stream()
-        else:  # pragma: no cover
+        elif start_stream:  # pragma: no cover
             print("[!] sounddevice is NOT available. Audio will be TIMING ONLY.", file=sys.stderr)
             if SD_IMPORT_ERROR is not None:
                 print(f"[!] Import error was: {SD_IMPORT_ERROR}", file=sys.stderr)
 
-    def _start_stream(self) -> None:
-        def callback(outdata, frames, time_info, status):  # type: ignore[override]
-            if status:  # pragma: no cover
-                print(f"[sd] status: {status}", file=sys.stderr)
-
-            t = np.arange(frames, dtype=np.float64)
-
-            with self._lock:
-                freqs = self.freqs.copy()
-                amps = self._amps.copy()
-                amps_target = self._amps_target.copy()
-                phases = self._phases.copy()
-                panL = self._panL.copy()
-                panR = self._panR.copy()
+    def render(self, frames: int) -> np.ndarray:
+        """
+        Synthesize the next `frames` stereo samples as (frames, 2) float32
+        and advance the oscillator state (what the stream callback plays).
+        """
+        t = np.arange(frames, dtype=np.float64)
 
-            # Smooth amplitudes toward target (single-pole lowpass)
-            alpha = self._smoothing
-            amps = amps + alpha * (amps_target - amps)
+        with self._lock:
+            freqs = self.freqs.copy()
+            amps = self._amps.copy()
+            amps_target = self._amps_target.copy()
+            phases = self._phases.copy()
+            panL = self._panL.copy()
+            panR = self._panR.copy()
 
-            phase_inc = 2.0 * math.pi * freqs / self.sample_rate
-            phases_mat = phases[:, None] + phase_inc[:, None] * t[None, :]
+        # Smooth amplitudes toward target (single-pole lowpass)
+        alpha = self._smoothing
+        amps = amps + alpha * (amps_target - amps)
 
-            sines = np.sin(phases_mat)
-            osc = amps[:, None] * sines  # (4, frames)
+        phase_inc = 2.0 * math.pi * freqs / self.sample_rate
+        phases_mat = phases[:, None] + phase_inc[:, None] * t[None, :]
 
-            left = np.sum(osc * panL[:, None], axis=0)
-            right = np.sum(osc * panR[:, None], axis=0)
+        sines = np.sin(phases_mat)
+        osc = amps[:, None] * sines  # (4, frames)
 
-            # Update phases (advance by frames)
-            phases = phases + phase_inc * frames
-            phases = np.mod(phases, 2.0 * math.pi)
+        left = np.sum(osc * panL[:, None], axis=0)
+        right = np.sum(osc * panR[:, None], axis=0)
 
-            with self._lock:
-                self._amps[:] = amps
-                self._phases[:] = phases
+        # Update phases (advance by frames)
+        phases = phases + phase_inc * frames
+        phases = np.mod(phases, 2.0 * math.pi)
 
-            # Soft limiter / safety
-            left = np.tanh(self._global_gain * left)
-            right = np.tanh(self._global_gain * right)
+        with self._lock:
+            self._amps[:] = amps
+            self._phases[:] = phases
 
-            outdata[:, 0] = left.astype(np.float32)
-            outdata[:, 1] = right.astype(np.float32)
+        # Soft limiter / safety
+        out = np.empty((frames, 2), dtype=np.float32)
+        out[:, 0] = np.tanh(self._global_gain * left)
+        out[:, 1] = np.tanh(self._global_gain * right)
+        return out
 
-        self._stream = sd.OutputStream(
-            samplerate=self.sample_rate,
-            channels=2,  # stereo: 4 flame tips folded into L/R
-            dtype="float32",
-            callback=callback,
-            blocksize=0,
+    def _start_stream(self) -> None:
+        def callback(outdata, frames, time_info, status):  # type: ignore[override]
+            if status:  # pragma: no cover
+                print(f"[sd] status: {status}", file=sys.stderr)
+            outdata[:] = self.render(frames)
+
+        def open_stream(block, cb):
+            return load_sounddevice().OutputStream(
+                samplerate=self.sample_rate,
+                channels=2,  # stereo: 4 flame tips folded into L/R
+                dtype="float32",
+                callback=cb,
+                blocksize=block,
+            )
+
+        # Adaptive: start at 1024 and follow callback load; pinned (env
+        # SKY_BLOCK_LATENCY_MS=off): let the host pick (blocksize=0).
+        bounds = adaptive_blocks.latency_bounds_from_env()
+        self.blocks = adaptive_blocks.BlockSizeController(
+            "omega_phi", self.sample_rate, 1024 if bounds else 0, bounds)
+        self._stream = adaptive_blocks.AdaptiveStream(
+            open_stream,
+            sky_metrics.instrument_callback(sky_profiler.wrap(callback), self.metrics),
+            self.blocks,
+            output=True,
         )
         self._stream.start()
         self._running = True
@@ -225,12 +255,79 @@ class OmegaAudioEngine:
 
     def stop(self) -> None:
         if self._stream is not None:
-            self._stream.stop()
             self._stream.close()
         self._running = False
 
 
+def run_rail(session: str,
+             audio: OmegaAudioEngine,
+             vortex: Optional[LeidenfrostVortex] = None,
+             stop: Optional[threading.Event] = None,
+             metrics: Optional[sky_metrics.EngineMetrics] = None) -> None:
+    """
+    The 8888 Hz timing rail: drive the audio engine from the session at
+    ~CONTROL_HZ until stop is set (or forever when stop is None).
+    """
+    metrics = metrics or sky_metrics.EngineMetrics()
+    vortex = vortex or LeidenfrostVortex()
+    has_sd = load_sounddevice() is not None
+    t0 = time.perf_counter()
+    next_report_t = 1.0  # first status at ~1s
+    reported_tick = 0
+
+    while stop is None or not stop.is_set():
+        sky_profiler.tick()
+        loop_start = time.perf_counter()
+        elapsed_s = loop_start - t0
+        if elapsed_s <= 0:
+            elapsed_s = 1e-9
+
+        # Virtual 8888 Hz tick based on REAL time:
+        tick_virtual = int(elapsed_s * TARGET_HZ)
+
+        ch = session[tick_virtual % len(session)]
+        base_amp = char_to_base_amp(ch)
+
+        z_norm = vortex.z_from_tick(tick_virtual, TARGET_HZ, sweep_period_s=8.0)
+        xyz, gain = vortex.sample_xyz_and_gain(z_norm)
+        total_amp = base_amp * gain
+
+        if has_sd:
+            audio.update_from_char(ch, total_amp, xyz)
+
+        if elapsed_s >= next_report_t:
+            actual_hz = tick_virtual / elapsed_s
+            drift = ((actual_hz - TARGET_HZ) / TARGET_HZ) * 100.0
+            metrics.ticks.inc(tick_virtual - reported_tick)
+            metrics.tick_rate.set(actual_hz)
+            metrics.drift.set(drift)
+            reported_tick = tick_virtual
+            sec = int(round(elapsed_s))
+
+            print(
+                f"[status] tick={tick_virtual:8d}, t={sec:4d}.000s, "
+                f"actual ~ {actual_hz:8.3f} Hz, drift_perc={drift:7.3f}%"
+            )
+            tag = "" if has_sd else " [TIMING ONLY]"
+            print(
+                f"[audio]  tick={tick_virtual:8d}, omega_char='{ch}', "
+                f"omega_amp={total_amp:6.3f}, "
+                f"omega_xyz=({xyz[0]:0.3f},{xyz[1]:0.3f},{xyz[2]:0.3f}){tag}"
+            )
+
+            next_report_t += 1.0
+
+        # Control loop pacing (~1 kHz)
+        control_dt = 1.0 / CONTROL_HZ
+        elapsed_loop = time.perf_counter() - loop_start
+        to_sleep = control_dt - elapsed_loop
+        if to_sleep > 0:
+            time.sleep(to_sleep)
+
+
 def main() -> None:
+    sky_profiler.install("omega_phi_8888_engine")
+    sky_metrics.serve("omega_phi_8888_engine")
     print("=== Omega Phi 8888 Hz Leidenfrost Flame Engine (ENDLESS TUNING FORK) ===")
     print(f"[+] OMEGA_ROOT : {OMEGA_ROOT}")
     print(f"[+] SESSION    : {SESSION_FILE}")
@@ -242,57 +339,11 @@ def main() -> None:
     vortex = LeidenfrostVortex()
     audio = OmegaAudioEngine(SAMPLE_RATE, TARGET_HZ)
 
-    if not HAS_SD:
+    if load_sounddevice() is None:
         print("[!] Audio = TIMING ONLY (no sounddevice).")
 
-    t0 = time.perf_counter()
-    next_report_t = 1.0  # first status at ~1s
-
     try:
-        while True:
-            loop_start = time.perf_counter()
-            elapsed_s = loop_start - t0
-            if elapsed_s <= 0:
-                elapsed_s = 1e-9
-
-            # Virtual 8888 Hz tick based on REAL time:
-            tick_virtual = int(elapsed_s * TARGET_HZ)
-
-            ch = session[tick_virtual % len(session)]
-            base_amp = char_to_base_amp(ch)
-
-            z_norm = vortex.z_from_tick(tick_virtual, TARGET_HZ, sweep_period_s=8.0)
-            xyz, gain = vortex.sample_xyz_and_gain(z_norm)
-            total_amp = base_amp * gain
-
-            if HAS_SD:
-                audio.update_from_char(ch, total_amp, xyz)
-
-            if elapsed_s >= next_report_t:
-                actual_hz = tick_virtual / elapsed_s
-                drift = ((actual_hz - TARGET_HZ) / TARGET_HZ) * 100.0
-                sec = int(round(elapsed_s))
-
-                print(
-                    f"[status] tick={tick_virtual:8d}, t={sec:4d}.000s, "
-                    f"actual ~ {actual_hz:8.3f} Hz, drift_perc={drift:7.3f}%"
-                )
-                tag = "" if HAS_SD else " [TIMING ONLY]"
-                print(
-                    f"[audio]  tick={tick_virtual:8d}, omega_char='{ch}', "
-                    f"omega_amp={total_amp:6.3f}, "
-                    f"omega_xyz=({xyz[0]:0.3f},{xyz[1]:0.3f},{xyz[2]:0.3f}){tag}"
-                )
-
-                next_report_t += 1.0
-
-            # Control loop pacing (~1 kHz)
-            control_dt = 1.0 / CONTROL_HZ
-            elapsed_loop = time.perf_counter() - loop_start
-            to_sleep = control_dt - elapsed_loop
-            if to_sleep > 0:
-                time.sleep(to_sleep)
-
+        run_rail(session, audio, vortex)
     except KeyboardInterrupt:
         print("\n[!] KeyboardInterrupt — stopping Omega engine...")
     finally:
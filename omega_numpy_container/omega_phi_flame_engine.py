@@ -1,22 +1,40 @@
 import os
 import sys
+import threading
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
-try:
-    import sounddevice as sd
-except Exception as e:
-    sd = None
-    print("[!] sounddevice import failed:", e, file=sys.stderr)
-    print("[!] Audio will be disabled; timing rail only.", file=sys.stderr)
+from sky import sky_profiler, sky_metrics, adaptive_blocks
+
+OMEGA_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# sounddevice is imported on first use (stream start), not at import.
+_SD = None
+SD_IMPORT_ERROR: Optional[BaseException] = None
+
+
+def load_sounddevice():
+    """
+    The sounddevice module, or None (see SD_IMPORT_ERROR) when unavailable.
+    """
+    global _SD, SD_IMPORT_ERROR
+    if _SD is None and SD_IMPORT_ERROR is None:
+        try:
+            import sounddevice  # type: ignore
+            _SD = sounddevice
+        except Exception as e:  # pragma: no cover
+            SD_IMPORT_ERROR = e
+    return _SD
+
 
 PHI = (1.0 + 5.0 ** 0.5) / 2.0
 
 # Timing rail (for logs only)
 TARGET_HZ = 8888.0
 SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
 
 # Conceptual phi bands (for your mental model only)
 TOP_FLAME_HZ = 1111.0
@@ -165,8 +183,80 @@ def load_session(path: str) -> str:
         return data
 
 
+def status_loop(engine: OmegaFourFlameBed,
+                timing_only: bool = False,
+                stop: Optional[threading.Event] = None,
+                metrics: Optional[sky_metrics.EngineMetrics] = None) -> None:
+    """
+    Once-per-second [status] / [audio] lines until stop is set (or forever).
+    timing_only advances the tick rail itself, since no stream drives it.
+    """
+    metrics = metrics or sky_metrics.EngineMetrics()
+    start = time.perf_counter()
+    last_t = start
+    last_tick = 0
+    tag = " [TIMING ONLY]" if timing_only else ""
+    while stop is None or not stop.is_set():
+        sky_profiler.tick()
+        if stop is None:
+            time.sleep(1.0)
+        elif stop.wait(1.0):
+            break
+        if timing_only:
+            engine._update_tick_from_samples(SAMPLE_RATE)
+        now = time.perf_counter()
+        t = now - start
+        dt = now - last_t
+        d_tick = engine.tick - last_tick
+        actual = d_tick / dt if dt > 0 else 0.0
+        drift = (actual - TARGET_HZ) / TARGET_HZ * 100.0 if TARGET_HZ > 0 else 0.0
+        metrics.ticks.inc(d_tick)
+        metrics.tick_rate.set(actual)
+        metrics.drift.set(drift)
+        print(
+            f"[status] tick={engine.tick:8d}, t={t:7.3f}s, "
+            f"actual ~ {actual:8.3f} Hz, drift_perc={drift:7.3f}%"
+        )
+        print(
+            f"[audio]  tick={engine.tick:8d}, "
+            f"omega_char='{engine.last_char}', "
+            f"omega_amp={engine.last_amp:6.3f}, "
+            f"omega_xyz=({engine.last_xyz[0]:5.3f},{engine.last_xyz[1]:5.3f},{engine.last_xyz[2]:5.3f}){tag}"
+        )
+        last_t = now
+        last_tick = engine.tick
+
+
+def open_stream(engine: OmegaFourFlameBed,
+                metrics: Optional[sky_metrics.EngineMetrics] = None) -> "adaptive_blocks.AdaptiveStream":
+    """
+    Unstarted output stream playing the flame bed; its block size starts at
+    BLOCK_SIZE and follows callback load (adaptive_blocks.py).
+    """
+    @sky_profiler.wrap
+    def play(outdata, frames, time_info, status):
+        engine.audio_callback(outdata, frames, time_info, status)
+
+    cb = sky_metrics.instrument_callback(play, metrics)
+
+    def open_output(block, callback):
+        return load_sounddevice().OutputStream(
+            samplerate=SAMPLE_RATE,
+            channels=2,
+            dtype="float32",
+            callback=callback,
+            blocksize=block,
+        )
+
+    controller = adaptive_blocks.BlockSizeController(
+        "omega_flame", SAMPLE_RATE, BLOCK_SIZE, adaptive_blocks.latency_bounds_from_env())
+    return adaptive_blocks.AdaptiveStream(open_output, cb, controller, output=True)
+
+
 def main():
-    omega_root = os.environ.get("OMEGA_ROOT") or os.path.expanduser("~/Desktop/omega_numpy_container")
+    sky_profiler.install("omega_phi_flame_engine")
+    sky_metrics.serve("omega_phi_flame_engine")
+    omega_root = os.environ.get("OMEGA_ROOT") or OMEGA_ROOT
     session_path = os.path.join(omega_root, "omega_session_omega.txt")
 
     print("=== Omega Phi 8888 Hz Leidenfrost Flame Engine (ENDLESS TUNING FORK, 4 VERTICAL FLAMES) ===")
@@ -187,75 +277,21 @@ def main():
 
     engine = OmegaFourFlameBed(session)
 
-    if sd is None:
+    if load_sounddevice() is None:
+        print("[!] sounddevice import failed:", SD_IMPORT_ERROR, file=sys.stderr)
         print("[!] sounddevice not available; running timing rail only.")
-        start = time.perf_counter()
-        last_t = start
-        last_tick = 0
         try:
-            while True:
-                time.sleep(1.0)
-                engine._update_tick_from_samples(SAMPLE_RATE)
-                now = time.perf_counter()
-                t = now - start
-                dt = now - last_t
-                d_tick = engine.tick - last_tick
-                actual = d_tick / dt if dt > 0 else 0.0
-                drift = (actual - TARGET_HZ) / TARGET_HZ * 100.0 if TARGET_HZ > 0 else 0.0
-                print(
-                    f"[status] tick={engine.tick:8d}, t={t:7.3f}s, "
-                    f"actual ~ {actual:8.3f} Hz, drift_perc={drift:7.3f}%"
-                )
-                print(
-                    f"[audio]  tick={engine.tick:8d}, "
-                    f"omega_char='{engine.last_char}', "
-                    f"omega_amp={engine.last_amp:6.3f}, "
-                    f"omega_xyz=({engine.last_xyz[0]:5.3f},{engine.last_xyz[1]:5.3f},{engine.last_xyz[2]:5.3f}) [TIMING ONLY]"
-                )
-                last_t = now
-                last_tick = engine.tick
+            status_loop(engine, timing_only=True)
         except KeyboardInterrupt:
             print("\n[!] Stopped (timing rail only).")
         return
 
     print(f"[+] Audio stream starting @ {SAMPLE_RATE} Hz (4 vertical flames, constant smooth bed).")
 
-    start = time.perf_counter()
-    last_t = start
-    last_tick = 0
-
-    def cb(outdata, frames, time_info, status):
-        engine.audio_callback(outdata, frames, time_info, status)
-
-    with sd.OutputStream(
-        samplerate=SAMPLE_RATE,
-        channels=2,
-        dtype="float32",
-        callback=cb,
-        blocksize=1024,
-    ):
+    with open_stream(engine):
         print("[+] Audio stream is live. Ctrl+C to stop.")
         try:
-            while True:
-                time.sleep(1.0)
-                now = time.perf_counter()
-                t = now - start
-                dt = now - last_t
-                d_tick = engine.tick - last_tick
-                actual = d_tick / dt if dt > 0 else 0.0
-                drift = (actual - TARGET_HZ) / TARGET_HZ * 100.0 if TARGET_HZ > 0 else 0.0
-                print(
-                    f"[status] tick={engine.tick:8d}, t={t:7.3f}s, "
-                    f"actual ~ {actual:8.3f} Hz, drift_perc={drift:7.3f}%"
-                )
-                print(
-                    f"[audio]  tick={engine.tick:8d}, "
-                    f"omega_char='{engine.last_char}', "
-                    f"omega_amp={engine.last_amp:6.3f}, "
-                    f"omega_xyz=({engine.last_xyz[0]:5.3f},{engine.last_xyz[1]:5.3f},{engine.last_xyz[2]:5.3f})"
-                )
-                last_t = now
-                last_tick = engine.tick
+            status_loop(engine)
         except KeyboardInterrupt:
             print("\n[!] Stopped Omega Phi 4-flame smooth bed.")
 
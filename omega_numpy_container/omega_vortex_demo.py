@@ -1,4 +1,4 @@
-from omega_vortex_drop import LeidenfrostVortex
+from .omega_vortex_drop import LeidenfrostVortex
 
 if __name__ == "__main__":
     vortex = LeidenfrostVortex()
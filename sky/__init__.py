@@ -0,0 +1,16 @@
+"""
+sky — 8XD NumPy engines, screen pipeline and map tooling.
+
+Importing the package (or any module in it) does no work: no audio
+device, no file writes, no loops. sounddevice and Pillow are imported
+only inside the functions that open a stream / read an image.
+
+Entry points (pyproject.toml): sky-supervisor, sky-fusion, sky-mic,
+sky-audiophile, sky-lion, sky-numpy-core, sky-geom, sky-benchmark, ...
+Without installing, run a module from the checkout root:
+
+  python3 -m sky.sky_fusion_stage --no-mic
+
+8xd_geom_backend.py, 8xd_numpy_audiophile_engine.py and
+8xd_numpy_lion_engine.py are kept as launch shims for the old names.
+"""
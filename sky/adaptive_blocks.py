@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+adaptive_blocks.py — audio block size driven by measured callback load.
+
+Focus:
+
+  • Every engine used to hard-code its block size (4096 / 2048 / 1024 / 0).
+    BlockSizeController times each callback against the audio it covers
+    (load = callback time / block duration) and moves the block size by
+    powers of two inside latency bounds:
+       - load over GROW_ABOVE for GROW_AFTER callbacks → double the block,
+       - load under SHRINK_BELOW for SHRINK_AFTER_S seconds → halve it
+         (halving at most doubles the load, so it cannot bounce back).
+    Small blocks (low latency) while there is headroom, larger blocks
+    when the host is busy.
+  • AdaptiveStream owns the sounddevice stream: the audio thread only
+    flags a change, a watcher thread opens the stream at the new size and
+    starts it before stopping the old one. Callbacks are gated by stream
+    generation under one lock, so old and new never run the callback at
+    the same time; an input stream's first block (audio the old stream
+    already delivered) is skipped, so the hand-over repeats no input
+    (it may skip up to one old-size block instead).
+  • AnalysisWindow keeps the last N frames, so feature extraction sees a
+    fixed window whatever the block size: the analysis hop is the block
+    size, the window (and frequency resolution) stays put.
+  • Each change is printed and exported on /metrics:
+       sky_<stream>_block_size, sky_<stream>_callback_load,
+       sky_<stream>_block_changes_total.
+
+Environment:
+
+  SKY_BLOCK_LATENCY_MS   "min:max" block latency bounds in ms (default 5:100);
+                         "off" pins every stream at its default block size
+
+Usage:
+
+  SKY_BLOCK_LATENCY_MS=10:50 sky-mic
+  curl -s 127.0.0.1:9461/metrics | grep block
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from . import sky_metrics
+
+ENV_LATENCY = "SKY_BLOCK_LATENCY_MS"
+DEFAULT_LATENCY_MS = (5.0, 100.0)
+
+EWMA_ALPHA = 0.2
+GROW_ABOVE = 0.5
+GROW_AFTER = 4
+SHRINK_BELOW = 0.2
+SHRINK_AFTER_S = 2.0
+# Observations right after a switch include stream start-up; skip them.
+COOLDOWN_S = 1.0
+
+_CONTROLLERS: List["BlockSizeController"] = []
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def latency_bounds_from_env() -> Optional[Tuple[float, float]]:
+    """
+    (min_ms, max_ms), or None when adaptation is switched off.
+    """
+    raw = os.environ.get(ENV_LATENCY, "").strip().lower()
+    if not raw:
+        return DEFAULT_LATENCY_MS
+    if raw in ("off", "none", "0"):
+        return None
+    try:
+        lo, hi = (float(p) for p in raw.split(":", 1))
+    except ValueError:
+        return DEFAULT_LATENCY_MS
+    return (min(lo, hi), max(lo, hi))
+
+
+def _pow2_at_least(n: float) -> int:
+    return 1 << max(0, int(np.ceil(np.log2(max(1.0, n)))))
+
+
+def _pow2_at_most(n: float) -> int:
+    return 1 << max(0, int(np.floor(np.log2(max(1.0, n)))))
+
+
+class BlockSizeController:
+    """
+    Block size for one stream. observe() runs on the audio thread and only
+    does arithmetic; the switch itself happens in AdaptiveStream.
+    """
+
+    def __init__(self,
+                 name: str,
+                 sample_rate: int,
+                 block: int,
+                 latency_ms: Optional[Tuple[float, float]] = DEFAULT_LATENCY_MS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.sample_rate = int(sample_rate)
+        self.clock = clock
+        self.adaptive = latency_ms is not None
+        if self.adaptive:
+            self.min_block = _pow2_at_least(latency_ms[0] / 1000.0 * self.sample_rate)
+            self.max_block = max(self.min_block, _pow2_at_most(latency_ms[1] / 1000.0 * self.sample_rate))
+            block = min(max(int(block), self.min_block), self.max_block)
+        else:
+            self.min_block = self.max_block = int(block)
+        self.block = int(block)
+
+        self.load: Optional[float] = None
+        self.changes = 0
+        self.pending: Optional[int] = None
+        self.changed = threading.Event()
+        self._over = 0
+        self._under_since: Optional[float] = None
+        self._quiet_until = clock() + COOLDOWN_S
+
+        with _CONTROLLERS_LOCK:
+            _CONTROLLERS.append(self)
+
+    @property
+    def latency_ms(self) -> float:
+        return self.block * 1000.0 / self.sample_rate
+
+    def observe(self, seconds: float, frames: int) -> None:
+        """
+        One callback took `seconds` to handle `frames` frames.
+        """
+        if frames <= 0:
+            return
+        load = seconds * self.sample_rate / frames
+        self.load = load if self.load is None else self.load + EWMA_ALPHA * (load - self.load)
+        if not self.adaptive or self.pending is not None:
+            return
+        now = self.clock()
+        if now < self._quiet_until:
+            return
+
+        if self.load > GROW_ABOVE:
+            self._under_since = None
+            self._over += 1
+            if self._over >= GROW_AFTER and self.block < self.max_block:
+                self._request(min(self.block * 2, self.max_block))
+            return
+        self._over = 0
+
+        if self.load < SHRINK_BELOW and self.block > self.min_block:
+            if self._under_since is None:
+                self._under_since = now
+            elif now - self._under_since >= SHRINK_AFTER_S:
+                self._request(max(self.block // 2, self.min_block))
+        else:
+            self._under_since = None
+
+    def _request(self, block: int) -> None:
+        self.pending = block
+        self.changed.set()
+
+    def wrap(self, fn: Callable) -> Callable:
+        """
+        Time a sounddevice-style callback(data, frames, time_info, status).
+        """
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                frames = args[1] if len(args) > 1 else 0
+                self.observe(time.perf_counter() - t0, int(frames))
+        return timed
+
+    def commit(self, block: int) -> None:
+        """
+        The stream now runs at `block` (called by AdaptiveStream).
+        """
+        old = self.block
+        self.block = int(block)
+        self.pending = None
+        self.changed.clear()
+        self.changes += 1
+        self._over = 0
+        self._under_since = None
+        self._quiet_until = self.clock() + COOLDOWN_S
+        print("[blocks] {}: {} → {} frames ({:.1f} ms, load {:.2f})".format(
+            self.name, old, self.block, self.latency_ms, self.load or 0.0))
+        self.load = None
+
+    def reject(self, error: Exception) -> None:
+        """
+        Opening the stream at the pending size failed: stay where we are
+        and stop adapting in that direction.
+        """
+        sys.stderr.write("[blocks] {}: cannot switch to {} frames ({})\n".format(
+            self.name, self.pending, error))
+        if self.pending is not None and self.pending > self.block:
+            self.max_block = self.block
+        else:
+            self.min_block = self.block
+        self.pending = None
+        self.changed.clear()
+        self._quiet_until = self.clock() + COOLDOWN_S
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "block": self.block,
+            "latency_ms": round(self.latency_ms, 3),
+            "load": None if self.load is None else round(self.load, 4),
+            "changes": self.changes,
+            "bounds": [self.min_block, self.max_block],
+            "adaptive": self.adaptive,
+        }
+
+    def close(self) -> None:
+        with _CONTROLLERS_LOCK:
+            if self in _CONTROLLERS:
+                _CONTROLLERS.remove(self)
+
+
+def _block_metrics() -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    with _CONTROLLERS_LOCK:
+        controllers = list(_CONTROLLERS)
+    for c in controllers:
+        prefix = "sky_{}_".format(c.name)
+        out[prefix + "block_size"] = c.block
+        out[prefix + "callback_load"] = c.load or 0.0
+        out[prefix + "block_changes_total"] = c.changes
+    return out
+
+
+sky_metrics.REGISTRY.add_collector(_block_metrics)
+
+
+class AdaptiveStream:
+    """
+    A sounddevice stream reopened at the controller's block size.
+
+    open_stream(block, callback) returns an unstarted stream at that block
+    size calling `callback`. Each opened stream gets its own generation;
+    when both run during a switch, the old one keeps handling audio until
+    the new one delivers its first block, then its callbacks are dropped
+    (output callbacks write silence). The generation check and the
+    callback share one lock, so callbacks never run concurrently. For
+    input streams the new stream's first block overlaps what the old one
+    was still delivering, so it is dropped rather than analysed twice; the
+    cost is a gap of less than one old-size block per switch.
+    """
+
+    def __init__(self,
+                 open_stream: Callable[[int, Callable], Any],
+                 callback: Callable,
+                 controller: BlockSizeController,
+                 output: bool = False,
+                 overlap: bool = True):
+        self.open_stream = open_stream
+        self.callback = controller.wrap(callback)
+        self.controller = controller
+        self.output = output
+        self.overlap = overlap
+        self.stream = None
+        self._gen = 0
+        self._opened = 0
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        # Held by the gate and the callback together (audio threads).
+        self._cb_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _gated(self, gen: int) -> Callable:
+        def cb(*args, **kwargs):
+            with self._cb_lock:
+                if gen != self._gen:
+                    if gen < self._gen:
+                        if self.output and args:
+                            args[0].fill(0)
+                        return None
+                    self._gen = gen  # the new stream takes over
+                    if not self.output:
+                        # Captured while the old stream was still delivering.
+                        return None
+                return self.callback(*args, **kwargs)
+        return cb
+
+    def _take_over(self, gen: int) -> None:
+        with self._cb_lock:
+            self._gen = max(self._gen, gen)
+
+    def _open(self, block: int):
+        self._opened += 1
+        return self.open_stream(block, self._gated(self._opened))
+
+    def start(self) -> None:
+        self.stream = self._open(self.controller.block)
+        self._gen = self._opened
+        self.stream.start()
+        if self.controller.adaptive:
+            self._watcher = threading.Thread(target=self._watch,
+                                             name="blocks-" + self.controller.name, daemon=True)
+            self._watcher.start()
+
+    def _watch(self) -> None:
+        ctrl = self.controller
+        while True:
+            ctrl.changed.wait()
+            if self._closed.is_set():
+                return
+            block = ctrl.pending
+            if block is None:
+                ctrl.changed.clear()
+                continue
+            try:
+                switched = self._switch(block)
+            except Exception as e:
+                ctrl.reject(e)
+            else:
+                if switched:
+                    ctrl.commit(block)
+
+    def _switch(self, block: int) -> bool:
+        """
+        Move to a stream at `block` frames; False when already closed.
+        """
+        with self._lock:
+            if self._closed.is_set():
+                return False
+            new = self._open(block)
+            old = self.stream
+            if self.overlap:
+                new.start()
+                # Keep the old stream until the new one is delivering.
+                deadline = time.monotonic() + 1.0
+                while self._gen != self._opened and time.monotonic() < deadline:
+                    time.sleep(0.001)
+                self._take_over(self._opened)
+            else:
+                self._take_over(self._opened)
+                _close(old)
+                old = None
+                new.start()
+            self.stream = new
+            if old is not None:
+                _close(old)
+            return True
+
+    def close(self) -> None:
+        self._closed.set()
+        self.controller.changed.set()
+        with self._lock:
+            if self.stream is not None:
+                _close(self.stream)
+                self.stream = None
+        self.controller.close()
+
+    stop = close
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _close(stream) -> None:
+    try:
+        stream.stop()
+    finally:
+        stream.close()
+
+
+class AnalysisWindow:
+    """
+    The last `size` frames of a stream, fed one callback block at a time.
+    push() returns the internal buffer: read it before the next push.
+    """
+
+    def __init__(self, size: int, channels: int = 1, dtype=np.float32):
+        self.size = max(1, int(size))
+        self.buf = np.zeros((self.size, max(1, int(channels))), dtype=dtype)
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block[:, None]
+        n = block.shape[0]
+        if n >= self.size:
+            self.buf[:] = block[n - self.size:]
+        elif n > 0:
+            self.buf[:-n] = self.buf[n:]
+            self.buf[-n:] = block
+        return self.buf
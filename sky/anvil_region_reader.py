@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+anvil_region_reader.py — read-only, memory-mapped Anvil (.mca) reader.
+
+Focus:
+
+  • Open godmode/world*/region/r.X.Z.mca (and the DIM-1 / DIM1 regions)
+    with mmap — nothing is read until a chunk is asked for.
+  • Parse the 8 KiB header straight into NumPy:
+       - locations  : 1024 × (3-byte sector offset, 1-byte sector count)
+       - timestamps : 1024 × u32 (last save, epoch seconds)
+  • Decompress chunks lazily (gzip / zlib / uncompressed, plus external
+    c.X.Z.mcc overflow files) and parse their NBT with a small parser
+    whose byte / int / long arrays are zero-copy np.frombuffer views.
+  • Expose terrain as arrays:
+       - chunk_heightmap()  → (16, 16) int32, indexed [z, x]
+       - chunk_sections()   → per section: palette + (16, 16, 16) uint16
+                              palette indices, indexed [y, z, x]
+       - region_heightmap() → (512, 512) int32, -1 where no chunk exists
+    Both the legacy layout (Level.HeightMap, Sections Blocks/Add/Data —
+    what the shipped godmode worlds use) and the palette layout
+    (Heightmaps + packed long arrays, 1.13+) are understood.
+  • surface_columns() turns a region heightmap into block x / y / z int64
+    arrays, ready for numpy_coord_mapper.int_to_reversed_unit_array or
+    the geom_backend batch functions.
+  • Whole worlds are scanned in parallel: one region per worker process.
+
+Output (CLI):
+
+  terrain_tiles/<dimension>/r.X.Z.height.npy   (512, 512) int32 [z, x]
+  terrain_tiles/<dimension>/r.X.Z.json         chunk count + block counts
+
+Usage:
+
+  sky-anvil-reader                       # every region file
+  sky-anvil-reader --workers 4
+  sky-anvil-reader --chunk world/region/r.0.1.mca 0 0
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WORLD_ROOT = os.path.abspath(os.path.join(ROOT, "..", "godmode"))
+OUT_DIR = os.path.join(ROOT, "terrain_tiles")
+
+SECTOR_BYTES = 4096
+HEADER_BYTES = 2 * SECTOR_BYTES
+CHUNKS_PER_REGION = 32
+CHUNK_BLOCKS = 16
+REGION_BLOCKS = CHUNKS_PER_REGION * CHUNK_BLOCKS
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+EXTERNAL_FLAG = 0x80
+
+# 20w17a: packed long arrays stop spanning entries across longs.
+DATA_VERSION_NO_SPAN = 2527
+
+REGION_PATTERNS = (
+    os.path.join("world*", "region", "r.*.mca"),
+    os.path.join("world*", "DIM*", "region", "r.*.mca"),
+)
+REGION_RE = re.compile(r"^r\.(-?\d+)\.(-?\d+)\.mca$")
+
+
+# ---------------------------------------------------------------------------
+# NBT
+# ---------------------------------------------------------------------------
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_SCALARS = {
+    TAG_BYTE: struct.Struct(">b"),
+    TAG_SHORT: struct.Struct(">h"),
+    TAG_INT: struct.Struct(">i"),
+    TAG_LONG: struct.Struct(">q"),
+    TAG_FLOAT: struct.Struct(">f"),
+    TAG_DOUBLE: struct.Struct(">d"),
+}
+_ARRAYS = {
+    TAG_BYTE_ARRAY: np.dtype("u1"),
+    TAG_INT_ARRAY: np.dtype(">i4"),
+    TAG_LONG_ARRAY: np.dtype(">i8"),
+}
+_U16 = struct.Struct(">H")
+_I32 = struct.Struct(">i")
+
+
+def _read_payload(buf: bytes, pos: int, tag: int) -> Tuple[Any, int]:
+    s = _SCALARS.get(tag)
+    if s is not None:
+        return s.unpack_from(buf, pos)[0], pos + s.size
+
+    dt = _ARRAYS.get(tag)
+    if dt is not None:
+        n = _I32.unpack_from(buf, pos)[0]
+        pos += 4
+        arr = np.frombuffer(buf, dtype=dt, count=n, offset=pos)
+        return arr, pos + n * dt.itemsize
+
+    if tag == TAG_STRING:
+        n = _U16.unpack_from(buf, pos)[0]
+        pos += 2
+        return bytes(buf[pos:pos + n]).decode("utf-8", "replace"), pos + n
+
+    if tag == TAG_LIST:
+        item = buf[pos]
+        n = _I32.unpack_from(buf, pos + 1)[0]
+        pos += 5
+        out = []
+        for _ in range(max(0, n)):
+            v, pos = _read_payload(buf, pos, item)
+            out.append(v)
+        return out, pos
+
+    if tag == TAG_COMPOUND:
+        out = {}
+        while True:
+            t = buf[pos]
+            pos += 1
+            if t == TAG_END:
+                return out, pos
+            n = _U16.unpack_from(buf, pos)[0]
+            pos += 2
+            name = bytes(buf[pos:pos + n]).decode("utf-8", "replace")
+            pos += n
+            out[name], pos = _read_payload(buf, pos, t)
+
+    raise ValueError("unknown NBT tag {} at byte {}".format(tag, pos))
+
+
+def parse_nbt(buf: bytes) -> Dict[str, Any]:
+    """
+    Parse an uncompressed NBT blob (named root compound) into dicts/lists.
+
+    Arrays are big-endian np.frombuffer views into buf — no copies.
+    """
+    if not buf or buf[0] != TAG_COMPOUND:
+        raise ValueError("NBT root must be a compound")
+    n = _U16.unpack_from(buf, 1)[0]
+    root, _ = _read_payload(buf, 3 + n, TAG_COMPOUND)
+    return root
+
+
+# ---------------------------------------------------------------------------
+# Region files
+# ---------------------------------------------------------------------------
+
+class RegionFile:
+    """
+    One r.X.Z.mca file, memory-mapped read-only.
+
+    Chunk coordinates (cx, cz) are local to the region (0..31).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        base = os.path.basename(path).split(".")
+        self.rx, self.rz = int(base[1]), int(base[2])
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_BYTES:
+            self._file.close()
+            raise ValueError("{}: truncated region header".format(path))
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = np.frombuffer(self._mm, dtype=">u4", count=2 * 1024)
+        loc = header[:1024].astype(np.uint32)
+        self.offsets = (loc >> 8).reshape(CHUNKS_PER_REGION, CHUNKS_PER_REGION)
+        self.sector_counts = (loc & 0xFF).reshape(CHUNKS_PER_REGION, CHUNKS_PER_REGION)
+        self.timestamps = header[1024:].astype(np.uint32).reshape(CHUNKS_PER_REGION, CHUNKS_PER_REGION)
+        del header
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def __enter__(self) -> "RegionFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def present(self) -> np.ndarray:
+        """
+        (32, 32) bool, indexed [cz, cx].
+        """
+        return self.offsets > 0
+
+    def chunks(self) -> List[Tuple[int, int]]:
+        cz, cx = np.nonzero(self.present)
+        return list(zip(cx.tolist(), cz.tolist()))
+
+    def raw_chunk(self, cx: int, cz: int) -> Optional[Tuple[int, bytes]]:
+        """
+        (compression type, compressed bytes) or None if the chunk is absent.
+        """
+        sector = int(self.offsets[cz, cx])
+        if sector == 0:
+            return None
+        start = sector * SECTOR_BYTES
+        length, ctype = struct.unpack_from(">IB", self._mm, start)
+        if ctype & EXTERNAL_FLAG:
+            ext = os.path.join(os.path.dirname(self.path), "c.{}.{}.mcc".format(
+                self.rx * CHUNKS_PER_REGION + cx, self.rz * CHUNKS_PER_REGION + cz))
+            with open(ext, "rb") as f:
+                return ctype & ~EXTERNAL_FLAG, f.read()
+        return ctype, self._mm[start + 5:start + 4 + length]
+
+    def chunk_nbt(self, cx: int, cz: int) -> Optional[Dict[str, Any]]:
+        raw = self.raw_chunk(cx, cz)
+        if raw is None:
+            return None
+        ctype, data = raw
+        if ctype == COMPRESSION_ZLIB:
+            data = zlib.decompress(data)
+        elif ctype == COMPRESSION_GZIP:
+            data = gzip.decompress(data)
+        elif ctype != COMPRESSION_NONE:
+            raise ValueError("{}: chunk ({}, {}) uses unsupported compression {}".format(
+                self.path, cx, cz, ctype))
+        return parse_nbt(data)
+
+
+# ---------------------------------------------------------------------------
+# Chunk decoding
+# ---------------------------------------------------------------------------
+
+def unpack_longs(longs: np.ndarray, bits: int, count: int, spanning: bool) -> np.ndarray:
+    """
+    Unpack count little-end-first entries of `bits` bits from a long array.
+
+    spanning=True  : entries run across long boundaries (pre-20w17a)
+    spanning=False : each long holds 64 // bits entries, the rest is padding
+    """
+    words = np.asarray(longs).astype(np.uint64)
+    mask = np.uint64((1 << bits) - 1)
+    if not spanning:
+        per = 64 // bits
+        shifts = (np.arange(per, dtype=np.uint64) * np.uint64(bits))
+        vals = (words[:, None] >> shifts[None, :]) & mask
+        return vals.reshape(-1)[:count]
+
+    bit = np.arange(count, dtype=np.uint64) * np.uint64(bits)
+    lo = (bit >> np.uint64(6)).astype(np.int64)
+    off = bit & np.uint64(63)
+    val = words[lo] >> off
+    spill = off + np.uint64(bits) > np.uint64(64)
+    if np.any(spill):
+        hi = np.minimum(lo + 1, words.shape[0] - 1)
+        val[spill] |= words[hi[spill]] << (np.uint64(64) - off[spill])
+    return val & mask
+
+
+def _chunk_root(nbt: Dict[str, Any]) -> Dict[str, Any]:
+    # Pre-1.18 chunks nest everything under "Level".
+    return nbt.get("Level", nbt)
+
+
+def _data_version(nbt: Dict[str, Any]) -> int:
+    return int(nbt.get("DataVersion", 0))
+
+
+def chunk_heightmap(nbt: Dict[str, Any], kind: str = "WORLD_SURFACE") -> Optional[np.ndarray]:
+    """
+    (16, 16) int32 [z, x]: y of the first air block above the surface.
+    """
+    level = _chunk_root(nbt)
+    legacy = level.get("HeightMap")
+    if legacy is not None and len(legacy) == 256:
+        return np.asarray(legacy, dtype=np.int32).reshape(16, 16)
+
+    maps = level.get("Heightmaps", {})
+    longs = maps.get(kind)
+    if longs is None:
+        longs = next(iter(maps.values()), None)
+    if longs is None or len(longs) == 0:
+        return None
+    # Entry width follows from the array length (9 bits for 256 / 384 high worlds).
+    n = len(longs)
+    spanning = _data_version(nbt) < DATA_VERSION_NO_SPAN
+    if spanning:
+        bits = (n * 64) // 256
+    else:
+        bits = 64 // -(-256 // n)
+    vals = unpack_longs(longs, max(1, min(bits, 64)), 256, spanning)
+    min_y = int(level.get("yPos", 0)) * CHUNK_BLOCKS
+    return (vals.astype(np.int32) + min_y).reshape(16, 16)
+
+
+def _legacy_section(sec: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    ids = np.asarray(sec["Blocks"], dtype=np.uint16)
+    add = sec.get("Add")
+    if add is not None:
+        a = np.asarray(add, dtype=np.uint16)
+        nib = np.empty(4096, dtype=np.uint16)
+        nib[0::2] = a & 0x0F
+        nib[1::2] = a >> 4
+        ids = ids | (nib << 8)
+    data = np.asarray(sec.get("Data", np.zeros(2048, np.uint8)), dtype=np.uint16)
+    meta = np.empty(4096, dtype=np.uint16)
+    meta[0::2] = data & 0x0F
+    meta[1::2] = data >> 4
+    # Legacy palette entries are (id << 4) | meta, like the old global palette.
+    states = (ids << 4) | meta
+    palette, idx = np.unique(states, return_inverse=True)
+    return palette, idx.astype(np.uint16).reshape(16, 16, 16)
+
+
+def _palette_section(sec: Dict[str, Any], spanning: bool) -> Optional[Tuple[List[str], np.ndarray]]:
+    states = sec.get("block_states")
+    if states is not None:
+        palette_nbt, longs = states.get("palette", []), states.get("data")
+    else:
+        palette_nbt, longs = sec.get("Palette"), sec.get("BlockStates")
+    if not palette_nbt:
+        return None
+
+    palette = [p.get("Name", "minecraft:air") for p in palette_nbt]
+    if longs is None or len(longs) == 0:
+        return palette, np.zeros((16, 16, 16), dtype=np.uint16)
+
+    bits = max(4, (len(palette) - 1).bit_length())
+    idx = unpack_longs(longs, bits, 4096, spanning)
+    return palette, idx.astype(np.uint16).reshape(16, 16, 16)
+
+
+def chunk_sections(nbt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    [{"y": section y, "palette": ..., "blocks": (16, 16, 16) uint16 [y, z, x]}]
+
+    Legacy sections get a uint16 array palette of (id << 4) | meta,
+    palette sections a list of block names. Empty sections are skipped.
+    """
+    level = _chunk_root(nbt)
+    spanning = _data_version(nbt) < DATA_VERSION_NO_SPAN
+    out = []
+    for sec in level.get("Sections", level.get("sections", [])):
+        y = int(sec.get("Y", 0))
+        if "Blocks" in sec:
+            palette, blocks = _legacy_section(sec)
+        else:
+            res = _palette_section(sec, spanning)
+            if res is None:
+                continue
+            palette, blocks = res
+        out.append({"y": y, "palette": palette, "blocks": blocks})
+    return out
+
+
+def region_heightmap(region: RegionFile) -> np.ndarray:
+    """
+    (512, 512) int32 [z, x] for the whole region; -1 where no chunk exists.
+    """
+    out = np.full((REGION_BLOCKS, REGION_BLOCKS), -1, dtype=np.int32)
+    for cx, cz in region.chunks():
+        nbt = region.chunk_nbt(cx, cz)
+        hm = chunk_heightmap(nbt) if nbt is not None else None
+        if hm is None:
+            continue
+        out[cz * 16:cz * 16 + 16, cx * 16:cx * 16 + 16] = hm
+    return out
+
+
+def surface_columns(heightmap: np.ndarray, x0: int, z0: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Block coordinates (x, y, z) of every surface block in a heightmap.
+
+    y is the top solid block (heightmap - 1); missing columns are dropped.
+    """
+    zz, xx = np.nonzero(heightmap > 0)
+    y = heightmap[zz, xx].astype(np.int64) - 1
+    return xx.astype(np.int64) + int(x0), y, zz.astype(np.int64) + int(z0)
+
+
+# ---------------------------------------------------------------------------
+# Parallel scan
+# ---------------------------------------------------------------------------
+
+def region_paths(world_root: str = WORLD_ROOT) -> List[Dict[str, Any]]:
+    """
+    Every r.X.Z.mca under world*/region and world*/DIM*/region, as a task
+    dict (dimension, name, path, x0, z0). Shared with coord_tile_encoder.
+    """
+    tasks = []
+    for pattern in REGION_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(world_root, pattern))):
+            m = REGION_RE.match(os.path.basename(path))
+            if not m:
+                continue
+            rx, rz = int(m.group(1)), int(m.group(2))
+            tasks.append({
+                "dimension": os.path.relpath(path, world_root).split(os.sep)[0],
+                "name": "r.{}.{}".format(rx, rz),
+                "path": path,
+                "x0": rx * REGION_BLOCKS,
+                "z0": rz * REGION_BLOCKS,
+            })
+    return tasks
+
+
+def scan_region(task: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    """
+    Worker: heightmap + per-block-state counts for one region file.
+    """
+    t0 = time.perf_counter()
+    counts: Dict[str, int] = {}
+    chunks = 0
+
+    with RegionFile(task["path"]) as region:
+        height = np.full((REGION_BLOCKS, REGION_BLOCKS), -1, dtype=np.int32)
+        for cx, cz in region.chunks():
+            nbt = region.chunk_nbt(cx, cz)
+            if nbt is None:
+                continue
+            chunks += 1
+            hm = chunk_heightmap(nbt)
+            if hm is not None:
+                height[cz * 16:cz * 16 + 16, cx * 16:cx * 16 + 16] = hm
+            for sec in chunk_sections(nbt):
+                hist = np.bincount(sec["blocks"].reshape(-1), minlength=len(sec["palette"]))
+                for state, n in zip(sec["palette"], hist.tolist()):
+                    if n:
+                        key = str(int(state)) if not isinstance(state, str) else state
+                        counts[key] = counts.get(key, 0) + n
+
+    prefix = os.path.join(out_dir, task["dimension"], task["name"])
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    tmp = prefix + ".height.npy.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, height)
+    os.replace(tmp, prefix + ".height.npy")
+
+    summary = {
+        "dimension": task["dimension"],
+        "name": task["name"],
+        "x0": task["x0"],
+        "z0": task["z0"],
+        "chunks": chunks,
+        "blocks": dict(sorted(counts.items(), key=lambda kv: -kv[1])),
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    tmp = prefix + ".json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp, prefix + ".json")
+    return summary
+
+
+def run(tasks: List[Dict[str, Any]],
+        out_dir: str = OUT_DIR,
+        workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    if not tasks:
+        return results
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scan_region, t, out_dir) for t in tasks]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            print("  {:<16} {:<10} chunks={:<5} {:.2f}s".format(
+                res["dimension"], res["name"], res["chunks"], res["seconds"]))
+    return results
+
+
+def main() -> None:
+    sky_profiler.install("anvil_region_reader")
+    parser = argparse.ArgumentParser(description="Read Anvil region files into NumPy arrays.")
+    parser.add_argument("--world-root", default=WORLD_ROOT,
+                        help="server dir holding world*/region (default: ../godmode)")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", nargs=3, metavar=("REGION", "CX", "CZ"),
+                        help="dump one chunk (region path relative to world root)")
+    args = parser.parse_args()
+
+    if args.chunk:
+        path = os.path.join(args.world_root, args.chunk[0])
+        with RegionFile(path) as region:
+            cx, cz = int(args.chunk[1]), int(args.chunk[2])
+            nbt = region.chunk_nbt(cx, cz)
+            if nbt is None:
+                print("No chunk at ({}, {}) in {}".format(cx, cz, path))
+                return
+            hm = chunk_heightmap(nbt)
+            print("8XD chunk ({}, {}) of {}".format(cx, cz, path))
+            print("  DataVersion :", _data_version(nbt) or "legacy")
+            if hm is not None:
+                print("  Height      : min {} max {}".format(int(hm.min()), int(hm.max())))
+            for sec in chunk_sections(nbt):
+                print("  Section y={:<3} palette={}".format(sec["y"], len(sec["palette"])))
+        return
+
+    tasks = region_paths(args.world_root)
+    print("8XD anvil region reader")
+    print("  World   :", args.world_root)
+    print("  Out     :", args.out)
+    print("  Regions :", len(tasks))
+    t0 = time.perf_counter()
+    results = run(tasks, args.out, args.workers)
+    print("  Chunks  :", sum(r["chunks"] for r in results))
+    print("  Time    : {:.2f}s".format(time.perf_counter() - t0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+benchmark_suite.py — timings + peak memory for every NumPy hot path.
+
+Focus:
+
+  • Fixed inputs and a seeded RNG (SEED), so every run measures the same
+    work: audio blocks, screen resolutions, player counts, seeds.
+  • Each case is timed call by call (perf_counter): median and p99 in µs.
+    Peak memory of one extra call is taken with tracemalloc, which NumPy
+    reports its buffers to.
+  • Results are compared with benchmark_baseline.json; a case regresses
+    when its median (or peak memory) grows past --threshold (default 25%)
+    and past a small absolute noise floor. Regressions exit with code 1.
+  • --save rewrites the baseline. Baselines are per machine: re-save
+    after moving to new hardware before comparing.
+
+Cases cover the audiophile / lion / mic feature extractors, the adaptive
+block-size analysis window, the decimated multi-rate analysis path, the
+sparse spectrum filterbanks, the omega base-8 harmonics and mirror
+orbits, the quarter grid, the screen colormaps (full and governor-scaled),
+the geom backend (single frames, cached frames, batched players) and both
+Omega synth callbacks. Cases whose module cannot be imported here are
+reported as skipped, never silently dropped.
+
+Import cases ("import.<module>") run `python -X importtime -c "import m"`
+in a fresh interpreter IMPORT_REPEATS times and keep the median of the
+module's cumulative import time. Besides the baseline comparison they are
+held to fixed budgets: the package's own modules may spend at most
+OWN_IMPORT_BUDGET_US of self time, and sounddevice / PIL / http.server
+must never be pulled in by a plain import (those load on first use).
+
+Usage:
+
+  sky-benchmark                         # compare with baseline
+  sky-benchmark --save                  # record a new baseline
+  sky-benchmark --filter geom --threshold 0.1
+  sky-benchmark --filter import         # startup budget only
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_ROOT = os.path.dirname(ROOT)
+BASELINE_JSON = os.path.join(ROOT, "benchmark_baseline.json")
+
+SEED = 8888
+DEFAULT_THRESHOLD = 0.25
+# Differences below these never count as regressions (timer / allocator noise).
+NOISE_FLOOR_US = 5.0
+NOISE_FLOOR_KIB = 64.0
+
+MIN_REPEATS = 15
+MAX_REPEATS = 500
+TIME_BUDGET_S = 0.4
+WARMUP = 3
+
+IMPORT_REPEATS = 5
+# Fresh interpreters vary by tens of ms; only bigger jumps are regressions.
+IMPORT_NOISE_FLOOR_US = 50000.0
+# Self time of sky.* / omega_numpy_container.* modules, per import case
+# (about 2x headroom: a busy host doubles cold-import times).
+OWN_IMPORT_BUDGET_US = 50000.0
+OWN_PREFIXES = ("sky", "omega_numpy_container")
+# Optional / server-only dependencies that must stay lazy.
+FORBIDDEN_IMPORTS = ("sounddevice", "PIL", "http.server")
+
+IMPORT_MODULES = (
+    "sky",
+    "sky.sky_metrics",
+    "sky.sky_profiler",
+    "sky.sky_supervisor",
+    "sky.engine.numpy_core",
+    "sky.sky_fusion_stage",
+    "sky.mic_engine_8xd",
+    "sky.decimator",
+    "sky.filterbank",
+    "sky.numpy_audiophile_engine",
+    "sky.numpy_lion_engine",
+    "sky.geom_backend",
+    "sky.screen_colormap_generator",
+    "omega_numpy_container.omega_phi_8888_engine",
+    "omega_numpy_container.omega_phi_flame_engine",
+)
+
+
+def sky(name: str):
+    return importlib.import_module("sky." + name)
+
+
+def omega(name: str):
+    return importlib.import_module("omega_numpy_container." + name)
+
+
+def rng() -> np.random.Generator:
+    return np.random.default_rng(SEED)
+
+
+def audio_block(frames: int, channels: int = 1, sr: int = 48000) -> np.ndarray:
+    """
+    Deterministic "music-like" block: two tones + noise, float32.
+    """
+    t = np.arange(frames, dtype=np.float64) / sr
+    tone = 0.3 * np.sin(2 * np.pi * 220.0 * t) + 0.1 * np.sin(2 * np.pi * 3520.0 * t)
+    noise = rng().standard_normal((frames, channels)) * 0.05
+    return (tone[:, None] + noise).astype(np.float32)
+
+
+def player_arrays(n: int) -> Dict[str, np.ndarray]:
+    r = rng()
+    return {
+        "x": r.uniform(-30000, 30000, n),
+        "y": r.uniform(0, 256, n),
+        "z": r.uniform(-30000, 30000, n),
+        "yaw": r.uniform(-180, 180, n),
+        "pitch": r.uniform(-90, 90, n),
+        "vx": r.uniform(-1, 1, n),
+        "vy": r.uniform(-1, 1, n),
+        "vz": r.uniform(-1, 1, n),
+    }
+
+
+def layout_for(width: int, height: int) -> Dict[str, Any]:
+    mapper = sky("screen_quadrant_mapper")
+    return mapper.build_layout({"width": width, "height": height},
+                               {"frameIndex": 7, "player": "bench"})
+
+
+# ---------------------------------------------------------------------------
+# Cases: name → setup() returning the zero-arg callable to time
+# ---------------------------------------------------------------------------
+
+def _case_extract_features(frames: int):
+    eng = sky("numpy_audiophile_engine")
+    block = audio_block(frames)[:, 0]
+    return lambda: eng.extract_features(block, 48000)
+
+
+def _case_build_vec14(frames: int):
+    eng = sky("numpy_lion_engine")
+    # Mono (frames, 1): the stereo layout does not broadcast in build_vec14.
+    block = audio_block(frames, channels=1)
+    return lambda: eng.build_vec14(block, 48000)
+
+
+def _case_compute_14(frames: int):
+    mic = sky("mic_engine_8xd")
+    block = audio_block(frames, sr=mic.SAMPLE_RATE)
+    return lambda: mic.compute_14_float_from_audio(block, mic.SAMPLE_RATE)
+
+
+def _case_fft_bands(frames: int):
+    mic = sky("mic_engine_8xd")
+    mono = audio_block(frames, sr=mic.SAMPLE_RATE)[:, 0].astype(np.float64)
+    return lambda: mic.fft_bands(mono, mic.SAMPLE_RATE, 7)
+
+
+def _case_analysis_window(window: int, block: int):
+    blocks = sky("adaptive_blocks")
+    win = blocks.AnalysisWindow(window)
+    data = audio_block(block)
+    return lambda: win.push(data)
+
+
+def _case_spectral_descriptors(frames: int):
+    mic = sky("mic_engine_8xd")
+    mono = audio_block(frames, sr=mic.SAMPLE_RATE)[:, 0].astype(np.float64)
+    mag, freqs = mic.spectrum(mono, mic.SAMPLE_RATE)
+    flux = mic.SpectralFlux()
+    return lambda: mic.spectral_descriptors(mono, mag, freqs, mic.SAMPLE_RATE, flux)
+
+
+def _case_decimate(frames: int, factor: int):
+    dec = sky("decimator").PolyphaseDecimator(factor)
+    block = audio_block(frames)
+    return lambda: dec.process(block)
+
+
+def _case_mic_multirate(window: int, factor: int, block: int = 256):
+    # One callback: push a `block`-frame chunk, then compute the 14 floats.
+    mic = sky("mic_engine_8xd")
+    win = sky("decimator").MultiRateWindow(window, 1, factor)
+    data = audio_block(block, sr=mic.SAMPLE_RATE)
+    flux = mic.SpectralFlux()
+    for _ in range(window // block):
+        win.push(data)
+
+    def run():
+        full, low = win.push(data)
+        return mic.compute_14_float_from_audio(full, mic.SAMPLE_RATE, flux, low, factor)
+    return run
+
+
+def _case_lion_multirate(window: int, factor: int):
+    eng = sky("numpy_lion_engine")
+    win = sky("decimator").MultiRateWindow(window, 1, factor)
+    full, low = win.push(audio_block(window, channels=1))
+    return lambda: eng.build_vec14(full, 48000, low)
+
+
+def _case_filterbank(kind: str, bands: int, frames: int, publish: bool = False):
+    fb = sky("filterbank")
+    mic = sky("mic_engine_8xd")
+    bank = fb.get_bank(kind, bands, frames, float(mic.SAMPLE_RATE))
+    mono = audio_block(frames, sr=mic.SAMPLE_RATE)[:, 0].astype(np.float64)
+    mag, _ = mic.spectrum(mono, mic.SAMPLE_RATE)
+    if publish:
+        return lambda: fb.encode(fb.quantize(bank.apply(mag)))
+    return lambda: bank.apply(mag)
+
+
+def _case_compute_14_bank(frames: int, bands: int):
+    mic = sky("mic_engine_8xd")
+    bank = sky("filterbank").get_bank("mel", bands, frames, float(mic.SAMPLE_RATE))
+    block = audio_block(frames, sr=mic.SAMPLE_RATE)
+    return lambda: mic.compute_14_float_from_audio(block, mic.SAMPLE_RATE, bank=bank)
+
+
+def _case_omega8():
+    harm = sky("omega_base8_harmonics")
+    vec = rng().uniform(0, 1, 14).tolist()
+    return lambda: harm.continuum14_to_omega8(vec)
+
+
+def _case_mirror_orbit(steps: int):
+    mapper = sky("numpy_coord_mapper")
+    s = mapper.int_to_reversed_unit(248369)
+    return lambda: mapper.omega_mirror_orbit(s, steps)
+
+
+def _case_mirror_orbit_array(n: int):
+    mapper = sky("numpy_coord_mapper")
+    seeds = mapper.int_to_reversed_unit_array(rng().integers(-30000000, 30000000, n))
+    return lambda: mapper.omega_mirror_orbit_array(seeds, 16)
+
+
+def _case_build_colormaps(width: int, height: int):
+    gen = sky("screen_colormap_generator")
+    layout = layout_for(width, height)
+    return lambda: gen.build_colormaps(layout)
+
+
+def _case_colormap_fields(width: int, height: int):
+    gen = sky("screen_colormap_generator")
+    layout = layout_for(width, height)
+    return lambda: gen.build_colormap_fields(layout)
+
+
+def _case_colormap_fields_scaled(width: int, height: int, scale: float):
+    gen = sky("screen_colormap_generator")
+    gov = sky("resolution_governor")
+    layout = layout_for(width, height)
+    q = layout["quarter"]
+    wr, hr = gov.scaled_size(q["width"], q["height"], scale)
+    layout["render"] = {"scale": scale, "width": wr, "height": hr}
+    return lambda: gen.build_colormap_fields(layout)
+
+
+def _case_quarter_grid(width: int, height: int):
+    mapper = sky("screen_quadrant_mapper")
+    return lambda: mapper.compute_quarter_grid(width, height)
+
+
+def _case_geom_frame(players: int):
+    geom = sky("geom_backend")
+    a = player_arrays(players)
+    states = [geom.PlayerState(*(float(a[k][i]) for k in
+                                 ("x", "y", "z", "yaw", "pitch", "vx", "vy", "vz")))
+              for i in range(players)]
+
+    def run():
+        for p in states:
+            geom.build_geom_frame(p, 1920, 1080)
+    return run
+
+
+def _case_geom_frame_cached(players: int):
+    geom = sky("geom_backend")
+    cache = geom.GeomFrameCache(max_entries=max(16, players))
+    idle = geom.PlayerState(0.0, 64.0, 369.0, 45.0, -20.0, 0.0, 0.0, 0.0)
+    states = [idle] * players
+
+    def run():
+        for p in states:
+            cache.get(p, 1920, 1080)
+    return run
+
+
+def _case_axes14_batch(players: int):
+    geom = sky("geom_backend")
+    a = player_arrays(players)
+    return lambda: geom.build_color_pairs_batch(geom.xyz_yaw_pitch_vel_to_axes14_batch(**a))
+
+
+def _case_phi_render(frames: int):
+    eng = omega("omega_phi_8888_engine")
+    audio = eng.OmegaAudioEngine(eng.SAMPLE_RATE, eng.TARGET_HZ, start_stream=False)
+    audio.update_from_char("F", 0.6, (0.0, 0.0, 0.5))
+    return lambda: audio.render(frames)
+
+
+def _case_flame_callback(frames: int):
+    eng = omega("omega_phi_flame_engine")
+    bed = eng.OmegaFourFlameBed("0F26C04")
+    out = np.zeros((frames, 2), dtype=np.float32)
+
+    def run():
+        bed.audio_callback(out, frames, None, None)
+    np.random.seed(SEED)
+    return run
+
+
+CASES: List[Tuple[str, Callable[[], Callable[[], Any]]]] = []
+
+
+def _register() -> None:
+    for n in (1024, 4096):
+        CASES.append(("audiophile.extract_features[{}]".format(n), lambda n=n: _case_extract_features(n)))
+    for n in (2048, 4096):
+        CASES.append(("lion.build_vec14[{}x1]".format(n), lambda n=n: _case_build_vec14(n)))
+    for n in (1024, 4096):
+        CASES.append(("mic.compute_14_float_from_audio[{}]".format(n), lambda n=n: _case_compute_14(n)))
+        CASES.append(("mic.fft_bands[{}]".format(n), lambda n=n: _case_fft_bands(n)))
+        CASES.append(("mic.spectral_descriptors[{}]".format(n), lambda n=n: _case_spectral_descriptors(n)))
+    for block in (256, 1024):
+        CASES.append(("blocks.AnalysisWindow.push[4096<-{}]".format(block),
+                      lambda block=block: _case_analysis_window(4096, block)))
+    for kind in ("mel", "cqt"):
+        CASES.append(("filterbank.apply[{}64@4096]".format(kind),
+                      lambda kind=kind: _case_filterbank(kind, 64, 4096)))
+    CASES.append(("filterbank.publish[mel64@4096]", lambda: _case_filterbank("mel", 64, 4096, True)))
+    CASES.append(("mic.compute_14_float_from_audio[4096+mel64]", lambda: _case_compute_14_bank(4096, 64)))
+    CASES.append(("decimator.process[1024/4]", lambda: _case_decimate(1024, 4)))
+    for factor in (1, 4):
+        CASES.append(("multirate.mic[4096/{}]".format(factor),
+                      lambda factor=factor: _case_mic_multirate(4096, factor)))
+        CASES.append(("multirate.lion[4096/{}]".format(factor),
+                      lambda factor=factor: _case_lion_multirate(4096, factor)))
+    CASES.append(("harmonics.continuum14_to_omega8", _case_omega8))
+    CASES.append(("coord.omega_mirror_orbit[16]", lambda: _case_mirror_orbit(16)))
+    CASES.append(("coord.omega_mirror_orbit_array[100000x16]", lambda: _case_mirror_orbit_array(100000)))
+    for w, h in ((1280, 720), (1920, 1080)):
+        CASES.append(("colormap.build_colormaps[{}x{}]".format(w, h),
+                      lambda w=w, h=h: _case_build_colormaps(w, h)))
+    for w, h in ((1920, 1080), (3840, 2160)):
+        CASES.append(("colormap.build_colormap_fields[{}x{}]".format(w, h),
+                      lambda w=w, h=h: _case_colormap_fields(w, h)))
+    for scale in (0.5, 0.25):
+        CASES.append(("colormap.build_colormap_fields[3840x2160@{:g}]".format(scale),
+                      lambda scale=scale: _case_colormap_fields_scaled(3840, 2160, scale)))
+    CASES.append(("mapper.compute_quarter_grid[3840x2160]", lambda: _case_quarter_grid(3840, 2160)))
+    for n in (1, 32):
+        CASES.append(("geom.build_geom_frame[{}p]".format(n), lambda n=n: _case_geom_frame(n)))
+    CASES.append(("geom.GeomFrameCache.get[32p idle]", lambda: _case_geom_frame_cached(32)))
+    for n in (100, 10000):
+        CASES.append(("geom.axes14_color_pairs_batch[{}p]".format(n), lambda n=n: _case_axes14_batch(n)))
+    for n in (256, 1024):
+        CASES.append(("phi8888.render[{}]".format(n), lambda n=n: _case_phi_render(n)))
+        CASES.append(("flame.audio_callback[{}]".format(n), lambda n=n: _case_flame_callback(n)))
+
+
+_register()
+
+
+# ---------------------------------------------------------------------------
+# Import cases: cold `import <module>` in a fresh interpreter
+# ---------------------------------------------------------------------------
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    (module, self µs, cumulative µs) for every line -X importtime printed.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue  # the header line
+    return rows
+
+
+def measure_import(module: str, repeats: int = IMPORT_REPEATS) -> Dict[str, Any]:
+    totals: List[int] = []
+    owns: List[int] = []
+    forbidden = set()
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + module],
+            cwd=PACKAGE_ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            err = proc.stderr.strip().splitlines()
+            raise ImportError(err[-1] if err else "import {} failed".format(module))
+        rows = parse_importtime(proc.stderr)
+        totals.append(next(cum for name, _, cum in reversed(rows) if name == module))
+        owns.append(sum(own for name, own, _ in rows
+                        if name.split(".", 1)[0] in OWN_PREFIXES))
+        for name, _, _ in rows:
+            for bad in FORBIDDEN_IMPORTS:
+                if name == bad or name.startswith(bad + "."):
+                    forbidden.add(bad)
+    return {
+        "median_us": float(np.median(totals)),
+        "own_us": float(np.median(owns)),
+        "repeats": repeats,
+        "forbidden": sorted(forbidden),
+    }
+
+
+def import_violations(name: str, res: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Fixed startup budget, independent of any baseline.
+    """
+    out = []
+    if res.get("own_us", 0.0) > OWN_IMPORT_BUDGET_US:
+        out.append({"case": name, "metric": "own_us", "baseline": OWN_IMPORT_BUDGET_US,
+                    "current": res["own_us"],
+                    "ratio": round(res["own_us"] / OWN_IMPORT_BUDGET_US, 3)})
+    for bad in res.get("forbidden", ()):
+        out.append({"case": name, "metric": "imports " + bad, "baseline": 0.0,
+                    "current": 1.0, "ratio": None})
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def measure(fn: Callable[[], Any],
+            min_repeats: int = MIN_REPEATS,
+            max_repeats: int = MAX_REPEATS,
+            budget_s: float = TIME_BUDGET_S) -> Dict[str, Any]:
+    for _ in range(WARMUP):
+        fn()
+
+    samples: List[float] = []
+    start = time.perf_counter()
+    while len(samples) < max_repeats:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_repeats and time.perf_counter() - start >= budget_s:
+            break
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    us = np.asarray(samples) * 1e6
+    return {
+        "median_us": round(float(np.median(us)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "mean_us": round(float(np.mean(us)), 2),
+        "repeats": len(samples),
+        "peak_kib": round(peak / 1024.0, 1),
+    }
+
+
+def run_cases(pattern: Optional[str] = None, verbose: bool = True) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, setup in CASES:
+        if pattern and pattern not in name:
+            continue
+        try:
+            fn = setup()
+        except (ImportError, SystemExit, OSError) as e:
+            results[name] = {"skipped": "{}: {}".format(type(e).__name__, e)}
+            if verbose:
+                print("  {:<48} skipped ({})".format(name, results[name]["skipped"]))
+            continue
+        res = measure(fn)
+        results[name] = res
+        if verbose:
+            print("  {:<48} median {:>11.1f} µs  p99 {:>11.1f} µs  peak {:>9.1f} KiB".format(
+                name, res["median_us"], res["p99_us"], res["peak_kib"]))
+
+    for module in IMPORT_MODULES:
+        name = "import." + module
+        if pattern and pattern not in name:
+            continue
+        try:
+            res = measure_import(module)
+        except ImportError as e:
+            results[name] = {"skipped": "ImportError: {}".format(e)}
+            if verbose:
+                print("  {:<48} skipped ({})".format(name, results[name]["skipped"]))
+            continue
+        results[name] = res
+        if verbose:
+            print("  {:<48} median {:>11.1f} µs  own {:>11.1f} µs{}".format(
+                name, res["median_us"], res["own_us"],
+                "  imports " + ", ".join(res["forbidden"]) if res["forbidden"] else ""))
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": SEED,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]],
+            baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Cases whose median time or peak memory grew past the threshold, plus
+    import cases over their fixed budget.
+    """
+    base_cases = baseline.get("cases", {})
+    regressions = []
+    for name, res in results.items():
+        if "skipped" in res:
+            continue
+        is_import = name.startswith("import.")
+        if is_import:
+            regressions.extend(import_violations(name, res))
+        base = base_cases.get(name)
+        if not base or "skipped" in base:
+            continue
+        floors = ((("median_us", IMPORT_NOISE_FLOOR_US),) if is_import else
+                  (("median_us", NOISE_FLOOR_US), ("peak_kib", NOISE_FLOOR_KIB)))
+        for key, floor in floors:
+            if key not in base or key not in res:
+                continue
+            old, new = float(base[key]), float(res[key])
+            if new > old * (1.0 + threshold) and new - old > floor:
+                regressions.append({
+                    "case": name,
+                    "metric": key,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": round(new / old, 3) if old > 0 else None,
+                })
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_JSON) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_JSON) -> None:
+    data = load_baseline(path) or {}
+    cases = dict(data.get("cases", {}))
+    cases.update(results)
+    data = {
+        "environment": environment(),
+        "saved": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": dict(sorted(cases.items())),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    sky_profiler.install("benchmark_suite")
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy hot paths.")
+    parser.add_argument("--filter", default=None, help="only cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_JSON)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown before flagging (default 0.25)")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--json", default=None, help="also dump this run's results here")
+    args = parser.parse_args()
+
+    print("8XD benchmark suite")
+    print("  Python {} / NumPy {} / seed {}".format(platform.python_version(), np.__version__, SEED))
+    results = run_cases(args.filter)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "cases": results}, f, indent=2)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print("  Baseline saved :", args.baseline)
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("  No baseline at {} (run with --save); import budgets only.".format(args.baseline))
+        baseline = {}
+
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print("  No regressions (threshold {:.0%}).".format(args.threshold))
+        return
+    print("  REGRESSIONS (threshold {:.0%}):".format(args.threshold))
+    for r in regressions:
+        print("    {:<48} {:<9} {:>11.1f} → {:>11.1f}  (x{})".format(
+            r["case"], r["metric"], r["baseline"], r["current"], r["ratio"]))
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Client-side stubs (resolution ping).
+"""
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+coord_tile_encoder.py — region-scale coordinate encoding into .npy tiles.
+
+Focus:
+
+  • Take a world bounding box (block x/z) or the region files under
+    godmode/world*/region (r.X.Z.mca → one 512 x 512 block tile each).
+  • The locked encodings from numpy_coord_mapper depend only on z, so a
+    tile stores one entry per block row, indexed [z - z0], and is valid
+    for every x in the tile:
+       - scalar : 0.<reverse(|z|)>                   (H,)      float64
+       - base8  : 12 octal digits of the scalar       (H, 12)   uint8
+       - vec14  : forward + mirrored continuum        (H, 14)   float64
+  • Region tiles follow the .mca header: rows of chunks that do not exist
+    are left unencoded (scalar / vec14 NaN, base8 0), and the (32, 32)
+    chunk presence map [cz, cx] is written next to them. Regions without
+    any chunk write nothing but their .done marker.
+  • Tiles are split across a process pool (one task per region tile).
+  • Progress is resumable: a finished tile leaves a .done marker and is
+    skipped on the next run.
+
+Output:
+
+  coord_tiles/<dimension>/r.X.Z.scalar.npy
+  coord_tiles/<dimension>/r.X.Z.base8.npy
+  coord_tiles/<dimension>/r.X.Z.vec14.npy
+  coord_tiles/<dimension>/r.X.Z.chunks.npy      (region tiles only)
+  coord_tiles/<dimension>/r.X.Z.done
+
+Usage:
+
+  sky-coord-tiles                                # every region file
+  sky-coord-tiles --bbox -600 -600 600 600       # block bbox
+  sky-coord-tiles --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .numpy_coord_mapper import (
+    int_to_reversed_unit_array,
+    scalar_to_base8_digit_matrix,
+    encode_scalars_to_vec14_array,
+)
+from .anvil_region_reader import CHUNK_BLOCKS, WORLD_ROOT, RegionFile, region_paths
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(ROOT, "coord_tiles")
+
+REGION_BLOCKS = 512
+BASE8_DIGITS = 12
+
+
+def region_tasks(world_root: str = WORLD_ROOT) -> List[Dict[str, Any]]:
+    """
+    One full-region tile per anvil_region_reader.region_paths() entry.
+    """
+    return [dict(t, width=REGION_BLOCKS, height=REGION_BLOCKS) for t in region_paths(world_root)]
+
+
+def bbox_tasks(x0: int, z0: int, x1: int, z1: int, dimension: str = "bbox") -> List[Dict[str, Any]]:
+    """
+    Region-aligned tiles covering the inclusive block bbox, clipped to it.
+    """
+    if x1 < x0:
+        x0, x1 = x1, x0
+    if z1 < z0:
+        z0, z1 = z1, z0
+    tasks = []
+    for rz in range(z0 // REGION_BLOCKS, z1 // REGION_BLOCKS + 1):
+        for rx in range(x0 // REGION_BLOCKS, x1 // REGION_BLOCKS + 1):
+            tx0 = max(x0, rx * REGION_BLOCKS)
+            tz0 = max(z0, rz * REGION_BLOCKS)
+            tx1 = min(x1, rx * REGION_BLOCKS + REGION_BLOCKS - 1)
+            tz1 = min(z1, rz * REGION_BLOCKS + REGION_BLOCKS - 1)
+            name = "r.{}.{}".format(rx, rz)
+            if tx1 - tx0 + 1 != REGION_BLOCKS or tz1 - tz0 + 1 != REGION_BLOCKS:
+                # Clipped tile: keep its extent in the name so other bboxes
+                # never reuse (or skip) it.
+                name += ".{}_{}_{}x{}".format(tx0, tz0, tx1 - tx0 + 1, tz1 - tz0 + 1)
+            tasks.append({
+                "dimension": dimension,
+                "name": name,
+                "x0": tx0,
+                "z0": tz0,
+                "width": tx1 - tx0 + 1,
+                "height": tz1 - tz0 + 1,
+            })
+    return tasks
+
+
+def tile_prefix(out_dir: str, task: Dict[str, Any]) -> str:
+    return os.path.join(out_dir, task["dimension"], task["name"])
+
+
+def _save(path: str, arr: np.ndarray) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+def encode_tile(task: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    """
+    Worker: encode one tile's rows into .npy files.
+    """
+    prefix = tile_prefix(out_dir, task)
+    done_path = prefix + ".done"
+    if os.path.exists(done_path):
+        return dict(task, skipped=True)
+
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    h = int(task["height"])
+    t0 = time.perf_counter()
+
+    rows = np.ones(h, dtype=bool)
+    present = None
+    if task.get("path"):
+        with RegionFile(task["path"]) as region:
+            present = region.present.copy()
+        rows = np.repeat(present.any(axis=1), CHUNK_BLOCKS)[:h]
+
+    info = dict(task, rows=int(rows.sum()))
+    if rows.any():
+        z = np.arange(task["z0"], task["z0"] + h, dtype=np.int64)[rows]
+        scalar_rows = int_to_reversed_unit_array(z)
+
+        scalar = np.full(h, np.nan)
+        base8 = np.zeros((h, BASE8_DIGITS), dtype=np.uint8)
+        vec14 = np.full((h, 14), np.nan)
+        scalar[rows] = scalar_rows
+        base8[rows] = scalar_to_base8_digit_matrix(scalar_rows, BASE8_DIGITS)
+        vec14[rows] = encode_scalars_to_vec14_array(scalar_rows)
+
+        _save(prefix + ".scalar.npy", scalar)
+        _save(prefix + ".base8.npy", base8)
+        _save(prefix + ".vec14.npy", vec14)
+        if present is not None:
+            _save(prefix + ".chunks.npy", present)
+
+    with open(done_path, "w") as f:
+        json.dump(dict(info, seconds=round(time.perf_counter() - t0, 3)), f)
+    return dict(info, skipped=False)
+
+
+def run(tasks: List[Dict[str, Any]],
+        out_dir: str = OUT_DIR,
+        workers: Optional[int] = None) -> Dict[str, int]:
+    counts = {"encoded": 0, "skipped": 0}
+    if not tasks:
+        return counts
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(encode_tile, t, out_dir) for t in tasks]
+        for fut in as_completed(futures):
+            res = fut.result()
+            key = "skipped" if res["skipped"] else "encoded"
+            counts[key] += 1
+            print("  {:<8} {}/{}  x0={} z0={} {}x{}  rows={}".format(
+                key, res["dimension"], res["name"],
+                res["x0"], res["z0"], res["width"], res["height"], res.get("rows", "-")))
+    return counts
+
+
+def main() -> None:
+    sky_profiler.install("coord_tile_encoder")
+    parser = argparse.ArgumentParser(description="Encode block columns into .npy tiles.")
+    parser.add_argument("--bbox", type=int, nargs=4, metavar=("X0", "Z0", "X1", "Z1"),
+                        help="inclusive block bounding box instead of region files")
+    parser.add_argument("--world-root", default=WORLD_ROOT,
+                        help="server dir holding world*/region (default: ../godmode)")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.bbox:
+        tasks = bbox_tasks(*args.bbox)
+    else:
+        tasks = region_tasks(args.world_root)
+
+    print("8XD coordinate tile encoder")
+    print("  Out     :", args.out)
+    print("  Tiles   :", len(tasks))
+    t0 = time.perf_counter()
+    counts = run(tasks, args.out, args.workers)
+    print("  Encoded : {}  (already done: {})".format(counts["encoded"], counts["skipped"]))
+    print("  Time    : {:.2f}s".format(time.perf_counter() - t0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+decimator.py — streaming polyphase decimation and multi-rate analysis windows.
+
+Focus:
+
+  • The mic / audiophile / lion engines FFT the raw 44.1 / 48 kHz stream
+    although most of what they measure lives far below Nyquist.
+    PolyphaseDecimator low-passes and decimates by an integer factor M
+    across callback blocks: filter history and output phase carry over,
+    so block boundaries leave no seam, and only every M-th output is ever
+    computed (one windowed dot product per output sample, n · TAPS_PER_PHASE
+    multiply-adds per block instead of n · M · TAPS_PER_PHASE).
+  • The filter is a Blackman-windowed sinc with M · TAPS_PER_PHASE taps and
+    unit DC gain, designed once per factor. It is flat up to
+    passband_hz(); bands above that must come from the full-rate path.
+  • MultiRateWindow is the analysis front-end: it keeps the last N / M
+    full-rate frames (for whatever really needs full bandwidth) and the
+    last N / M decimated frames (same duration as the old N-frame window,
+    same frequency resolution below passband_hz()). Two FFTs of N / M
+    points replace one of N; with M = 1 it is a plain N-frame window.
+  • The decimated stream lags by the filter's group delay,
+    (M · TAPS_PER_PHASE - 1) / 2 input frames (under a millisecond at
+    M = 4 and 44.1 kHz).
+
+Environment:
+
+  SKY_DECIMATE   decimation factor for the engines' analysis path
+                 (default 1 = off, full rate only; at most MAX_FACTOR)
+
+Usage:
+
+  SKY_DECIMATE=4 sky-mic
+  SKY_DECIMATE=4 sky-benchmark --filter multirate
+"""
+
+import functools
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from .adaptive_blocks import AnalysisWindow
+
+ENV_DECIMATE = "SKY_DECIMATE"
+MAX_FACTOR = 16
+
+TAPS_PER_PHASE = 16
+# Share of the decimated Nyquist that is alias-free and flat with the
+# filter above (Blackman transition ≈ 5.5 / (M · TAPS_PER_PHASE)).
+PASSBAND_FRACTION = 0.6
+
+
+def factor_from_env(default: int = 1) -> int:
+    try:
+        factor = int(os.environ.get(ENV_DECIMATE, default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(1, factor), MAX_FACTOR)
+
+
+def passband_hz(sample_rate: float, factor: int) -> float:
+    """
+    Highest frequency the decimated stream reproduces faithfully.
+    """
+    return PASSBAND_FRACTION * sample_rate / (2.0 * factor)
+
+
+@functools.lru_cache(maxsize=16)
+def design_lowpass(factor: int, taps_per_phase: int = TAPS_PER_PHASE) -> np.ndarray:
+    """
+    Anti-alias FIR for decimation by `factor`: cutoff at the new Nyquist,
+    factor · taps_per_phase taps, unit DC gain. Read-only, cached.
+    """
+    n = int(factor) * int(taps_per_phase)
+    k = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+    h = np.sinc(k / factor) * np.blackman(n)
+    h /= h.sum()
+    h.setflags(write=False)
+    return h
+
+
+class PolyphaseDecimator:
+    """
+    Streaming low-pass + keep-every-M-th for (n,) or (n, channels) blocks.
+    """
+
+    def __init__(self, factor: int, channels: int = 1, taps_per_phase: int = TAPS_PER_PHASE):
+        self.factor = max(1, int(factor))
+        self.channels = max(1, int(channels))
+        # Reversed once so each output is windows @ taps (a correlation).
+        self.taps = np.ascontiguousarray(design_lowpass(self.factor, taps_per_phase)[::-1])
+        self.delay = (self.taps.size - 1) / 2.0
+        self.reset()
+
+    def reset(self) -> None:
+        self._hist = np.zeros((self.taps.size - 1, self.channels), dtype=np.float64)
+        # Input frames to skip before the next output lands.
+        self._skip = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Feed one block; returns the decimated frames it completes, shaped
+        (m, channels). m is n / M on average (it varies by one when n is
+        not a multiple of M).
+        """
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        x = np.concatenate([self._hist, block], axis=0)
+        h = self._hist.shape[0]
+        first = h + self._skip
+        if x.shape[0] > first:
+            count = (x.shape[0] - 1 - first) // self.factor + 1
+        else:
+            count = 0
+        out = np.empty((count, self.channels), dtype=np.float64)
+        if count:
+            # (count, channels, taps) view: the window ending at each kept
+            # frame, stepping M frames; x[first - h + k·M :][:taps] stays in
+            # bounds by the count above.
+            s0, s1 = x.strides
+            windows = as_strided(x[first - h:], shape=(count, self.channels, self.taps.size),
+                                 strides=(self.factor * s0, s1, s0), writeable=False)
+            np.matmul(windows, self.taps, out=out)
+        self._skip = first + count * self.factor - x.shape[0]
+        if h:
+            self._hist = x[-h:]
+        return out
+
+
+class MultiRateWindow:
+    """
+    Full-rate and decimated analysis windows fed from the same blocks.
+
+    push() returns (full, low): the last size // factor full-rate frames
+    and the last size // factor decimated frames (None when factor is 1,
+    in which case full is the whole size-frame window). Both are internal
+    buffers: read them before the next push.
+    """
+
+    def __init__(self, size: int, channels: int = 1, factor: int = 1):
+        self.size = max(1, int(size))
+        self.factor = min(max(1, int(factor)), self.size)
+        span = max(1, self.size // self.factor)
+        self.full = AnalysisWindow(span, channels)
+        self.low: Optional[AnalysisWindow] = None
+        self.decimator: Optional[PolyphaseDecimator] = None
+        if self.factor > 1:
+            self.low = AnalysisWindow(span, channels, dtype=np.float64)
+            self.decimator = PolyphaseDecimator(self.factor, channels)
+
+    def push(self, block: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        full = self.full.push(block)
+        if self.decimator is None:
+            return full, None
+        return full, self.low.push(self.decimator.process(block))
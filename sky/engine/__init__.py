@@ -0,0 +1,3 @@
+"""
+Server-side evolution loop (numpy_core).
+"""
@@ -1,5 +1,28 @@
 #!/usr/bin/env python3
-import json, time, math, os
+"""
+numpy_core.py — server-side 14-axis continuum evolution (Sequence 6).
+
+  • Phase is a function of elapsed time (PHASE_RATE rad/s), not of how
+    many loop iterations ran, so late or dropped ticks never change speed.
+  • A fixed-timestep clock schedules ticks at start + k·dt: sleep time is
+    compensated for the work done, and a stall of more than MAX_CATCHUP
+    ticks is skipped instead of replayed.
+  • evolve14 is one vectorized np.sin over the 14 axis offsets.
+  • client/resolution.json is re-parsed only when its mtime/size change.
+  • bpm_sync.json is published once per tick (default 20 Hz, the server
+    TPS, or $NUMPY_CORE_HZ; read by main(), not at import).
+
+Usage:
+
+  sky-numpy-core                   # 20 Hz
+  sky-numpy-core --hz 60
+"""
+
+import argparse
+import json
+import math
+import os
+import time
 
 try:
     import numpy as np
@@ -7,63 +30,159 @@ try:
 except Exception:
     NUMPY = False
 
-ROOT = os.path.expanduser("~/Desktop/sky")
+from .. import sky_profiler, sky_metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 axes_path = os.path.join(ROOT, "hypercube", "axes14.json")
 resolution_path = os.path.join(ROOT, "client", "resolution.json")
 frame_path = os.path.join(ROOT, "bpm_sync.json")
 
-phase = 0.0
-disc_spin = 0.0
+# Original loop: +0.03 rad and +0.007 spin per frame at 60 frames/s.
+PHASE_RATE = 0.03 * 60.0
+SPIN_RATE = 0.007 * 60.0
+AXIS_STEP = 0.23
+AXES = 14
+UNIT_MAX = 0.999999999999
 
-def evolve14():
-    global phase
-    phase += 0.03
-    arr = []
-    for i in range(14):
-        v = math.sin(phase + i * 0.23) * 0.5 + 0.5
-        if v >= 1.0:
-            v = 0.999999999999
-        if v < 0.0:
-            v = 0.0
-        arr.append(v)
+ENV_HZ = "NUMPY_CORE_HZ"
+DEFAULT_HZ = 20.0
+MAX_CATCHUP = 5
+
+if NUMPY:
+    AXIS_OFFSETS = np.arange(AXES, dtype=np.float64) * AXIS_STEP
+
+
+def evolve14(phase):
+    """
+    14 axes in [0, 1) at the given phase (radians).
+    """
     if NUMPY:
-        return np.array(arr, dtype=float)
+        v = np.sin(phase + AXIS_OFFSETS) * 0.5 + 0.5
+        return np.clip(v, 0.0, UNIT_MAX)
+    arr = []
+    for i in range(AXES):
+        v = math.sin(phase + i * AXIS_STEP) * 0.5 + 0.5
+        arr.append(min(max(v, 0.0), UNIT_MAX))
     return arr
 
-print("NumPy available:", NUMPY)
-print("Starting 14-axis continuum evolution loop (Sequence 6)...")
 
-while True:
-    global disc_spin
-    disc_spin = (disc_spin + 0.007) % 1.0
+class ResolutionCache:
+    """
+    Parsed resolution.json, reloaded only when the file changes on disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._sig = None
+        self.value = None
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._sig = None
+            self.value = None
+            return None
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig != self._sig:
+            try:
+                with open(self.path) as f:
+                    self.value = json.load(f)
+            except Exception:
+                self.value = None
+            self._sig = sig
+        return self.value
 
-    axes = evolve14()
-    if NUMPY:
-        axes_list = [float(x) for x in axes.tolist()]
-    else:
-        axes_list = [float(x) for x in axes]
 
-    payload = {
+class FixedStepClock:
+    """
+    Ticks at start + k·dt with drift compensation.
+
+    wait() sleeps until the next tick boundary and returns the tick index;
+    when more than max_catchup ticks were missed it jumps ahead instead of
+    bursting through them.
+    """
+
+    def __init__(self, hz, max_catchup=MAX_CATCHUP, clock=time.monotonic):
+        self.dt = 1.0 / max(1e-3, float(hz))
+        self.max_catchup = max(1, int(max_catchup))
+        self.clock = clock
+        self.start = clock()
+        self.tick = 0
+        self.dropped = 0
+
+    def elapsed(self):
+        return self.tick * self.dt
+
+    def wait(self):
+        self.tick += 1
+        target = self.start + self.tick * self.dt
+        now = self.clock()
+        if now < target:
+            time.sleep(target - now)
+        else:
+            behind = int((now - target) / self.dt)
+            if behind > self.max_catchup:
+                self.tick += behind
+                self.dropped += behind
+        return self.tick
+
+
+def build_payload(t, resolution):
+    phase = PHASE_RATE * t
+    axes = evolve14(phase)
+    axes_list = [float(x) for x in (axes.tolist() if NUMPY else axes)]
+    return {
         "ts": time.time(),
         "axes14": axes_list,
-        "disc_spin": float(disc_spin),
+        "disc_spin": float((SPIN_RATE * t) % 1.0),
         "bpm": 0.0,
-        "phase": float((phase % (2*math.pi)) / (2*math.pi)),
+        "phase": float((phase % (2 * math.pi)) / (2 * math.pi)),
         "bands": [axes_list[0], axes_list[1], axes_list[2]],
-        "resolution": None,
+        "resolution": resolution,
         "note": "Server-side NumPy 14D evolution; mic + true screen ping comes later in the sequence."
     }
 
-    if os.path.exists(resolution_path):
-        try:
-            with open(resolution_path) as f:
-                payload["resolution"] = json.load(f)
-        except Exception:
-            payload["resolution"] = None
 
-    tmp = frame_path + ".tmp"
+def publish(payload, path=frame_path):
+    tmp = path + ".tmp"
     with open(tmp, "w") as f:
         json.dump(payload, f)
-    os.replace(tmp, frame_path)
+    os.replace(tmp, path)
+
+
+def run(hz=DEFAULT_HZ, path=frame_path):
+    resolution = ResolutionCache(resolution_path)
+    clock = FixedStepClock(hz)
+    meter = sky_metrics.RateMeter(hz)
+    dropped = 0
+
+    while True:
+        sky_profiler.tick()
+        payload = build_payload(clock.elapsed(), resolution.get())
+        with sky_metrics.PUBLISH_SECONDS.time():
+            publish(payload, path)
+        meter.tick()
+        clock.wait()
+        if clock.dropped != dropped:
+            sky_metrics.DROPPED_TICKS.inc(clock.dropped - dropped)
+            dropped = clock.dropped
+
+
+def main():
+    sky_profiler.install("numpy_core")
+    sky_metrics.serve("numpy_core")
+    parser = argparse.ArgumentParser(description="14-axis continuum evolution loop.")
+    # A string default goes through type=float, so a bad $NUMPY_CORE_HZ
+    # is reported like a bad --hz.
+    parser.add_argument("--hz", type=float, default=os.environ.get(ENV_HZ, str(DEFAULT_HZ)),
+                        help="publish rate (default: 20, or $NUMPY_CORE_HZ)")
+    args = parser.parse_args()
+
+    print("NumPy available:", NUMPY)
+    print("Starting 14-axis continuum evolution loop (Sequence 6) at {:g} Hz...".format(args.hz))
+    run(args.hz)
+
 
-    time.sleep(1.0 / 60.0)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+filterbank.py — precomputed sparse mel / log / constant-Q filterbanks.
+
+Focus:
+
+  • The only spectral shape that left Python was mic_engine_8xd's 7
+    normalized bands (or a single centroid from the audiophile / lion
+    engines). Filterbank maps an rfft magnitude onto 16–128 bands so the
+    sky renderer gets a real spectrum.
+  • Each bank is built once per (kind, bands, FFT size, rate) and stored
+    CSR-style: indptr (bands + 1), bin indices and weights (non-zeros
+    only). apply() is one gather, one multiply and one np.add.reduceat, so
+    64 bands cost about what the old 7-band loop did.
+       - mel : triangles evenly spaced on the mel scale
+       - log : triangles evenly spaced in log frequency
+       - cqt : raised-cosine kernels, bandwidth = centre / Q
+    Every band keeps at least one bin (the one nearest its centre), and
+    weights sum to 1 per band (band value = weighted mean magnitude).
+  • quantize() turns a frame into uint8 on a dB scale relative to the
+    frame's loudest band (255 = peak, 0 = DB_RANGE below or silent);
+    encode() packs that as a hex string, two characters per band. The
+    engines publish it as "spectrum" next to vec14, with "spectrum_bank"
+    naming the layout (e.g. "mel:32").
+
+Environment:
+
+  SKY_BANDS   "<kind>:<bands>" with kind in mel / log / cqt (default mel:32),
+              or "off" to publish no spectrum
+
+Usage:
+
+  SKY_BANDS=cqt:64 sky-lion
+  python3 -c "import json; from sky import filterbank as fb; \\
+      print(fb.decode(json.load(open('sky/bpm_sync.json'))['spectrum']))"
+"""
+
+import functools
+import math
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+ENV_BANDS = "SKY_BANDS"
+KINDS = ("mel", "log", "cqt")
+DEFAULT_SPEC = ("mel", 32)
+MIN_BANDS = 1
+MAX_BANDS = 128
+
+F_MIN = 20.0
+F_MAX = 20000.0
+DB_RANGE = 60.0
+
+
+def parse_spec(raw: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    "mel:32" → ("mel", 32); "off" → None; anything unreadable → DEFAULT_SPEC.
+    """
+    raw = (raw or "").strip().lower()
+    if not raw:
+        return DEFAULT_SPEC
+    if raw in ("off", "none", "0"):
+        return None
+    kind, _, count = raw.partition(":")
+    if kind not in KINDS:
+        return DEFAULT_SPEC
+    try:
+        n = int(count) if count else DEFAULT_SPEC[1]
+    except ValueError:
+        return DEFAULT_SPEC
+    return kind, min(max(MIN_BANDS, n), MAX_BANDS)
+
+
+def spec_from_env() -> Optional[Tuple[str, int]]:
+    return parse_spec(os.environ.get(ENV_BANDS))
+
+
+def _hz_to_mel(f):
+    return 2595.0 * np.log10(1.0 + np.asarray(f, dtype=np.float64) / 700.0)
+
+
+def _mel_to_hz(m):
+    return 700.0 * (10.0 ** (np.asarray(m, dtype=np.float64) / 2595.0) - 1.0)
+
+
+class Filterbank:
+    """
+    n_bands filters over the bins of an n_fft-point rfft at sample_rate.
+    Arrays are read-only; banks from get_bank() are shared.
+    """
+
+    def __init__(self,
+                 kind: str,
+                 n_bands: int,
+                 n_fft: int,
+                 sample_rate: float,
+                 f_min: float = F_MIN,
+                 f_max: Optional[float] = None):
+        if kind not in KINDS:
+            raise ValueError("unknown filterbank kind {!r} (expected one of {})".format(kind, ", ".join(KINDS)))
+        self.kind = kind
+        self.n_bands = max(MIN_BANDS, int(n_bands))
+        self.n_fft = max(1, int(n_fft))
+        self.sample_rate = float(sample_rate)
+        self.f_min = float(f_min)
+        self.f_max = float(min(F_MAX, self.sample_rate / 2.0) if f_max is None else f_max)
+
+        freqs = np.fft.rfftfreq(self.n_fft, d=1.0 / self.sample_rate)
+        lo, centre, hi = self._band_edges()
+        indptr = [0]
+        indices = []
+        weights = []
+        for b in range(self.n_bands):
+            idx, w = self._kernel(freqs, lo[b], centre[b], hi[b])
+            if idx.size == 0 or w.sum() <= 0.0:
+                idx = np.array([int(np.argmin(np.abs(freqs - centre[b])))])
+                w = np.ones(1)
+            indices.append(idx)
+            weights.append(w / w.sum())
+            indptr.append(indptr[-1] + idx.size)
+
+        self.centres = centre
+        self.upper = hi
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.concatenate(indices).astype(np.intp)
+        self.weights = np.concatenate(weights).astype(np.float64)
+        self.starts = self.indptr[:-1]
+        for arr in (self.centres, self.upper, self.indptr, self.indices, self.weights, self.starts):
+            arr.setflags(write=False)
+
+    @property
+    def spec(self) -> str:
+        return "{}:{}".format(self.kind, self.n_bands)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    def _band_edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (lower, centre, upper) frequency of every band.
+        """
+        n = self.n_bands
+        if self.kind == "mel":
+            pts = _mel_to_hz(np.linspace(_hz_to_mel(self.f_min), _hz_to_mel(self.f_max), n + 2))
+            return pts[:-2], pts[1:-1], pts[2:]
+        if self.kind == "log":
+            pts = np.geomspace(self.f_min, self.f_max, n + 2)
+            return pts[:-2], pts[1:-1], pts[2:]
+        # cqt: n log-spaced centres, each kernel centre / Q wide.
+        centre = np.geomspace(self.f_min, self.f_max, n)
+        per_octave = (n - 1) / max(1e-9, math.log2(self.f_max / self.f_min)) if n > 1 else 1.0
+        q = 1.0 / (2.0 ** (1.0 / max(per_octave, 1e-9)) - 1.0)
+        half = centre / q
+        return centre - half, centre, centre + half
+
+    def _kernel(self, freqs: np.ndarray, lo: float, centre: float, hi: float) -> Tuple[np.ndarray, np.ndarray]:
+        first, last = np.searchsorted(freqs, (lo, hi), side="right")
+        idx = np.arange(first, last)
+        f = freqs[idx]
+        if self.kind == "cqt":
+            w = 0.5 + 0.5 * np.cos(np.pi * (f - centre) / max(hi - centre, 1e-12))
+        else:
+            up = (f - lo) / max(centre - lo, 1e-12)
+            down = (hi - f) / max(hi - centre, 1e-12)
+            w = np.minimum(up, down)
+        keep = w > 0.0
+        return idx[keep], w[keep]
+
+    def apply(self, mag: np.ndarray) -> np.ndarray:
+        """
+        Band values for an rfft magnitude of shape (bins,) or (bins, ch).
+        """
+        mag = np.asarray(mag)
+        w = self.weights if mag.ndim == 1 else self.weights[:, np.newaxis]
+        return np.add.reduceat(mag[self.indices] * w, self.starts, axis=0)
+
+    def dense(self) -> np.ndarray:
+        """
+        The (bands, bins) weight matrix (inspection only).
+        """
+        m = np.zeros((self.n_bands, self.n_fft // 2 + 1))
+        rows = np.repeat(np.arange(self.n_bands), np.diff(self.indptr))
+        m[rows, self.indices] = self.weights
+        return m
+
+    def __repr__(self) -> str:
+        return "Filterbank({}, n_fft={}, sr={:g}, {:g}–{:g} Hz, nnz={})".format(
+            self.spec, self.n_fft, self.sample_rate, self.f_min, self.f_max, self.nnz)
+
+
+@functools.lru_cache(maxsize=32)
+def get_bank(kind: str,
+             n_bands: int,
+             n_fft: int,
+             sample_rate: float,
+             f_min: float = F_MIN,
+             f_max: Optional[float] = None) -> Filterbank:
+    """
+    Shared bank for these parameters (LRU cached, do not mutate).
+    """
+    return Filterbank(kind, n_bands, n_fft, sample_rate, f_min, f_max)
+
+
+def bank_from_env(n_fft: int, sample_rate: float) -> Optional[Filterbank]:
+    """
+    The SKY_BANDS bank for this FFT size, or None when switched off.
+    """
+    spec = spec_from_env()
+    if spec is None:
+        return None
+    return get_bank(spec[0], spec[1], int(n_fft), float(sample_rate))
+
+
+def apply_multirate(bank: Filterbank,
+                    mag_full: np.ndarray,
+                    n_full: int,
+                    mag_low: np.ndarray,
+                    n_low: int,
+                    factor: int,
+                    passband_hz: float) -> np.ndarray:
+    """
+    bank over a full-rate and a decimated spectrum (decimator.py): bands
+    that end below passband_hz use the decimated spectrum's finer bins.
+    Each half is scaled by its Hann window sum so they line up.
+    """
+    low_bank = get_bank(bank.kind, bank.n_bands, int(n_low), bank.sample_rate / factor,
+                        bank.f_min, bank.f_max)
+    full = bank.apply(mag_full) / max(1.0, 0.5 * (n_full - 1))
+    low = low_bank.apply(mag_low) / max(1.0, 0.5 * (n_low - 1))
+    return np.where(bank.upper <= passband_hz, low, full)
+
+
+def quantize(bands: np.ndarray, db_range: float = DB_RANGE) -> np.ndarray:
+    """
+    uint8 per band: 255 at the frame's loudest band, 0 at db_range below
+    it (or for a silent frame).
+    """
+    bands = np.asarray(bands, dtype=np.float64)
+    peak = float(bands.max()) if bands.size else 0.0
+    if not peak > 0.0 or not math.isfinite(peak):
+        return np.zeros(bands.shape, dtype=np.uint8)
+    db = 20.0 * np.log10(np.maximum(bands, peak * 1e-12) / peak)
+    level = np.clip(1.0 + db / db_range, 0.0, 1.0)
+    return np.rint(level * 255.0).astype(np.uint8)
+
+
+def encode(u8: np.ndarray) -> str:
+    return np.ascontiguousarray(u8, dtype=np.uint8).tobytes().hex()
+
+
+def decode(text: str) -> np.ndarray:
+    return np.frombuffer(bytes.fromhex(text or ""), dtype=np.uint8)
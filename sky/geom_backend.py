@@ -0,0 +1,664 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Tuple, Sequence
+
+import numpy as np
+import os
+
+from .numpy_coord_mapper import int_to_reversed_unit_array
+from .implicit_grid import pixel_grid
+from . import sky_profiler, sky_metrics
+
+SKY_ROOT = os.path.dirname(os.path.abspath(__file__))
+GEOM_JSON = os.path.join(SKY_ROOT, "geom_frame.json")
+
+# Column order of the batched (N, 14) axes array (same as the dict order).
+AXES14_KEYS = ("x", "y", "z", "w", "v", "u", "t", "a", "b", "c", "d", "e", "f", "g")
+
+
+def norm01(x: float, lo: float, hi: float) -> float:
+    if hi <= lo:
+        return 0.0
+    v = (x - lo) / float(hi - lo)
+    if v < 0.0:
+        v = 0.0
+    if v >= 1.0:
+        v = 0.999999999999
+    return float(v)
+
+
+def base10_to_01_flipped(n: float) -> float:
+    s = str(abs(int(round(n))))
+    rev = s[::-1]
+    v = float("0." + rev)
+    if v >= 1.0:
+        v = 0.999999999999
+    return v
+
+
+@dataclass
+class PlayerState:
+    x: float
+    y: float
+    z: float
+    yaw: float
+    pitch: float
+    vx: float
+    vy: float
+    vz: float
+
+    def speed(self) -> float:
+        return float(math.sqrt(self.vx ** 2 + self.vy ** 2 + self.vz ** 2))
+
+
+def xyz_yaw_pitch_vel_to_axes14(p: PlayerState) -> Dict[str, float]:
+    fx = base10_to_01_flipped(p.x)
+    fy = base10_to_01_flipped(p.y)
+    fz = base10_to_01_flipped(p.z)
+
+    yaw01 = norm01((p.yaw + 180.0), 0.0, 360.0)
+    pitch01 = norm01((p.pitch + 90.0), 0.0, 180.0)
+
+    speed = p.speed()
+    vx01 = norm01(abs(p.vx), 0.0, 1.0)
+    vy01 = norm01(abs(p.vy), 0.0, 1.0)
+    vz01 = norm01(abs(p.vz), 0.0, 1.0)
+    speed01 = norm01(speed, 0.0, 1.0)
+
+    r = float(math.sqrt(p.x ** 2 + p.y ** 2 + p.z ** 2))
+    r01 = norm01(r, 0.0, 1024.0)
+
+    x_axis = fx
+    y_axis = fy
+    z_axis = fz
+    w_axis = yaw01
+    v_axis = pitch01
+    u_axis = speed01
+    t_axis = r01
+
+    a_axis = norm01(fx + fy, 0.0, 2.0)
+    b_axis = norm01(fy + fz, 0.0, 2.0)
+    c_axis = norm01(fz + fx, 0.0, 2.0)
+    d_axis = norm01(vx01 + vy01, 0.0, 2.0)
+    e_axis = norm01(vy01 + vz01, 0.0, 2.0)
+    f_axis = norm01(vz01 + vx01, 0.0, 2.0)
+    g_axis = norm01(r01 + yaw01 + pitch01, 0.0, 3.0)
+
+    def clamp(v: float) -> float:
+        return min(v, 0.999999999999)
+
+    return {
+        "x": clamp(x_axis),
+        "y": clamp(y_axis),
+        "z": clamp(z_axis),
+        "w": clamp(w_axis),
+        "v": clamp(v_axis),
+        "u": clamp(u_axis),
+        "t": clamp(t_axis),
+        "a": clamp(a_axis),
+        "b": clamp(b_axis),
+        "c": clamp(c_axis),
+        "d": clamp(d_axis),
+        "e": clamp(e_axis),
+        "f": clamp(f_axis),
+        "g": clamp(g_axis),
+    }
+
+
+def norm01_array(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """
+    Vectorized norm01 (same rounding, same clamps).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if hi <= lo:
+        return np.zeros_like(x)
+    v = (x - lo) / float(hi - lo)
+    v = np.where(v < 0.0, 0.0, v)
+    return np.where(v >= 1.0, 0.999999999999, v)
+
+
+def _py_square(x: np.ndarray) -> np.ndarray:
+    """
+    x ** 2 with Python's float rounding (libm pow), not NumPy's x * x,
+    so batched results stay bit-identical to the scalar math.
+    """
+    return np.float_power(x, 2.0)
+
+
+def base10_to_01_flipped_array(n: np.ndarray) -> np.ndarray:
+    """
+    Vectorized base10_to_01_flipped: round, then the integer digit
+    reversal from numpy_coord_mapper (bit-exact for |n| < 10**15).
+    """
+    m = np.rint(np.asarray(n, dtype=np.float64)).astype(np.int64)
+    return int_to_reversed_unit_array(m)
+
+
+class PlayerTable:
+    """
+    Struct-of-arrays player states: one float64 column per field.
+    """
+
+    __slots__ = ("x", "y", "z", "yaw", "pitch", "vx", "vy", "vz")
+
+    def __init__(self, x, y, z, yaw, pitch, vx, vy, vz):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.z = np.asarray(z, dtype=np.float64)
+        self.yaw = np.asarray(yaw, dtype=np.float64)
+        self.pitch = np.asarray(pitch, dtype=np.float64)
+        self.vx = np.asarray(vx, dtype=np.float64)
+        self.vy = np.asarray(vy, dtype=np.float64)
+        self.vz = np.asarray(vz, dtype=np.float64)
+
+    @classmethod
+    def from_states(cls, states: Sequence[PlayerState]) -> "PlayerTable":
+        cols = np.array(
+            [[p.x, p.y, p.z, p.yaw, p.pitch, p.vx, p.vy, p.vz] for p in states],
+            dtype=np.float64,
+        ).reshape(-1, 8)
+        return cls(*cols.T)
+
+    def __len__(self) -> int:
+        return int(self.x.shape[0])
+
+    def axes14(self) -> np.ndarray:
+        return xyz_yaw_pitch_vel_to_axes14_batch(
+            self.x, self.y, self.z, self.yaw, self.pitch, self.vx, self.vy, self.vz
+        )
+
+
+def xyz_yaw_pitch_vel_to_axes14_batch(x, y, z, yaw, pitch, vx, vy, vz) -> np.ndarray:
+    """
+    Batched xyz_yaw_pitch_vel_to_axes14: (N,) inputs → (N, 14) in
+    AXES14_KEYS order, bit-for-bit equal to the scalar version.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    vx = np.asarray(vx, dtype=np.float64)
+    vy = np.asarray(vy, dtype=np.float64)
+    vz = np.asarray(vz, dtype=np.float64)
+
+    fx = base10_to_01_flipped_array(x)
+    fy = base10_to_01_flipped_array(y)
+    fz = base10_to_01_flipped_array(z)
+
+    yaw01 = norm01_array(np.asarray(yaw, dtype=np.float64) + 180.0, 0.0, 360.0)
+    pitch01 = norm01_array(np.asarray(pitch, dtype=np.float64) + 90.0, 0.0, 180.0)
+
+    speed = np.sqrt(_py_square(vx) + _py_square(vy) + _py_square(vz))
+    vx01 = norm01_array(np.abs(vx), 0.0, 1.0)
+    vy01 = norm01_array(np.abs(vy), 0.0, 1.0)
+    vz01 = norm01_array(np.abs(vz), 0.0, 1.0)
+    speed01 = norm01_array(speed, 0.0, 1.0)
+
+    r = np.sqrt(_py_square(x) + _py_square(y) + _py_square(z))
+    r01 = norm01_array(r, 0.0, 1024.0)
+
+    out = np.stack([
+        fx,
+        fy,
+        fz,
+        yaw01,
+        pitch01,
+        speed01,
+        r01,
+        norm01_array(fx + fy, 0.0, 2.0),
+        norm01_array(fy + fz, 0.0, 2.0),
+        norm01_array(fz + fx, 0.0, 2.0),
+        norm01_array(vx01 + vy01, 0.0, 2.0),
+        norm01_array(vy01 + vz01, 0.0, 2.0),
+        norm01_array(vz01 + vx01, 0.0, 2.0),
+        norm01_array(r01 + yaw01 + pitch01, 0.0, 3.0),
+    ], axis=-1)
+    return np.minimum(out, 0.999999999999)
+
+
+def build_color_pairs_batch(axes: np.ndarray) -> np.ndarray:
+    """
+    Batched build_color_pairs_from_axes: (N, 14) → (N, 2, 3)
+    with [:, 0] = base_shadow and [:, 1] = base_light.
+    """
+    axes = np.asarray(axes, dtype=np.float64)
+    x, y, z, w, v, u, t, a, b, c, d, e, f, g = np.moveaxis(axes, -1, 0)
+
+    shadow = np.stack([
+        norm01_array(x + w + a, 0.0, 3.0),
+        norm01_array(y + v + b, 0.0, 3.0),
+        norm01_array(z + u + c, 0.0, 3.0),
+    ], axis=-1)
+    light = np.stack([
+        norm01_array(t + d + e, 0.0, 3.0),
+        norm01_array(f + g + x, 0.0, 3.0),
+        norm01_array(y + z + w, 0.0, 3.0),
+    ], axis=-1)
+    return np.minimum(np.stack([shadow, light], axis=-2), 0.999999999999)
+
+
+def build_pixel_grid(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (px, py) as broadcasting (1, W) / (H, 1) views of the shared pixel grid.
+    """
+    grid = pixel_grid(width, height)
+    return grid.uu, grid.vv
+
+
+def compute_neighbor_angles(px: np.ndarray, py: np.ndarray) -> Dict[str, np.ndarray]:
+    grad_x = np.zeros(px.shape, dtype=np.float64)
+    grad_y = np.zeros(py.shape, dtype=np.float64)
+
+    if px.shape[1] > 2:
+        grad_x[:, 1:-1] = (px[:, 2:] - px[:, :-2]) * 0.5
+    if py.shape[0] > 2:
+        grad_y[1:-1, :] = (py[2:, :] - py[:-2, :]) * 0.5
+
+    mag = np.sqrt(grad_x ** 2 + grad_y ** 2)
+    mmax = float(np.max(mag)) if mag.size > 0 else 1.0
+    if mmax <= 0.0:
+        mmax = 1.0
+    norm_mag = np.clip(mag / (mmax * 1.000000000001), 0.0, 0.999999999999)
+
+    return {
+        "grad_x": grad_x,
+        "grad_y": grad_y,
+        "angle": norm_mag,
+    }
+
+
+def build_checker_shading(px: np.ndarray,
+                          py: np.ndarray,
+                          base_color: Tuple[float, float, float]) -> Dict[str, np.ndarray]:
+    h, w = np.broadcast_shapes(np.shape(px), np.shape(py))
+    ix = np.arange(w, dtype=np.int32)[np.newaxis, :]
+    iy = np.arange(h, dtype=np.int32)[:, np.newaxis]
+
+    tile = (ix % 2) ^ (iy % 2)
+
+    base = np.array(base_color, dtype=np.float64).reshape(1, 1, 3)
+    base = np.clip(base, 0.0, 0.999999999999)
+
+    shadow = np.zeros((h, w, 3), dtype=np.float64)
+    shadow[tile == 0] = base
+    shadow[tile == 1] = 0.0
+
+    light = np.zeros((h, w, 3), dtype=np.float64)
+    light[tile == 0] = 1.0 - 1e-12
+    light[tile == 1] = base
+
+    return {
+        "shadow": shadow,
+        "light": light,
+    }
+
+
+def build_color_pairs_from_axes(axes14: Dict[str, float]) -> Tuple[Tuple[float, float, float],
+                                                                   Tuple[float, float, float]]:
+    x = axes14["x"]
+    y = axes14["y"]
+    z = axes14["z"]
+    w = axes14["w"]
+    v = axes14["v"]
+    u = axes14["u"]
+    t = axes14["t"]
+    a = axes14["a"]
+    b = axes14["b"]
+    c = axes14["c"]
+    d = axes14["d"]
+    e = axes14["e"]
+    f = axes14["f"]
+    g = axes14["g"]
+
+    r1 = norm01(x + w + a, 0.0, 3.0)
+    g1 = norm01(y + v + b, 0.0, 3.0)
+    b1 = norm01(z + u + c, 0.0, 3.0)
+
+    r2 = norm01(t + d + e, 0.0, 3.0)
+    g2 = norm01(f + g + x, 0.0, 3.0)
+    b2 = norm01(y + z + w, 0.0, 3.0)
+
+    def clamp(v: float) -> float:
+        return min(v, 0.999999999999)
+
+    base_shadow = (clamp(r1), clamp(g1), clamp(b1))
+    base_light = (clamp(r2), clamp(g2), clamp(b2))
+    return base_shadow, base_light
+
+
+def preview(field: np.ndarray, max_size: int = 8):
+    h, w = field.shape[:2]
+    step_y = max(1, h // max_size)
+    step_x = max(1, w // max_size)
+    sub = field[::step_y, ::step_x]
+    return sub.tolist()
+
+
+def preview_indices(height: int, width: int, max_size: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row / column indices that preview() would keep for an (h, w) field.
+    """
+    step_y = max(1, height // max_size)
+    step_x = max(1, width // max_size)
+    return np.arange(0, height, step_y), np.arange(0, width, step_x)
+
+
+class LazyGeomFields:
+    """
+    Pixel-grid derived fields, evaluated only where they are sampled.
+
+    The pixel grid is separable (px depends on the column, py on the row),
+    so it is held as an implicit_grid.ImplicitGrid: neighbour gradients are
+    1-D (cached on the shared grid) and the angle normalisation max is
+    analytic. Checker shading depends only on pixel parity. Nothing of
+    size W×H exists unless materialize_*() is called, and then it goes
+    into float32 buffers that are reused for the next frame.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+
+        self.grid = pixel_grid(self.width, self.height)
+        self.grad_x, self.grad_y = self.grid.gradient()
+
+        # max over the grid of sqrt(gx^2 + gy^2) == sqrt(max gx^2 + max gy^2)
+        self._gx2, self._gy2 = self.grid.derived(
+            "gradient_sq", lambda g: tuple(a ** 2 for a in g.gradient()))
+        mmax = float(np.sqrt(np.max(self._gx2) + np.max(self._gy2)))
+        if mmax <= 0.0:
+            mmax = 1.0
+        self._angle_scale = mmax * 1.000000000001
+
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def angle_at(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        mag = np.sqrt(self._gx2[np.asarray(cols)][np.newaxis, :] +
+                      self._gy2[np.asarray(rows)][:, np.newaxis])
+        return np.clip(mag / self._angle_scale, 0.0, 0.999999999999)
+
+    @staticmethod
+    def _tile(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        return (np.asarray(cols)[np.newaxis, :] % 2) ^ (np.asarray(rows)[:, np.newaxis] % 2)
+
+    def checker_at(self,
+                   rows: np.ndarray,
+                   cols: np.ndarray,
+                   base_color: Tuple[float, float, float]) -> Dict[str, np.ndarray]:
+        tile = self._tile(rows, cols)[:, :, np.newaxis]
+        base = np.clip(np.array(base_color, dtype=np.float64), 0.0, 0.999999999999)
+        return {
+            "shadow": np.where(tile == 0, base, 0.0),
+            "light": np.where(tile == 0, 1.0 - 1e-12, base),
+        }
+
+    def preview_angle(self, max_size: int = 8):
+        rows, cols = preview_indices(self.height, self.width, max_size)
+        return self.angle_at(rows, cols).tolist()
+
+    def preview_checker(self, base_color: Tuple[float, float, float], max_size: int = 8):
+        rows, cols = preview_indices(self.height, self.width, max_size)
+        shading = self.checker_at(rows, cols, base_color)
+        return {
+            "shadow_preview": shading["shadow"].tolist(),
+            "light_preview": shading["light"].tolist(),
+        }
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.float32)
+            self._buffers[name] = buf
+        return buf
+
+    def materialize_angle(self) -> np.ndarray:
+        out = self._buffer("angle", (self.height, self.width))
+        np.add(self._gx2[np.newaxis, :], self._gy2[:, np.newaxis], out=out)
+        np.sqrt(out, out=out)
+        out /= np.float32(self._angle_scale)
+        np.clip(out, 0.0, 0.999999999999, out=out)
+        return out
+
+    def materialize_checker(self,
+                            base_color: Tuple[float, float, float],
+                            which: str = "shadow") -> np.ndarray:
+        out = self._buffer(which, (self.height, self.width, 3))
+        rows = np.arange(self.height)
+        cols = np.arange(self.width)
+        tile = self._tile(rows, cols)[:, :, np.newaxis]
+        base = np.clip(np.array(base_color, dtype=np.float32), 0.0, 0.999999999999)
+        if which == "shadow":
+            np.copyto(out, np.where(tile == 0, base, np.float32(0.0)))
+        else:
+            np.copyto(out, np.where(tile == 0, np.float32(1.0 - 1e-12), base))
+        return out
+
+
+_LAZY_FIELDS: Dict[Tuple[int, int], LazyGeomFields] = {}
+
+
+def lazy_fields(width: int, height: int) -> LazyGeomFields:
+    key = (int(width), int(height))
+    fields = _LAZY_FIELDS.get(key)
+    if fields is None:
+        if len(_LAZY_FIELDS) >= 8:
+            _LAZY_FIELDS.clear()
+        fields = LazyGeomFields(width, height)
+        _LAZY_FIELDS[key] = fields
+    return fields
+
+
+def build_geom_frame(player_state: PlayerState,
+                     screen_width: int,
+                     screen_height: int) -> Dict[str, Any]:
+    axes14 = xyz_yaw_pitch_vel_to_axes14(player_state)
+
+    fields = lazy_fields(screen_width, screen_height)
+
+    base_shadow, base_light = build_color_pairs_from_axes(axes14)
+
+    shadow_field = fields.preview_checker(base_shadow)
+    light_field = fields.preview_checker(base_light)
+
+    frame = {
+        "timestamp": time.time(),
+        "player_axes14": axes14,
+        "player_raw": asdict(player_state),
+        "screen": {
+            "width": screen_width,
+            "height": screen_height,
+        },
+        "neighbors": {
+            "angle_preview": fields.preview_angle(),
+        },
+        "shadow_checker": {
+            "base_color": base_shadow,
+            "shadow_preview": shadow_field["shadow_preview"],
+            "light_preview": shadow_field["light_preview"],
+        },
+        "light_checker": {
+            "base_color": base_light,
+            "shadow_preview": light_field["shadow_preview"],
+            "light_preview": light_field["light_preview"],
+        },
+    }
+    return frame
+
+
+def _freeze(obj: Any) -> Any:
+    """
+    Lists → tuples, all the way down (dicts stay dicts). Cached frames are
+    frozen once on insert so only their dict levels need copying per get().
+    """
+    if isinstance(obj, dict):
+        return {k: _freeze(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _copy_dicts(frame: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a frozen frame: its dicts (two levels deep in build_geom_frame's
+    layout) are new, the tuples and scalars under them are shared.
+    """
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in frame.items()}
+
+
+class GeomFrameCache:
+    """
+    LRU memo of build_geom_frame keyed by a quantized PlayerState.
+
+    Position snaps to pos_res blocks, yaw/pitch to angle_res degrees and
+    velocity to vel_res blocks/tick. The frame is computed from the
+    snapped state, so every player inside one cell shares it; the returned
+    copy carries the caller's real player_raw and a fresh timestamp.
+    Every dict in it is the caller's own; the preview rows come back as
+    tuples (shared, immutable, same JSON), so nothing a caller does to the
+    frame reaches the cache or other callers.
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 pos_res: float = 1.0,
+                 angle_res: float = 1.0,
+                 vel_res: float = 0.05):
+        if min(pos_res, angle_res, vel_res) <= 0:
+            raise ValueError("cache resolutions must be > 0")
+        self.max_entries = max(1, int(max_entries))
+        self.pos_res = float(pos_res)
+        self.angle_res = float(angle_res)
+        self.vel_res = float(vel_res)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._frames: "OrderedDict[Tuple[int, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _q(v: float, res: float) -> int:
+        return int(round(v / res))
+
+    def key(self, p: PlayerState, screen_width: int, screen_height: int) -> Tuple[int, ...]:
+        return (
+            self._q(p.x, self.pos_res),
+            self._q(p.y, self.pos_res),
+            self._q(p.z, self.pos_res),
+            self._q(p.yaw, self.angle_res),
+            self._q(p.pitch, self.angle_res),
+            self._q(p.vx, self.vel_res),
+            self._q(p.vy, self.vel_res),
+            self._q(p.vz, self.vel_res),
+            int(screen_width),
+            int(screen_height),
+        )
+
+    def snap(self, key: Tuple[int, ...]) -> PlayerState:
+        pr, ar, vr = self.pos_res, self.angle_res, self.vel_res
+        return PlayerState(
+            x=key[0] * pr, y=key[1] * pr, z=key[2] * pr,
+            yaw=key[3] * ar, pitch=key[4] * ar,
+            vx=key[5] * vr, vy=key[6] * vr, vz=key[7] * vr,
+        )
+
+    def get(self,
+            player_state: PlayerState,
+            screen_width: int,
+            screen_height: int) -> Dict[str, Any]:
+        k = self.key(player_state, screen_width, screen_height)
+        with self._lock:
+            frame = self._frames.get(k)
+            if frame is not None:
+                self._frames.move_to_end(k)
+                self.hits += 1
+        if frame is None:
+            frame = _freeze(build_geom_frame(self.snap(k), screen_width, screen_height))
+            with self._lock:
+                self.misses += 1
+                self._frames[k] = frame
+                self._frames.move_to_end(k)
+                while len(self._frames) > self.max_entries:
+                    self._frames.popitem(last=False)
+                    self.evictions += 1
+
+        out = _copy_dicts(frame)
+        out["timestamp"] = time.time()
+        out["player_raw"] = asdict(player_state)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._frames),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / float(total) if total else 0.0,
+            }
+
+
+_GEOM_CACHE = GeomFrameCache()
+
+
+def _geom_cache_metrics() -> Dict[str, float]:
+    s = _GEOM_CACHE.stats()
+    return {
+        "sky_geom_cache_hits_total": s["hits"],
+        "sky_geom_cache_misses_total": s["misses"],
+        "sky_geom_cache_evictions_total": s["evictions"],
+        "sky_geom_cache_entries": s["entries"],
+        "sky_geom_cache_hit_ratio": s["hit_rate"],
+    }
+
+
+sky_metrics.REGISTRY.add_collector(_geom_cache_metrics)
+
+
+def build_geom_frame_cached(player_state: PlayerState,
+                            screen_width: int,
+                            screen_height: int) -> Dict[str, Any]:
+    """
+    build_geom_frame through the shared GeomFrameCache.
+    """
+    return _GEOM_CACHE.get(player_state, screen_width, screen_height)
+
+
+def write_geom_frame(frame: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(GEOM_JSON), exist_ok=True)
+    tmp_path = GEOM_JSON + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(frame, f)
+    os.replace(tmp_path, GEOM_JSON)
+
+
+def demo_once() -> None:
+    sky_profiler.install("geom_backend")
+    p = PlayerState(
+        x=0.0,
+        y=64.0,
+        z=369.0,
+        yaw=45.0,
+        pitch=-20.0,
+        vx=0.1,
+        vy=0.05,
+        vz=0.2,
+    )
+    screen_w = 1920
+    screen_h = 1080
+
+    frame = build_geom_frame(p, screen_w, screen_h)
+    write_geom_frame(frame)
+    print("Geom frame written safely to:", GEOM_JSON)
+
+
+if __name__ == "__main__":
+    demo_once()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+implicit_grid.py — separable screen grids held as two 1-D axes.
+
+Focus:
+
+  • Every grid in the screen / geom code is separable: u depends only on
+    the column, v only on the row. ImplicitGrid keeps just the two axes
+    (O(W + H) floats) instead of a W×H meshgrid pair.
+  • grid.uu / grid.vv are u[None, :] / v[:, None] views: any expression
+    that used meshgrid output broadcasts to the same (H, W) result.
+  • Bounds and sample counts are analytic (no reduction over the grid).
+  • Derived 1-D fields (squared centre offsets, checker parities, central
+    differences) are computed once per grid and cached on it.
+  • quarter_grid() / pixel_grid() return shared, read-only grids from an
+    LRU cache, so a resolution that repeats costs nothing to rebuild.
+
+Usage:
+
+  from .implicit_grid import quarter_grid
+  g = quarter_grid(960, 540)
+  dist = np.sqrt((g.uu - 0.25) ** 2 + (g.vv - 0.25) ** 2)   # (540, 960)
+"""
+
+import functools
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+# Quarter tile: [0, 0.5) on both axes, half-open like np.linspace(endpoint=False).
+QUARTER_SPAN = (0.0, 0.5)
+# Geom pixel grid: [0, 1) closed at the clamp value.
+PIXEL_SPAN = (0.0, 0.999999999999)
+
+GRID_CACHE_SIZE = 32
+
+
+def _axis(n: int, lo: float, hi: float, endpoint: bool) -> np.ndarray:
+    a = np.linspace(lo, hi, num=n, endpoint=endpoint, dtype=np.float64)
+    a.setflags(write=False)
+    return a
+
+
+def _axis_max(n: int, lo: float, hi: float, endpoint: bool) -> float:
+    # Same expression np.linspace uses for its last sample.
+    if n <= 1:
+        return float(lo)
+    if endpoint:
+        return float(hi)
+    return float(lo + (n - 1) * ((hi - lo) / n))
+
+
+class ImplicitGrid:
+    """
+    A width × height sample grid over u_span × v_span, stored as 1-D axes.
+
+    Arrays handed out are shared between callers and marked read-only.
+    """
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 u_span: Tuple[float, float] = QUARTER_SPAN,
+                 v_span: Tuple[float, float] = QUARTER_SPAN,
+                 endpoint: bool = False):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.u_span = (float(u_span[0]), float(u_span[1]))
+        self.v_span = (float(v_span[0]), float(v_span[1]))
+        self.endpoint = bool(endpoint)
+
+        self.u = _axis(self.width, self.u_span[0], self.u_span[1], self.endpoint)
+        self.v = _axis(self.height, self.v_span[0], self.v_span[1], self.endpoint)
+        self._derived: Dict[Any, Any] = {}
+
+    # -- shape / bounds -----------------------------------------------------
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    @property
+    def uu(self) -> np.ndarray:
+        """u as a (1, W) row: broadcasts like meshgrid's first output."""
+        return self.u[np.newaxis, :]
+
+    @property
+    def vv(self) -> np.ndarray:
+        """v as an (H, 1) column: broadcasts like meshgrid's second output."""
+        return self.v[:, np.newaxis]
+
+    @property
+    def u_min(self) -> float:
+        return self.u_span[0]
+
+    @property
+    def u_max(self) -> float:
+        return _axis_max(self.width, self.u_span[0], self.u_span[1], self.endpoint)
+
+    @property
+    def v_min(self) -> float:
+        return self.v_span[0]
+
+    @property
+    def v_max(self) -> float:
+        return _axis_max(self.height, self.v_span[0], self.v_span[1], self.endpoint)
+
+    def bounds(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "u_min": self.u_min,
+            "u_max": self.u_max,
+            "v_min": self.v_min,
+            "v_max": self.v_max,
+            "sample_count": self.size,
+        }
+
+    # -- cached derived fields ----------------------------------------------
+
+    def derived(self, key: Any, build: Callable[["ImplicitGrid"], Any]) -> Any:
+        """
+        build(self) once per key; later calls return the cached result.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = build(self)
+            for arr in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(arr, np.ndarray):
+                    arr.setflags(write=False)
+            self._derived[key] = value
+        return value
+
+    def centre_sq(self, cu: float, cv: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ((u - cu)², (v - cv)²) as 1-D axes; dist² = du2[None, :] + dv2[:, None].
+        """
+        return self.derived(("centre_sq", float(cu), float(cv)),
+                            lambda g: ((g.u - cu) ** 2, (g.v - cv) ** 2))
+
+    def centre_dist_max(self, cu: float, cv: float) -> float:
+        """
+        Max over the grid of sqrt(du² + dv²): sqrt(max du² + max dv²).
+        """
+        du2, dv2 = self.centre_sq(cu, cv)
+        return float(np.sqrt(du2.max() + dv2.max()))
+
+    def parity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (column parity, row parity) as uint8; checker = row[:, None] ^ col[None, :].
+        """
+        return self.derived("parity", lambda g: (
+            (np.arange(g.width) % 2).astype(np.uint8),
+            (np.arange(g.height) % 2).astype(np.uint8),
+        ))
+
+    def checker(self) -> np.ndarray:
+        """
+        (H, W) 0/1 checker as a broadcast of the two parities (int64, like
+        `(rows % 2) ^ (cols % 2)` on arange columns).
+        """
+        col, row = self.parity()
+        return row.astype(np.int64)[:, np.newaxis] ^ col.astype(np.int64)[np.newaxis, :]
+
+    def gradient(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Central differences of u along columns and v along rows (edges 0).
+        """
+        def build(g):
+            gx = np.zeros_like(g.u)
+            gy = np.zeros_like(g.v)
+            if g.width > 2:
+                gx[1:-1] = (g.u[2:] - g.u[:-2]) * 0.5
+            if g.height > 2:
+                gy[1:-1] = (g.v[2:] - g.v[:-2]) * 0.5
+            return gx, gy
+        return self.derived("gradient", build)
+
+    def materialize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Full (H, W) meshgrid copies — only for callers that must write.
+        """
+        return np.meshgrid(self.u, self.v)
+
+    def nbytes(self) -> int:
+        total = self.u.nbytes + self.v.nbytes
+        for value in self._derived.values():
+            for arr in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(arr, np.ndarray):
+                    total += arr.nbytes
+        return total
+
+    def __repr__(self) -> str:
+        return "ImplicitGrid({}x{}, u={}, v={}, endpoint={})".format(
+            self.width, self.height, self.u_span, self.v_span, self.endpoint)
+
+
+@functools.lru_cache(maxsize=GRID_CACHE_SIZE)
+def get_grid(width: int,
+             height: int,
+             u_span: Tuple[float, float] = QUARTER_SPAN,
+             v_span: Tuple[float, float] = QUARTER_SPAN,
+             endpoint: bool = False) -> ImplicitGrid:
+    """
+    Shared grid for these parameters (LRU cached, do not mutate).
+    """
+    return ImplicitGrid(width, height, u_span, v_span, endpoint)
+
+
+def quarter_grid(wq: int, hq: int) -> ImplicitGrid:
+    """
+    The Wq × Hq quarter tile over [0, 0.5) × [0, 0.5).
+    """
+    return get_grid(max(1, int(wq)), max(1, int(hq)), QUARTER_SPAN, QUARTER_SPAN, False)
+
+
+def pixel_grid(width: int, height: int) -> ImplicitGrid:
+    """
+    The geom W × H pixel grid over [0, 0.999999999999]², endpoints included.
+    """
+    return get_grid(max(1, int(width)), max(1, int(height)), PIXEL_SPAN, PIXEL_SPAN, True)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+map_tile_baker.py — offline sky-map asset baker (128x128 map tiles).
+
+Focus:
+
+  • Scan every copy of the sky images (1.jpg … 8.jpg) that lives in
+    sky/, sky/sky_maps/, src/main/resources/... and target/...
+  • Hash each source (sha256) and deduplicate: identical bytes are
+    decoded, scaled and quantized exactly once.
+  • Build mip levels 128 → 64 → 32 → 16 (area-averaged, like Java's
+    Image.SCALE_SMOOTH used by ImageMapRenderer).
+  • Quantize each level to Minecraft map-palette bytes with the same
+    buckets as MapColorUtil.rgbToMapColor, optionally with 4x4 ordered
+    (Bayer) dithering.
+  • Write one content-addressed .bin per unique image plus index.json:
+
+       src/main/resources/map_tiles/<sha16>.bin
+       src/main/resources/map_tiles/index.json
+
+A tile is only rebuilt when its source hash or bake settings change, so
+re-running the baker is close to free. The plugin then loads raw palette
+bytes (BakedMapTiles.java) instead of decoding/scaling JPEGs at startup.
+
+.bin layout (big-endian, readable with java.io.DataInputStream):
+
+   magic      4 bytes   b"8XDM"
+   version    u8        1
+   dither     u8        0 = off, 1 = ordered 4x4
+   levels     u8        number of mip levels
+   reserved   u8        0
+   sha256     32 bytes  digest of the source image bytes
+   per level: u16 size, then size*size palette bytes (row-major, y then x)
+
+Usage:
+
+  sky-map-tiles                # bake (incremental)
+  sky-map-tiles --dither       # ordered dithering
+  sky-map-tiles --force        # rebuild everything
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(ROOT, "src", "main", "resources", "map_tiles")
+INDEX_JSON = os.path.join(OUT_DIR, "index.json")
+
+SOURCE_DIRS = [
+    ROOT,
+    os.path.join(ROOT, "sky_maps"),
+    os.path.join(ROOT, "src"),
+    os.path.join(ROOT, "src", "main"),
+    os.path.join(ROOT, "src", "main", "resources"),
+    os.path.join(ROOT, "src", "main", "resources", "sky"),
+    os.path.join(ROOT, "src", "main", "resources", "sky", "sky_maps"),
+    os.path.join(ROOT, "src", "main", "resources", "sky_maps"),
+    os.path.join(ROOT, "target"),
+    os.path.join(ROOT, "target", "classes", "sky"),
+    os.path.join(ROOT, "target", "classes", "sky", "sky_maps"),
+    os.path.join(ROOT, "target", "classes", "sky_maps"),
+]
+SOURCE_EXTS = (".jpg", ".jpeg", ".png")
+
+MAGIC = b"8XDM"
+VERSION = 1
+MAP_SIZE = 128
+MIP_SIZES = (128, 64, 32, 16)
+
+# Classic 4x4 Bayer matrix, thresholds in [0, 16).
+BAYER4 = np.array(
+    [
+        [0, 8, 2, 10],
+        [12, 4, 14, 6],
+        [3, 11, 1, 9],
+        [15, 7, 13, 5],
+    ],
+    dtype=np.float64,
+)
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_sources() -> Dict[str, Dict[str, Any]]:
+    """
+    Return {sha256: {"names": [...], "paths": [...]}} for every source
+    image. Names are file stems ("1" … "8"); duplicates collapse.
+    """
+    unique: Dict[str, Dict[str, Any]] = {}
+    for d in SOURCE_DIRS:
+        if not os.path.isdir(d):
+            continue
+        for fname in sorted(os.listdir(d)):
+            if not fname.lower().endswith(SOURCE_EXTS):
+                continue
+            path = os.path.join(d, fname)
+            if not os.path.isfile(path):
+                continue
+            digest = sha256_file(path)
+            entry = unique.setdefault(digest, {"names": [], "paths": []})
+            stem = os.path.splitext(fname)[0]
+            if stem not in entry["names"]:
+                entry["names"].append(stem)
+            entry["paths"].append(os.path.relpath(path, ROOT))
+    return unique
+
+
+def decode_scaled_rgb(path: str, size: int = MAP_SIZE) -> np.ndarray:
+    """
+    Decode an image and area-average it down to size x size RGB floats.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        print("Pillow is required to decode sky images.")
+        print("Activate the venv and run: pip install pillow numpy")
+        sys.exit(1)
+
+    with Image.open(path) as im:
+        im = im.convert("RGB")
+        im = im.resize((size, size), resample=Image.BOX)
+        return np.asarray(im, dtype=np.float64)
+
+
+def build_mips(rgb: np.ndarray, sizes=MIP_SIZES) -> List[np.ndarray]:
+    """
+    2x2 box-filter chain: 128 → 64 → 32 → 16.
+    """
+    levels = [rgb]
+    cur = rgb
+    for size in sizes[1:]:
+        h, w = cur.shape[:2]
+        if h // 2 != size or w // 2 != size:
+            break
+        cur = cur.reshape(size, 2, size, 2, 3).mean(axis=(1, 3))
+        levels.append(cur)
+    return levels
+
+
+def rgb_to_map_colors(rgb: np.ndarray, dither: bool = False) -> np.ndarray:
+    """
+    Vectorized mirror of MapColorUtil.rgbToMapColor.
+
+    Ordered dithering adds the same Bayer offset to R, G and B so the
+    warm/cool/green/neutral decision is untouched and only the luminance
+    bucket (64 levels wide) is dithered.
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    if dither:
+        h, w = rgb.shape[:2]
+        reps = ((h + 3) // 4, (w + 3) // 4)
+        thresh = np.tile(BAYER4, reps)[:h, :w]
+        offset = ((thresh + 0.5) / 16.0 - 0.5) * 64.0
+        rgb = rgb + offset[:, :, None]
+
+    c = np.clip(np.rint(rgb), 0, 255).astype(np.int32)
+    r = c[..., 0]
+    g = c[..., 1]
+    b = c[..., 2]
+    lum = (r + g + b) // 3
+
+    # Bucket 0..3 for lum <64, <128, <192, else.
+    bucket = np.minimum(lum // 64, 3)
+
+    out = np.empty(lum.shape, dtype=np.int32)
+    red = (r > g) & (r > b)
+    blue = ~red & (b > r) & (b > g)
+    green = ~red & ~blue & (g > r) & (g > b)
+    neutral = ~(red | blue | green)
+
+    out[red] = 28 + bucket[red]
+    out[blue] = 40 + bucket[blue]
+    out[green] = 20 + bucket[green]
+    out[neutral] = 44 + bucket[neutral]
+
+    out[lum > 240] = 34
+    out[lum < 16] = 0
+    return out.astype(np.uint8)
+
+
+def tile_path(digest: str) -> str:
+    return os.path.join(OUT_DIR, digest[:16] + ".bin")
+
+
+def read_tile_header(path: str) -> Tuple[int, int, str]:
+    """
+    Return (version, dither, sha256 hex) or (-1, -1, "") if unreadable.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8 + 32)
+    except OSError:
+        return -1, -1, ""
+    if len(head) < 40 or head[:4] != MAGIC:
+        return -1, -1, ""
+    return head[4], head[5], head[8:40].hex()
+
+
+def write_tile(path: str, digest: str, levels: List[np.ndarray], dither: bool) -> int:
+    parts = [
+        MAGIC,
+        struct.pack(">BBBB", VERSION, 1 if dither else 0, len(levels), 0),
+        bytes.fromhex(digest),
+    ]
+    for lv in levels:
+        parts.append(struct.pack(">H", lv.shape[0]))
+        parts.append(np.ascontiguousarray(lv, dtype=np.uint8).tobytes())
+    blob = b"".join(parts)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def bake(dither: bool = False, force: bool = False) -> Dict[str, Any]:
+    os.makedirs(OUT_DIR, exist_ok=True)
+    sources = find_sources()
+
+    index: Dict[str, Any] = {
+        "version": VERSION,
+        "dither": bool(dither),
+        "mip_sizes": list(MIP_SIZES),
+        "tiles": {},
+        "names": {},
+    }
+    built = 0
+    skipped = 0
+
+    for digest in sorted(sources):
+        entry = sources[digest]
+        path = tile_path(digest)
+        version, dith, stored = read_tile_header(path)
+
+        if (not force and version == VERSION and stored == digest
+                and dith == (1 if dither else 0)):
+            skipped += 1
+        else:
+            rgb = decode_scaled_rgb(os.path.join(ROOT, entry["paths"][0]))
+            levels = [rgb_to_map_colors(lv, dither=dither) for lv in build_mips(rgb)]
+            write_tile(path, digest, levels, dither)
+            built += 1
+
+        index["tiles"][digest[:16]] = {
+            "sha256": digest,
+            "file": os.path.basename(path),
+            "sources": entry["paths"],
+        }
+        for name in entry["names"]:
+            index["names"][name] = digest[:16]
+
+    tmp = INDEX_JSON + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp, INDEX_JSON)
+
+    index["built"] = built
+    index["skipped"] = skipped
+    return index
+
+
+def main() -> None:
+    sky_profiler.install("map_tile_baker")
+    parser = argparse.ArgumentParser(description="Bake sky images into map-palette tiles.")
+    parser.add_argument("--dither", action="store_true", help="ordered 4x4 dithering")
+    parser.add_argument("--force", action="store_true", help="rebuild every tile")
+    args = parser.parse_args()
+
+    index = bake(dither=args.dither, force=args.force)
+
+    print("8XD map tiles baked:")
+    print("  Out dir : {}".format(OUT_DIR))
+    print("  Unique  : {}".format(len(index["tiles"])))
+    print("  Built   : {}  (up to date: {})".format(index["built"], index["skipped"]))
+    print("  Dither  : {}".format("ordered 4x4" if index["dither"] else "off"))
+    for name in sorted(index["names"]):
+        print("  {:>4} → {}.bin".format(name, index["names"][name]))
+
+
+if __name__ == "__main__":
+    main()
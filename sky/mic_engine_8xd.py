@@ -1,19 +1,37 @@
 #!/usr/bin/env python3
 # mic_engine_8xd.py
+import functools
 import json
 import os
 import time
 import math
 from threading import Lock
+from typing import Dict, Optional, Tuple
 
 import numpy as np
-import sounddevice as sd
+from . import sky_profiler, sky_metrics, adaptive_blocks, decimator, filterbank
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 JSON_PATH = os.path.join(ROOT, "bpm_sync.json")
+# SKY_MIC_JSON moves the output (e.g. next to sky-fusion, which owns
+# bpm_sync.json: SKY_MIC_JSON=sky/mic.json, then sky-fusion --mic-json).
+ENV_JSON = "SKY_MIC_JSON"
 
 SAMPLE_RATE = 44100
+# Starting block size and fixed analysis window; the stream block size
+# itself follows callback load (adaptive_blocks.py). With SKY_DECIMATE > 1
+# the low bands come from a decimated stream, the rest from a
+# BLOCK_SIZE / factor full-rate window (decimator.py).
 BLOCK_SIZE = 1024
+# bpm_sync.json is written from main() at this rate (the old one write per
+# 1024-frame block), not from the callback: smaller adaptive blocks do not
+# mean more file writes.
+PUBLISH_HZ = SAMPLE_RATE / BLOCK_SIZE
+
+# Spectral descriptors behind z, y, x, w, v, u (see spectral_descriptors).
+ROLLOFF_FRACTION = 0.85
+BAND_MIN_F = 20.0
+BAND_MAX_F = 20000.0
 
 _state_lock = Lock()
 _state = {
@@ -52,52 +70,187 @@ def safe_norm(v: np.ndarray) -> float:
         return 0.0
     return float(math.sqrt(s))
 
+@functools.lru_cache(maxsize=16)
+def _spectrum_plan(n: int, sr: float, n_bands: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-(block length, rate, bands) constants: Hann window, bin
+    frequencies, the log band of each bin (n_bands = outside 20 Hz–20 kHz)
+    and the bin count per band.
+    """
+    window = np.hanning(n)
+    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
+    edges = np.logspace(math.log10(BAND_MIN_F), math.log10(BAND_MAX_F), num=n_bands + 1)
+    band_of_bin = np.searchsorted(edges, freqs, side="right") - 1
+    band_of_bin[(band_of_bin < 0) | (band_of_bin >= n_bands)] = n_bands
+    counts = np.bincount(band_of_bin, minlength=n_bands + 1)[:n_bands]
+    for arr in (window, freqs, band_of_bin, counts):
+        arr.setflags(write=False)
+    return window, freqs, band_of_bin, counts
+
+def spectrum(mono: np.ndarray, sr: int, n_bands: int = 7) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The one FFT per block: (|rfft(mono · hann)|, bin frequencies).
+    """
+    window, freqs, _, _ = _spectrum_plan(len(mono), float(sr), n_bands)
+    return np.abs(np.fft.rfft(mono * window)), freqs
+
+def _band_means(mag: np.ndarray, n: int, sr: float, n_bands: int) -> np.ndarray:
+    _, _, band_of_bin, counts = _spectrum_plan(int(n), float(sr), n_bands)
+    sums = np.bincount(band_of_bin, weights=mag, minlength=n_bands + 1)[:n_bands]
+    return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+
+def _normalized_bands(bands: np.ndarray):
+    total = float(np.sum(bands))
+    if total > 0.0:
+        bands = bands / total
+    return [clamp01(float(b)) for b in bands]
+
+def bands_from_spectrum(mag: np.ndarray, n: int, sr: float, n_bands: int = 7):
+    """
+    Mean magnitude per log band (20 Hz–20 kHz) of an n-sample block's
+    spectrum, normalized to sum 1.
+    """
+    return _normalized_bands(_band_means(mag, n, sr, n_bands))
+
+@functools.lru_cache(maxsize=16)
+def _multirate_split(sr: float, factor: int, n_bands: int) -> np.ndarray:
+    """
+    True for the bands that lie inside the decimated stream's passband.
+    """
+    edges = np.logspace(math.log10(BAND_MIN_F), math.log10(BAND_MAX_F), num=n_bands + 1)
+    low = edges[1:] <= decimator.passband_hz(sr, factor)
+    low.setflags(write=False)
+    return low
+
+def bands_from_multirate(mag_full: np.ndarray,
+                         n_full: int,
+                         mag_low: np.ndarray,
+                         n_low: int,
+                         sr: float,
+                         factor: int,
+                         n_bands: int = 7):
+    """
+    bands_from_spectrum() over two spectra: bands that end below the
+    decimated stream's passband come from mag_low (rate sr / factor), the
+    rest from mag_full. Each is scaled by its Hann window sum so the two
+    halves are on the same amplitude scale.
+    """
+    low = _multirate_split(float(sr), int(factor), n_bands)
+    full = _band_means(mag_full, n_full, sr, n_bands) / max(1.0, 0.5 * (n_full - 1))
+    lows = _band_means(mag_low, n_low, sr / factor, n_bands) / max(1.0, 0.5 * (n_low - 1))
+    return _normalized_bands(np.where(low, lows, full))
+
 def fft_bands(mono: np.ndarray, sr: int, n_bands: int = 7):
     n = len(mono)
     if n <= 0:
         return [0.0] * n_bands
+    mag, _ = spectrum(mono, sr, n_bands)
+    return bands_from_spectrum(mag, n, sr, n_bands)
 
-    window = np.hanning(n)
-    spec = np.fft.rfft(mono * window)
-    mag = np.abs(spec)
+class SpectralFlux:
+    """
+    Previous block's normalized magnitude, for the flux descriptor. One per
+    stream: the module default serves audio_callback, other callers
+    (sky_fusion_stage) keep their own.
+    """
 
-    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
+    def __init__(self):
+        self.prev: Optional[np.ndarray] = None
 
-    bands = np.zeros(n_bands, dtype=float)
+    def step(self, norm_mag: np.ndarray) -> float:
+        prev, self.prev = self.prev, norm_mag
+        if prev is None or prev.shape != norm_mag.shape:
+            return 0.0
+        # Half-wave rectified L1 change of two unit-sum spectra: in [0, 1].
+        return float(np.maximum(norm_mag - prev, 0.0).sum())
 
-    min_f = 20.0
-    max_f = 20000.0
-    log_min = math.log10(min_f)
-    log_max = math.log10(max_f)
-    edges = np.logspace(log_min, log_max, num=n_bands + 1)
+_flux = SpectralFlux()
 
-    for bi in range(n_bands):
-        f_lo = edges[bi]
-        f_hi = edges[bi + 1]
-        idx = np.where((freqs >= f_lo) & (freqs < f_hi))[0]
-        if idx.size > 0:
-            bands[bi] = float(np.mean(mag[idx]))
-        else:
-            bands[bi] = 0.0
+def spectral_descriptors(mono: np.ndarray,
+                         mag: np.ndarray,
+                         freqs: np.ndarray,
+                         sr: int,
+                         flux: Optional[SpectralFlux] = None) -> Dict[str, float]:
+    """
+    z..u from the block's shared magnitude spectrum, all in [0, 1):
 
-    total = float(np.sum(bands))
-    if total > 0.0:
-        bands = bands / total
-    return [clamp01(float(b)) for b in bands]
+      z  centroid / Nyquist
+      y  spread (magnitude-weighted std of frequency) / (Nyquist / 2)
+      x  flatness (geometric / arithmetic mean of power)
+      w  rolloff (ROLLOFF_FRACTION of the power) / Nyquist
+      v  flux vs the previous block (rectified, unit-sum spectra)
+      u  zero-crossing rate of the time-domain block
+    """
+    nyquist = sr / 2.0
+    total = float(mag.sum())
+    if mag.size == 0 or total <= 0.0:
+        if flux is not None:
+            flux.prev = None
+        return {"z": 0.0, "y": 0.0, "x": 0.0, "w": 0.0, "v": 0.0, "u": 0.0}
+
+    p = mag / total
+    centroid = float(np.dot(freqs, p))
+    spread = math.sqrt(max(0.0, float(np.dot((freqs - centroid) ** 2, p))))
+
+    power = mag * mag
+    cum = np.cumsum(power)
+    rolloff = float(freqs[min(int(np.searchsorted(cum, ROLLOFF_FRACTION * cum[-1])), freqs.size - 1)])
+    flatness = math.exp(float(np.mean(np.log(power + 1e-20)))) / (float(cum[-1]) / power.size + 1e-20)
+
+    zcr = float(np.count_nonzero(np.signbit(mono[1:]) != np.signbit(mono[:-1]))) / max(1, mono.size - 1)
+
+    return {
+        "z": clamp01(centroid / nyquist),
+        "y": clamp01(spread / (nyquist / 2.0)),
+        "x": clamp01(flatness),
+        "w": clamp01(rolloff / nyquist),
+        "v": clamp01((flux or _flux).step(p)),
+        "u": clamp01(zcr),
+    }
 
-def compute_14_float_from_audio(block: np.ndarray, sr: int):
+def _as_mono(block: np.ndarray) -> np.ndarray:
     if block.ndim == 2:
-        mono = block.mean(axis=1)
-    else:
-        mono = block
+        return block.mean(axis=1).astype(np.float64)
+    return block.astype(np.float64)
 
-    mono = mono.astype(np.float64)
+def compute_14_float_from_audio(block: np.ndarray,
+                                sr: int,
+                                flux: Optional[SpectralFlux] = None,
+                                low: Optional[np.ndarray] = None,
+                                factor: int = 1,
+                                bank: Optional[filterbank.Filterbank] = None):
+    """
+    The 14 floats for one analysis window. With a multi-rate window
+    (decimator.MultiRateWindow) pass its decimated frames as `low` and the
+    decimation factor: the low bands come from `low`, everything else
+    from the short full-rate `block`. With a filterbank the result also
+    holds "spectrum": its bands quantized to uint8 (filterbank.quantize).
+    """
+    mono = _as_mono(block)
+    spectrum_u8 = None
     if mono.size == 0:
         bands = [0.0] * 7
         rms = 0.0
+        spectral = spectral_descriptors(mono, mono, mono, sr, flux)
+        if bank is not None:
+            spectrum_u8 = np.zeros(bank.n_bands, dtype=np.uint8)
     else:
-        mono = mono / (np.max(np.abs(mono)) + 1e-9)
-        bands = fft_bands(mono, sr, 7)
+        peak = np.max(np.abs(mono)) + 1e-9
+        mono = mono / peak
+        mag, freqs = spectrum(mono, sr, 7)
+        if low is not None and factor > 1 and len(low) > 0:
+            low_mono = _as_mono(low) / peak
+            mag_low, _ = spectrum(low_mono, sr / factor, 7)
+            bands = bands_from_multirate(mag, mono.size, mag_low, low_mono.size, sr, factor, 7)
+            if bank is not None:
+                spectrum_u8 = filterbank.quantize(filterbank.apply_multirate(
+                    bank, mag, mono.size, mag_low, low_mono.size, factor,
+                    decimator.passband_hz(sr, factor)))
+        else:
+            bands = bands_from_spectrum(mag, mono.size, sr, 7)
+            if bank is not None:
+                spectrum_u8 = filterbank.quantize(bank.apply(mag))
+        spectral = spectral_descriptors(mono, mag, freqs, sr, flux)
         rms = safe_norm(mono) / math.sqrt(float(mono.size))
         rms = clamp01(rms)
 
@@ -116,20 +269,13 @@ def compute_14_float_from_audio(block: np.ndarray, sr: int):
         g_val = clamp01(g)
         t_val = clamp01(1.0 - g_val)
 
-    z = 0.0
-    y = 0.0
-    x = 0.0
-    w = 0.0
-    v = 0.0
-    u = 0.0
-
-    return {
-        "z": z,
-        "y": y,
-        "x": x,
-        "w": w,
-        "v": v,
-        "u": u,
+    out = {
+        "z": spectral["z"],
+        "y": spectral["y"],
+        "x": spectral["x"],
+        "w": spectral["w"],
+        "v": spectral["v"],
+        "u": spectral["u"],
         "t": t_val,
         "a": a,
         "b": b,
@@ -139,45 +285,80 @@ def compute_14_float_from_audio(block: np.ndarray, sr: int):
         "f": f,
         "g": g_val,
     }
+    if spectrum_u8 is not None:
+        out["spectrum"] = spectrum_u8
+    return out
 
-def write_state():
+def write_state(path: str = JSON_PATH):
     with _state_lock:
         data = dict(_state)
-    tmp = JSON_PATH + ".tmp"
+    tmp = path + ".tmp"
     with open(tmp, "w", encoding="utf-8") as f:
         json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
-    os.replace(tmp, JSON_PATH)
-
-def audio_callback(indata, frames, time_info, status):
-    global _state
-    if status:
-        pass
-    try:
-        floats = compute_14_float_from_audio(indata, SAMPLE_RATE)
-        now = time.time()
-        with _state_lock:
-            _state["time"] = float(now)
-            for k, v in floats.items():
-                _state[k] = float(v)
-        write_state()
-    except Exception:
-        pass
+    os.replace(tmp, path)
 
 def main():
-    if not os.path.exists(JSON_PATH):
-        write_state()
-
-    stream = sd.InputStream(
-        samplerate=SAMPLE_RATE,
-        blocksize=BLOCK_SIZE,
-        channels=1,
-        dtype="float32",
-        callback=audio_callback,
+    sky_profiler.install("mic_engine_8xd")
+    sky_metrics.serve("mic_engine_8xd")
+    import sounddevice as sd
+
+    json_path = os.path.abspath(os.path.expanduser(os.environ.get(ENV_JSON) or JSON_PATH))
+    if not os.path.exists(json_path):
+        write_state(json_path)
+
+    controller = adaptive_blocks.BlockSizeController(
+        "mic", SAMPLE_RATE, BLOCK_SIZE, adaptive_blocks.latency_bounds_from_env())
+    factor = decimator.factor_from_env()
+    window = decimator.MultiRateWindow(BLOCK_SIZE, 1, factor)
+    # SKY_BANDS filterbank over the full-rate window ("spectrum" in the JSON).
+    bank = filterbank.bank_from_env(window.full.size, SAMPLE_RATE)
+
+    def audio_callback(indata, frames, time_info, status):
+        try:
+            full, low = window.push(indata)
+            floats = compute_14_float_from_audio(full, SAMPLE_RATE, low=low, factor=factor, bank=bank)
+            spectrum_u8 = floats.pop("spectrum", None)
+            now = time.time()
+            with _state_lock:
+                _state["time"] = float(now)
+                for k, v in floats.items():
+                    _state[k] = float(v)
+                if spectrum_u8 is not None:
+                    _state["spectrum"] = filterbank.encode(spectrum_u8)
+                    _state["spectrum_bank"] = bank.spec
+        except Exception:
+            pass
+
+    def open_stream(block, callback):
+        return sd.InputStream(
+            samplerate=SAMPLE_RATE,
+            blocksize=block,
+            channels=1,
+            dtype="float32",
+            callback=callback,
+        )
+
+    stream = adaptive_blocks.AdaptiveStream(
+        open_stream,
+        sky_metrics.instrument_callback(sky_profiler.wrap(audio_callback)),
+        controller,
     )
 
     with stream:
+        period = 1.0 / PUBLISH_HZ
+        published = None
+        next_at = time.monotonic()
         while True:
-            time.sleep(0.1)
+            sky_profiler.tick()
+            with _state_lock:
+                stamp = _state["time"]
+            if stamp != published:
+                with sky_metrics.PUBLISH_SECONDS.time():
+                    write_state(json_path)
+                sky_metrics.TICKS.inc()
+                published = stamp
+            next_at = max(next_at + period, time.monotonic())
+            time.sleep(max(0.0, next_at - time.monotonic()))
 
 if __name__ == "__main__":
     main()
@@ -26,6 +26,10 @@ representing the 7 forward + 7 mirrored axes.
 New in this sequence:
   • omega_mirror_step: one step of the infinite mirror loop
   • omega_mirror_orbit: record an orbit of repeated reflections
+  • int_to_reversed_unit_array: the same digit reversal on whole int64
+    arrays with integer arithmetic (millions of coordinates per second)
+  • scalar_to_base8_digit_matrix / omega_mirror_orbit_array: base-8
+    digits and orbits for whole seed arrays, read straight from the bits
 """
 
 import json
@@ -43,6 +47,11 @@ EXAMPLES_JSON = os.path.join(ROOT, "coord_mapping_examples.json")
 LOCKFILE_TXT = os.path.join(ROOT, "coord_mapping_lock.txt")
 MIRROR_JSON = os.path.join(ROOT, "coord_mirror_orbit.json")
 
+if np is not None:
+    # 10**0 .. 10**18 (int64 range) for digit counting / scaling.
+    _POW10_INT = 10 ** np.arange(19, dtype=np.int64)
+    _POW10_FLOAT = 10.0 ** np.arange(20, dtype=np.float64)
+
 
 def clamp_unit(x: float) -> float:
     """
@@ -68,6 +77,44 @@ def int_to_reversed_unit(n: int) -> float:
     return clamp_unit(value)
 
 
+def int_to_reversed_unit_array(n):
+    """
+    Vectorized int_to_reversed_unit for whole int64 arrays, pure integer
+    arithmetic (no strings):
+
+      1) digits  = count of base-10 digits via a powers-of-10 lookup table
+      2) rev     = digits reversed with divmod passes
+      3) value   = rev / 10**digits   ("0.<rev>" exactly, both round once)
+
+    Matches the string version bit for bit for |n| < 10**15; floats are
+    truncated like int(). Locked examples: 1→0.1, 10→0.01, 369→0.963,
+    248→0.842.
+    """
+    if np is None:
+        raise RuntimeError("int_to_reversed_unit_array needs NumPy")
+
+    arr = np.asarray(n)
+    if arr.dtype.kind == "f":
+        arr = np.trunc(arr)
+    m = np.abs(arr.astype(np.int64))
+
+    digits = np.searchsorted(_POW10_INT, m, side="right")
+    digits = np.maximum(digits, 1)
+    max_digits = int(digits.max()) if digits.size else 1
+
+    rev = np.zeros_like(m)
+    rest = m
+    for _ in range(max_digits):
+        rest, d = np.divmod(rest, 10)
+        rev *= 10
+        rev += d
+    # Shorter numbers picked up (max_digits - digits) trailing zeros.
+    rev //= _POW10_INT[max_digits - digits]
+
+    value = rev.astype(np.float64) / _POW10_FLOAT[digits]
+    return np.where(value >= 1.0, 0.999999999999, value)
+
+
 def encode_xyz_to_scalar(x: int, y: int, z: int) -> float:
     """
     Follow your rule exactly: the scalar depends only on z.
@@ -99,6 +146,94 @@ def scalar_to_base8_digits(s: float, digits: int = 12) -> str:
     return "0." + "".join(out_digits)
 
 
+def clamp_unit_array(s):
+    """
+    Vectorized clamp_unit: [0, 1), never exactly 1.0.
+    """
+    s = np.asarray(s, dtype=np.float64)
+    s = np.where(s < 0.0, 0.0, s)
+    return np.where(s >= 1.0, 0.999999999999, s)
+
+
+# 16 octal digits = 48 bits per pass: fits int64 and a float64 mantissa.
+_BASE8_CHUNK = 16
+
+
+def scalar_to_base8_digit_matrix(s, digits: int = 12):
+    """
+    Vectorized scalar_to_base8_digits: (N,) scalars → (N, digits) uint8.
+
+    Multiplying a binary float by 8 only shifts its exponent, so the octal
+    digits are just the mantissa bits read 3 at a time. Each pass takes up
+    to 16 digits at once:
+
+        F    = floor(s · 2^(3k))       (exact)
+        d_j  = (F >> 3(k-1-j)) & 7
+        s    = s · 2^(3k) − F          (exact remainder)
+
+    Digit for digit identical to the multiply-by-8 loop.
+    """
+    s = clamp_unit_array(s).reshape(-1)
+    out = np.zeros((s.shape[0], max(0, int(digits))), dtype=np.uint8)
+
+    rem = s
+    col = 0
+    while col < out.shape[1]:
+        k = min(_BASE8_CHUNK, out.shape[1] - col)
+        scaled = np.ldexp(rem, 3 * k)
+        whole = np.floor(scaled)
+        f = whole.astype(np.int64)
+        for j in range(k):
+            out[:, col + j] = (f >> (3 * (k - 1 - j))) & 7
+        rem = scaled - whole
+        col += k
+    return out
+
+
+def base8_digit_matrix_to_strings(mat) -> List[str]:
+    """
+    (N, digits) uint8 → ["0.d0d1d2…", ...] like scalar_to_base8_digits.
+    """
+    mat = np.asarray(mat, dtype=np.uint8)
+    chars = (mat + ord("0")).astype(np.uint8)
+    return ["0." + row.tobytes().decode("ascii") for row in chars]
+
+
+def omega_mirror_step_array(s, digits: int = 12):
+    """
+    Vectorized omega_mirror_step.
+
+    With ≤ 17 digits every partial sum Σ d_i / 8^i is exact in float64,
+    so the step is simply s truncated to 3·digits bits. Longer expansions
+    replay the scalar left-to-right sum column by column.
+    """
+    s = clamp_unit_array(s)
+    if digits <= 0:
+        return s
+    if 3 * digits <= 51:
+        value = np.ldexp(np.floor(np.ldexp(s, 3 * digits)), -3 * digits)
+    else:
+        mat = scalar_to_base8_digit_matrix(s, digits)
+        value = np.zeros(mat.shape[0], dtype=np.float64)
+        for i in range(digits):
+            value += mat[:, i] / (8.0 ** (i + 1))
+        value = value.reshape(s.shape)
+    return clamp_unit_array(value)
+
+
+def omega_mirror_orbit_array(seeds, steps: int = 16, digits: int = 12):
+    """
+    Vectorized omega_mirror_orbit: (N,) seeds → (N, steps) orbits.
+    """
+    current = clamp_unit_array(seeds).reshape(-1)
+    steps = max(1, int(steps))
+    out = np.empty((current.shape[0], steps), dtype=np.float64)
+    for k in range(steps):
+        out[:, k] = current
+        current = omega_mirror_step_array(current, digits)
+    return out
+
+
 def encode_xyz_to_vec14(x: int, y: int, z: int) -> List[float]:
     """
     Build a 14-float continuum from the scalar.
@@ -129,6 +264,18 @@ def encode_xyz_to_vec14(x: int, y: int, z: int) -> List[float]:
     return [float(v) for v in (forward + backward)]
 
 
+VEC14_FACTORS = (1.0, 0.8, 0.6, 0.4, 0.2, 0.1, 0.05)
+
+
+def encode_scalars_to_vec14_array(scalars):
+    """
+    Vectorized encode_xyz_to_vec14 on precomputed scalars: (N,) → (N, 14).
+    """
+    base = clamp_unit_array(scalars).reshape(-1, 1)
+    forward = np.clip(base * np.array(VEC14_FACTORS, dtype=float), 0.0, 0.999999999999)
+    return np.concatenate([forward, forward[:, ::-1]], axis=1)
+
+
 def omega_mirror_step(s: float) -> float:
     """
     One step of the "infinite mirrors staring at each other" loop.
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import json
+import math
+
+import numpy as np
+
+from . import sky_profiler, sky_metrics, adaptive_blocks, decimator, filterbank
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+JSON_PATH = os.path.join(ROOT, "bpm_sync.json")
+# SKY_MIC_JSON moves the output (e.g. next to sky-fusion, which owns
+# bpm_sync.json: SKY_MIC_JSON=sky/lion.json, then sky-fusion --mic-json).
+ENV_JSON = "SKY_MIC_JSON"
+
+def clamp01(x):
+    x = float(x)
+    if x < 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 0.999999999999
+    return x
+
+def norm_vec(v):
+    v = np.array(v, dtype=float).ravel()
+    s = np.linalg.norm(v) + 1e-12
+    return v / s
+
+def build_vec14(block, sample_rate, low=None, bank=None):
+    """
+    `low`: optional decimated frames covering the same span
+    (decimator.MultiRateWindow). RMS, stereo balance and the low / high
+    split are then measured on it; only the centroid FFT uses `block`.
+    `bank`: optional filterbank (filterbank.py); adds a 7th return value,
+    the channel-averaged band levels of that FFT quantized to uint8.
+    """
+    spectrum_block = block
+    if low is not None and len(low) > 0:
+        block = low
+    rms = float(np.sqrt(np.mean(block ** 2) + 1e-18))
+    energy = clamp01(rms * 30.0)
+
+    analytic = np.fft.rfft(spectrum_block, axis=0)
+    mag = np.abs(analytic)
+    freq = np.fft.rfftfreq(spectrum_block.shape[0], d=1.0 / sample_rate)
+    total_mag = float(np.sum(mag) + 1e-18)
+    spectral_centroid = float(np.sum(freq * mag) / total_mag)
+    phase_like = clamp01(spectral_centroid / (sample_rate / 2.0))
+
+    if block.shape[1] >= 2:
+        left = block[:, 0]
+        right = block[:, 1]
+    else:
+        left = block[:, 0]
+        right = block[:, 0]
+
+    left_rms = float(np.sqrt(np.mean(left ** 2) + 1e-18))
+    right_rms = float(np.sqrt(np.mean(right ** 2) + 1e-18))
+    total_lr = left_rms + right_rms + 1e-18
+    stereo_balance = clamp01(0.5 + (left_rms - right_rms) / (2.0 * total_lr))
+
+    low_cut = int(block.shape[0] * 0.1)
+    high_cut = int(block.shape[0] * 0.6)
+    low_energy = float(np.sqrt(np.mean(block[:low_cut] ** 2) + 1e-18))
+    high_energy = float(np.sqrt(np.mean(block[high_cut:] ** 2) + 1e-18))
+    sum_bands = low_energy + high_energy + 1e-18
+    superposition = clamp01(high_energy / sum_bands)
+
+    energy_slow = clamp01(energy * 0.7 + superposition * 0.3)
+    movement = clamp01(abs(stereo_balance - 0.5) * 2.0)
+    lion_roar = clamp01(energy * 0.6 + movement * 0.4)
+    halo = clamp01(phase_like * 0.5 + superposition * 0.5)
+
+    x = energy
+    y = phase_like
+    z = superposition
+    w = energy_slow
+    v = movement
+    u = stereo_balance
+    t = halo
+
+    a = clamp01((x + y) * 0.5)
+    b = clamp01((y + z) * 0.5)
+    c = clamp01((z + w) * 0.5)
+    d = clamp01((w + v) * 0.5)
+    e = clamp01((v + u) * 0.5)
+    f = clamp01((u + t) * 0.5)
+    g = clamp01((t + energy + phase_like + lion_roar) / 4.0)
+
+    vec14 = [x, y, z, w, v, u, t, a, b, c, d, e, f, g]
+    vec14 = [clamp01(vv) for vv in vec14]
+
+    vec8 = norm_vec([
+        energy, phase_like, superposition, movement,
+        stereo_balance, halo, lion_roar, energy_slow
+    ]).tolist()
+    vec8 = [clamp01(vv * 0.999999999999) for vv in vec8]
+
+    if bank is not None:
+        levels = bank.apply(mag)
+        if levels.ndim == 2:
+            levels = levels.mean(axis=1)
+        return vec14, vec8, energy, phase_like, superposition, lion_roar, filterbank.quantize(levels)
+    return vec14, vec8, energy, phase_like, superposition, lion_roar
+
+def main():
+    sky_profiler.install("numpy_lion_engine")
+    sky_metrics.serve("numpy_lion_engine")
+    # Imported here so build_vec14 can be used without an audio stack.
+    try:
+        import sounddevice as sd
+    except Exception as e:
+        sys.stderr.write("NumPy / sounddevice import error: %s\n" % (e,))
+        sys.exit(1)
+
+    if not os.path.isdir(ROOT):
+        sys.stderr.write("Root path does not exist: %s\n" % ROOT)
+        sys.exit(1)
+
+    try:
+        info = sd.query_devices(kind="input")
+        device_index = sd.default.device[0] if sd.default.device is not None else info["index"]
+        dev_info = sd.query_devices(device_index, "input")
+    except Exception:
+        dev_list = sd.query_devices()
+        device_index = None
+        for idx, d in enumerate(dev_list):
+            if d.get("max_input_channels", 0) > 0:
+                device_index = idx
+                dev_info = d
+                break
+        if device_index is None:
+            sys.stderr.write("No input device with channels found.\n")
+            sys.exit(1)
+
+    max_ch = int(dev_info.get("max_input_channels", 1))
+    channels = 2 if max_ch >= 2 else 1
+
+    sample_rate = int(dev_info.get("default_samplerate", 48000))
+    if sample_rate <= 0:
+        sample_rate = 48000
+
+    json_path = os.path.abspath(os.path.expanduser(os.environ.get(ENV_JSON) or JSON_PATH))
+    block_size = 2048
+    controller = adaptive_blocks.BlockSizeController(
+        "lion", sample_rate, block_size, adaptive_blocks.latency_bounds_from_env())
+    factor = decimator.factor_from_env()
+    window = decimator.MultiRateWindow(block_size, channels, factor)
+    bank = filterbank.bank_from_env(window.full.size, sample_rate)
+
+    sys.stdout.write("---------------------------------------------\n")
+    sys.stdout.write("  8XD NUMPY LION MIC ENGINE (GOD'S NOT DEAD)\n")
+    sys.stdout.write("---------------------------------------------\n")
+    sys.stdout.write("Device     : %s\n" % dev_info.get("name", "Unknown"))
+    sys.stdout.write("Channels   : %d\n" % channels)
+    sys.stdout.write("SampleRate : %d\n" % sample_rate)
+    sys.stdout.write("BlockSize  : %d (window %d, bounds %d..%d)\n" % (
+        controller.block, block_size, controller.min_block, controller.max_block))
+    sys.stdout.write("Decimate   : %d\n" % factor)
+    sys.stdout.write("Spectrum   : %s\n" % (bank.spec if bank is not None else "off"))
+    sys.stdout.write("JSON       : %s\n" % json_path)
+    sys.stdout.write("---------------------------------------------\n")
+    sys.stdout.write("Mic → NumPy (parallel) → 8D/14D lion sky vectors\n")
+    sys.stdout.write("Ctrl+C to stop.\n")
+    sys.stdout.write("---------------------------------------------\n")
+    sys.stdout.flush()
+
+    shared = {
+        "vec14": [0.0] * 14,
+        "vec8": [0.0] * 8,
+        "energy": 0.0,
+        "phase": 0.0,
+        "superposition": 0.0,
+        "lion": 0.0,
+        "spectrum": None,
+        "updated": 0.0,
+    }
+
+    def callback(indata, frames, time_info, status):
+        if status:
+            sys.stderr.write("Status: %s\n" % status)
+        try:
+            block, low = window.push(indata)
+            feats = build_vec14(block, sample_rate, low, bank)
+            vec14, vec8, energy, phase_like, superposition, lion_roar = feats[:6]
+            if bank is not None:
+                shared["spectrum"] = filterbank.encode(feats[6])
+            shared["vec14"] = vec14
+            shared["vec8"] = vec8
+            shared["energy"] = float(energy)
+            shared["phase"] = float(phase_like)
+            shared["superposition"] = float(superposition)
+            shared["lion"] = float(lion_roar)
+            shared["updated"] = time.time()
+        except Exception as e:
+            sys.stderr.write("Callback error: %s\n" % (e,))
+
+    callback = sky_metrics.instrument_callback(sky_profiler.wrap(callback))
+
+    def open_stream(blocksize, cb):
+        return sd.InputStream(
+            device=device_index,
+            channels=channels,
+            samplerate=sample_rate,
+            blocksize=blocksize,
+            callback=cb
+        )
+
+    try:
+        with adaptive_blocks.AdaptiveStream(open_stream, callback, controller):
+            last_write = 0.0
+            while True:
+                sky_profiler.tick()
+                now = time.time()
+                if now - last_write >= 1.0 / 30.0:
+                    payload = {
+                        "energy": clamp01(shared["energy"]),
+                        "phase": clamp01(shared["phase"]),
+                        "superposition": clamp01(shared["superposition"]),
+                        "lion": clamp01(shared["lion"]),
+                        "vec8": [clamp01(v) for v in shared["vec8"]],
+                        "vec14": [clamp01(v) for v in shared["vec14"]],
+                        "timestamp": now,
+                    }
+                    if shared["spectrum"] is not None:
+                        payload["spectrum"] = shared["spectrum"]
+                        payload["spectrum_bank"] = bank.spec
+                    try:
+                        with sky_metrics.PUBLISH_SECONDS.time():
+                            tmp_path = json_path + ".tmp"
+                            with open(tmp_path, "w") as f:
+                                json.dump(payload, f, separators=(",", ":"))
+                            os.replace(tmp_path, json_path)
+                    except Exception as e:
+                        sys.stderr.write("Write error: %s\n" % (e,))
+                    if shared["updated"]:
+                        sky_metrics.FRAME_AGE.set(now - shared["updated"])
+                    sky_metrics.TICKS.inc()
+                    last_write = now
+                time.sleep(0.005)
+    except KeyboardInterrupt:
+        sys.stdout.write("\nStopping 8XD NumPy Lion engine.\n")
+    except Exception as e:
+        sys.stderr.write("Stream error: %s\n" % (e,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+omega_orbit_atlas.py — omega mirror fixed points and transients for a z range.
+
+Focus:
+
+  • For every block z take the locked scalar s = 0.<reverse(|z|)> and
+    follow the omega mirror loop (numpy_coord_mapper.omega_mirror_step_array).
+  • The mirror step truncates s to 3 · digits bits, so it is idempotent:
+    every orbit reaches its fixed point step(s) after at most one step
+    (transient 0 or 1, period always 1). There are no longer cycles to
+    detect and no cycle table to keep: fixed_point() computes the orbit's
+    end in one vectorized op.
+  • z and -z share a seed, so the atlas only covers |z|. It stores the
+    seed and its fixed point per |z|, memory-mapped, so a lookup is one
+    row read with no 12-digit reversal and no mirror step at runtime
+    (the transient is fixed_point != seed):
+
+       omega_atlas/index.npy    float64 (count, 2): seed, fixed point
+                                for |z| = a_min .. a_max (16 bytes each,
+                                about 480 MB for the world border)
+       omega_atlas/meta.json    z range, |z| range, digits, counts
+
+Usage:
+
+  sky-orbit-atlas                           # whole world border
+  sky-orbit-atlas --radius 30000
+  sky-orbit-atlas --lookup 248
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+from .numpy_coord_mapper import int_to_reversed_unit_array, omega_mirror_step_array
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ATLAS_DIR = os.path.join(ROOT, "omega_atlas")
+
+# Vanilla world border radius in blocks.
+WORLD_BORDER_RADIUS = 29999984
+
+INDEX_DTYPE = np.dtype("<f8")
+SEED, FIXED = 0, 1
+
+DEFAULT_DIGITS = 12
+DEFAULT_CHUNK = 1 << 20
+
+
+def fixed_point(seeds: np.ndarray, digits: int = DEFAULT_DIGITS) -> np.ndarray:
+    """
+    Where each seed's orbit ends: one mirror step (the step is idempotent).
+    """
+    return omega_mirror_step_array(seeds, digits)
+
+
+def orbit_transient(seeds: np.ndarray, digits: int = DEFAULT_DIGITS) -> np.ndarray:
+    """
+    Steps before the fixed point: 0 when the seed already is one, else 1.
+    """
+    seeds = np.asarray(seeds, dtype=np.float64)
+    return (fixed_point(seeds, digits) != seeds).astype(np.uint8)
+
+
+def abs_range(z_min: int, z_max: int) -> Tuple[int, int]:
+    """
+    |z| span covered by z in [z_min, z_max].
+    """
+    if z_min <= 0 <= z_max:
+        return 0, max(-int(z_min), int(z_max))
+    return min(abs(int(z_min)), abs(int(z_max))), max(abs(int(z_min)), abs(int(z_max)))
+
+
+def build_atlas(z_min: int,
+                z_max: int,
+                out_dir: str = ATLAS_DIR,
+                digits: int = DEFAULT_DIGITS,
+                chunk: int = DEFAULT_CHUNK,
+                verbose: bool = True) -> Dict[str, Any]:
+    if z_max < z_min:
+        raise ValueError("z_max must be >= z_min")
+    os.makedirs(out_dir, exist_ok=True)
+    a_min, a_max = abs_range(z_min, z_max)
+    count = a_max - a_min + 1
+
+    index = np.lib.format.open_memmap(
+        os.path.join(out_dir, "index.npy"), mode="w+", dtype=INDEX_DTYPE, shape=(count, 2)
+    )
+
+    transients = 0
+    t0 = time.perf_counter()
+    for start in range(0, count, chunk):
+        stop = min(count, start + chunk)
+        a = np.arange(a_min + start, a_min + stop, dtype=np.int64)
+        seeds = int_to_reversed_unit_array(a)
+        fixed = fixed_point(seeds, digits)
+        index[start:stop, SEED] = seeds
+        index[start:stop, FIXED] = fixed
+        transients += int(np.count_nonzero(fixed != seeds))
+        if verbose:
+            print("  |z| {:>11d} .. {:>11d}".format(a_min + start, a_min + stop - 1))
+
+    index.flush()
+    del index
+
+    meta = {
+        "z_min": int(z_min),
+        "z_max": int(z_max),
+        "abs_min": int(a_min),
+        "abs_max": int(a_max),
+        "count": count,
+        "digits": int(digits),
+        "fixed_seeds": count - transients,
+        "transient_seeds": transients,
+        "build_seconds": round(time.perf_counter() - t0, 3),
+    }
+    tmp = os.path.join(out_dir, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, "meta.json"))
+    return meta
+
+
+class OrbitAtlas:
+    """
+    Read-only, memory-mapped view of a built atlas.
+    """
+
+    def __init__(self, out_dir: str = ATLAS_DIR):
+        with open(os.path.join(out_dir, "meta.json"), "r") as f:
+            self.meta = json.load(f)
+        self.z_min = int(self.meta["z_min"])
+        self.z_max = int(self.meta["z_max"])
+        self.abs_min = int(self.meta["abs_min"])
+        self.digits = int(self.meta["digits"])
+        self.index = np.load(os.path.join(out_dir, "index.npy"), mmap_mode="r")
+
+    def _check(self, z: np.ndarray) -> None:
+        if z.size and (z.min() < self.z_min or z.max() > self.z_max):
+            raise KeyError("z outside atlas range [{}, {}]".format(self.z_min, self.z_max))
+
+    def lookup(self, z: int) -> Dict[str, Any]:
+        self._check(np.asarray([z], dtype=np.int64))
+        seed, fixed = (float(v) for v in self.index[abs(int(z)) - self.abs_min])
+        return {
+            "z": int(z),
+            "seed": seed,
+            "transient": int(fixed != seed),
+            "period": 1,
+            "fixed_point": fixed,
+        }
+
+    def lookup_array(self, z: np.ndarray) -> np.ndarray:
+        """
+        (n, 2) rows of [seed, fixed point] for an array of z.
+        """
+        z = np.asarray(z, dtype=np.int64)
+        self._check(z)
+        return self.index[np.abs(z) - self.abs_min]
+
+    def transient_array(self, z: np.ndarray) -> np.ndarray:
+        """
+        Transient flags (uint8) for an array of z.
+        """
+        rows = self.lookup_array(z)
+        return (rows[..., FIXED] != rows[..., SEED]).astype(np.uint8)
+
+
+def main() -> None:
+    sky_profiler.install("omega_orbit_atlas")
+    parser = argparse.ArgumentParser(description="Build / query the omega orbit atlas.")
+    parser.add_argument("--radius", type=int, default=WORLD_BORDER_RADIUS,
+                        help="cover z in [-radius, radius] (default: world border)")
+    parser.add_argument("--z-min", type=int, default=None)
+    parser.add_argument("--z-max", type=int, default=None)
+    parser.add_argument("--digits", type=int, default=DEFAULT_DIGITS)
+    parser.add_argument("--out", default=ATLAS_DIR)
+    parser.add_argument("--lookup", type=int, default=None,
+                        help="query an existing atlas instead of building")
+    args = parser.parse_args()
+
+    if args.lookup is not None:
+        atlas = OrbitAtlas(args.out)
+        print(json.dumps(atlas.lookup(args.lookup), indent=2))
+        return
+
+    z_min = args.z_min if args.z_min is not None else -args.radius
+    z_max = args.z_max if args.z_max is not None else args.radius
+
+    print("8XD omega orbit atlas")
+    print("  Out    :", args.out)
+    print("  Range  : z = {} .. {}".format(z_min, z_max))
+    meta = build_atlas(z_min, z_max, args.out, args.digits)
+    print("  Seeds  : {} (|z| = {} .. {})".format(meta["count"], meta["abs_min"], meta["abs_max"]))
+    print("  Fixed  : {}  transient: {}".format(meta["fixed_seeds"], meta["transient_seeds"]))
+    print("  Time   : {}s".format(meta["build_seconds"]))
+
+
+if __name__ == "__main__":
+    main()
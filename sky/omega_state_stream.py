@@ -10,12 +10,12 @@ on the command line.
 
 Usage:
 
-  cd ~/Desktop/sky
-  python3 omega_state_stream.py
+  sky-omega-state
 """
 
 import json
 import os
+from . import sky_profiler
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 EXAMPLES_JSON = os.path.join(ROOT, "coord_mapping_examples.json")
@@ -30,6 +30,7 @@ def load_json(path):
 
 
 def main():
+    sky_profiler.install("omega_state_stream")
     examples = load_json(EXAMPLES_JSON)
     mirrors = load_json(MIRROR_JSON)
 
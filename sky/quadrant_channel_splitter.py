@@ -21,8 +21,11 @@ Focus:
          "width_quarter": ...,
          "height_quarter": ...,
          "frameIndex": ...,
+         "render_scale": ..., "width_render": ..., "height_render": ...,
          "data": [ [0..1], ... ]
        }
+    data is width_render x height_render (the governor's render size);
+    stretch it to the quarter size when drawing.
 
 This makes it easy for any further processing layer to treat LIGHT/SHADE/COLOR
 as distinct 0–1 fields, while still only touching 1/4 of the pixel grid.
@@ -31,6 +34,7 @@ as distinct 0–1 fields, while still only touching 1/4 of the pixel grid.
 import json
 import os
 from typing import Dict, Any
+from . import sky_profiler
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 IN_JSON = os.path.join(ROOT, "screen_colormap_8xd.json")
@@ -54,6 +58,9 @@ def write_channel(meta: Dict[str, Any], data, out_path: str, label: str) -> None
         "width_quarter": meta["width_quarter"],
         "height_quarter": meta["height_quarter"],
         "frameIndex": meta["frameIndex"],
+        "render_scale": meta.get("render_scale", 1.0),
+        "width_render": meta.get("width_render", meta["width_quarter"]),
+        "height_render": meta.get("height_render", meta["height_quarter"]),
         "channel": label,
         "data": data,
     }
@@ -62,6 +69,7 @@ def write_channel(meta: Dict[str, Any], data, out_path: str, label: str) -> None
 
 
 def main() -> None:
+    sky_profiler.install("quadrant_channel_splitter")
     maps = load_colormaps()
     meta = maps["meta"]
     light = maps["LIGHT"]
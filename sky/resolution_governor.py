@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+resolution_governor.py — frame-cost driven render scale for the screen tile.
+
+Focus:
+
+  • The colormap stage used to compute at whatever resolution the client
+    reported. The governor measures each frame's generation time against
+    a budget and picks an internal render scale for the quarter tile from
+    a fixed ladder (1.0 … 0.25).
+  • Hysteresis: the cost is smoothed (EWMA); the scale steps down after
+    DOWN_AFTER frames over budget and steps back up only after UP_AFTER
+    frames in which the *predicted* cost at the larger scale (cost grows
+    with the pixel count, scale²) stays under UP_HEADROOM × budget.
+  • render_info() is what screen_quadrant_mapper records under
+    layout["render"]: scale, render width / height, budget and cost.
+  • upsample() stretches a render-size field back to the quarter size by
+    nearest neighbour: two np.take gathers through cached index maps.
+  • The CLI pipeline (mapper → colormap generator as separate processes)
+    keeps the governor in screen_governor.json; sky_supervisor keeps one
+    in memory for its screen engine.
+
+Environment:
+
+  SKY_FRAME_BUDGET_MS   per-frame budget for the CLI pipeline (default 50)
+
+Usage:
+
+  sky-screen-layout && sky-screen-colormaps    # each run feeds the governor
+  cat sky/screen_governor.json
+"""
+
+import functools
+import json
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from . import sky_metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+GOVERNOR_JSON = os.path.join(ROOT, "screen_governor.json")
+
+ENV_BUDGET = "SKY_FRAME_BUDGET_MS"
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_LADDER = (1.0, 0.85, 0.7, 0.5, 0.35, 0.25)
+
+EWMA_ALPHA = 0.3
+DOWN_AFTER = 2
+UP_AFTER = 20
+UP_HEADROOM = 0.7
+
+RENDER_SCALE = sky_metrics.REGISTRY.gauge("sky_render_scale", "Screen tile render scale chosen by the governor.")
+FRAME_COST = sky_metrics.REGISTRY.gauge("sky_frame_cost_seconds", "Smoothed screen frame generation time.")
+SCALE_CHANGES = sky_metrics.REGISTRY.counter("sky_render_scale_changes_total", "Render scale steps taken by the governor.")
+
+
+def budget_from_env(default: float = DEFAULT_BUDGET_MS) -> float:
+    try:
+        return max(1.0, float(os.environ.get(ENV_BUDGET, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def scaled_size(width: int, height: int, scale: float) -> Tuple[int, int]:
+    """
+    Render size for a width × height tile at this scale (at least 1 × 1).
+    """
+    return (max(1, int(round(int(width) * scale))),
+            max(1, int(round(int(height) * scale))))
+
+
+@functools.lru_cache(maxsize=64)
+def nearest_index(n_in: int, n_out: int) -> np.ndarray:
+    """
+    Source index of every output sample for a nearest-neighbour stretch.
+    """
+    idx = ((np.arange(n_out, dtype=np.float64) + 0.5) * (n_in / float(n_out))).astype(np.intp)
+    np.minimum(idx, n_in - 1, out=idx)
+    idx.setflags(write=False)
+    return idx
+
+
+def upsample(field: np.ndarray, height: int, width: int) -> np.ndarray:
+    """
+    Nearest-neighbour stretch of the first two axes to (height, width).
+    Returns field itself when it already has that size.
+    """
+    h, w = field.shape[:2]
+    if (h, w) == (height, width):
+        return field
+    out = field
+    if h != height:
+        out = np.take(out, nearest_index(h, height), axis=0)
+    if w != width:
+        out = np.take(out, nearest_index(w, width), axis=1)
+    return out
+
+
+class ResolutionGovernor:
+    """
+    Picks a render scale from `ladder` so frame cost stays under budget_ms.
+    """
+
+    def __init__(self,
+                 budget_ms: float = DEFAULT_BUDGET_MS,
+                 ladder: Sequence[float] = DEFAULT_LADDER,
+                 alpha: float = EWMA_ALPHA,
+                 down_after: int = DOWN_AFTER,
+                 up_after: int = UP_AFTER,
+                 up_headroom: float = UP_HEADROOM):
+        self.budget_ms = max(1.0, float(budget_ms))
+        self.ladder = tuple(sorted((float(s) for s in ladder), reverse=True))
+        self.alpha = float(alpha)
+        self.down_after = max(1, int(down_after))
+        self.up_after = max(1, int(up_after))
+        self.up_headroom = float(up_headroom)
+
+        self.level = 0
+        self.cost_ms: Optional[float] = None
+        self.frames = 0
+        self.changes = 0
+        self._over = 0
+        self._under = 0
+        RENDER_SCALE.set(self.scale)
+
+    @property
+    def scale(self) -> float:
+        return self.ladder[self.level]
+
+    def _step(self, new_level: int) -> None:
+        old = self.scale
+        self.level = new_level
+        # The cost scales with the pixel count: carry the estimate across.
+        if self.cost_ms is not None:
+            self.cost_ms *= (self.scale / old) ** 2
+        self._over = 0
+        self._under = 0
+        self.changes += 1
+        SCALE_CHANGES.inc()
+        RENDER_SCALE.set(self.scale)
+
+    def observe(self, cost_ms: float) -> float:
+        """
+        Feed one frame's generation time (at the current scale); returns
+        the scale to render the next frame at.
+        """
+        cost_ms = max(0.0, float(cost_ms))
+        self.frames += 1
+        if self.cost_ms is None:
+            self.cost_ms = cost_ms
+        else:
+            self.cost_ms += self.alpha * (cost_ms - self.cost_ms)
+        FRAME_COST.set(self.cost_ms / 1000.0)
+
+        if self.cost_ms > self.budget_ms:
+            self._under = 0
+            self._over += 1
+            if self._over >= self.down_after and self.level < len(self.ladder) - 1:
+                self._step(self.level + 1)
+            return self.scale
+
+        self._over = 0
+        if self.level > 0:
+            predicted = self.cost_ms * (self.ladder[self.level - 1] / self.scale) ** 2
+            if predicted < self.budget_ms * self.up_headroom:
+                self._under += 1
+                if self._under >= self.up_after:
+                    self._step(self.level - 1)
+            else:
+                self._under = 0
+        return self.scale
+
+    def render_info(self, width: int, height: int) -> Dict[str, Any]:
+        """
+        layout["render"] block for a width × height quarter tile.
+        """
+        wr, hr = scaled_size(width, height, self.scale)
+        return {
+            "scale": self.scale,
+            "width": wr,
+            "height": hr,
+            "budget_ms": self.budget_ms,
+            "cost_ms": None if self.cost_ms is None else round(self.cost_ms, 3),
+        }
+
+    # -- persistence (CLI pipeline) -----------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budget_ms": self.budget_ms,
+            "ladder": list(self.ladder),
+            "level": self.level,
+            "scale": self.scale,
+            "cost_ms": self.cost_ms,
+            "frames": self.frames,
+            "changes": self.changes,
+            "over": self._over,
+            "under": self._under,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], budget_ms: Optional[float] = None) -> "ResolutionGovernor":
+        gov = cls(budget_ms=budget_ms if budget_ms is not None else data.get("budget_ms", DEFAULT_BUDGET_MS),
+                  ladder=data.get("ladder") or DEFAULT_LADDER)
+        gov.level = min(max(0, int(data.get("level", 0))), len(gov.ladder) - 1)
+        cost = data.get("cost_ms")
+        gov.cost_ms = None if cost is None else float(cost)
+        gov.frames = int(data.get("frames", 0))
+        gov.changes = int(data.get("changes", 0))
+        gov._over = int(data.get("over", 0))
+        gov._under = int(data.get("under", 0))
+        RENDER_SCALE.set(gov.scale)
+        return gov
+
+    @classmethod
+    def load(cls, path: str = GOVERNOR_JSON, budget_ms: Optional[float] = None) -> "ResolutionGovernor":
+        if budget_ms is None:
+            budget_ms = budget_from_env()
+        if os.path.isfile(path):
+            try:
+                with open(path, "r") as f:
+                    return cls.from_dict(json.load(f), budget_ms)
+            except (OSError, ValueError, TypeError):
+                pass
+        return cls(budget_ms=budget_ms)
+
+    def save(self, path: str = GOVERNOR_JSON) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def render_size(layout: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    (width, height) the quarter tile is computed at: layout["render"] when
+    the governor set one, else the full quarter size.
+    """
+    q_info = layout["quarter"]
+    render = layout.get("render") or q_info
+    return max(1, int(render["width"])), max(1, int(render["height"]))
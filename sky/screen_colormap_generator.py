@@ -11,23 +11,44 @@ Focus:
        - shade_map    : black + color 4-checker
        - color_map    : pure color
   • Write screen_colormap_8xd.json with 0–1 floats only.
+  • Fields are computed at layout["render"] size (the governor's scale);
+    build_colormap_fields() stretches them back to the quarter size, the
+    JSON keeps the render size and says so in its meta. main() times the
+    frame and feeds resolution_governor.py for the next one.
+  • The tile grid comes from implicit_grid.quarter_grid(): 1-D axes and
+    cached centre offsets / parities, never a full meshgrid.
+  • For 4K/8K tiles, build_colormap_fields_banded() fills float32 output
+    buffers in horizontal row bands on a thread pool, so transient memory
+    stays under a fixed ceiling whatever the resolution.
 
 Quarter tile concept:
   We only compute a Wq × Hq tile for TOP_LEFT. The other three quadrants
   are logical transforms / mirrors of this tile. That keeps total pixel
-  computations to 1/4 per frame.
+  computations to 1/4 per frame. screen_symmetry_engine.py goes further
+  and evaluates only the mirror-unique part of the tile.
 """
 
 import json
 import os
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 
 import numpy as np
+from .implicit_grid import quarter_grid
+from .resolution_governor import ResolutionGovernor, render_size, upsample as upsample_field
+from . import sky_profiler
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 LAYOUT_JSON = os.path.join(ROOT, "screen_quadrant_layout.json")
 OUT_JSON = os.path.join(ROOT, "screen_colormap_8xd.json")
 
+# Transient (scratch) memory ceiling shared by all band workers.
+DEFAULT_BAND_BYTES = 32 * 1024 * 1024
+# float32 scratch rows each band worker keeps alive at once.
+BAND_SCRATCH_ROWS = 2
+
 
 def load_layout() -> Dict[str, Any]:
     if not os.path.isfile(LAYOUT_JSON):
@@ -39,27 +60,29 @@ def load_layout() -> Dict[str, Any]:
         return json.load(f)
 
 
-def build_colormaps(layout: Dict[str, Any]) -> Dict[str, Any]:
-    q_info = layout["quarter"]
-    wq = int(q_info["width"])
-    hq = int(q_info["height"])
+def build_colormap_fields(layout: Dict[str, Any], upsample: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Compute the quarter-tile fields as NumPy arrays (no JSON conversion).
+
+    Fields are computed at the layout's render size (layout["render"]);
+    with upsample=True they are stretched back to the quarter size.
+    """
+    wq, hq = render_size(layout)
     frame_index = int(layout.get("frameIndex", 0))
 
-    u = np.linspace(0.0, 0.5, num=wq, endpoint=False, dtype=np.float64)
-    v = np.linspace(0.0, 0.5, num=hq, endpoint=False, dtype=np.float64)
-    uu, vv = np.meshgrid(u, v)
+    grid = quarter_grid(wq, hq)
 
     center_u = 0.25
     center_v = 0.25
-    dist = np.sqrt((uu - center_u) ** 2 + (vv - center_v) ** 2)
-    dist_norm = dist / np.max(dist) if np.max(dist) > 0 else dist
+    du2, dv2 = grid.centre_sq(center_u, center_v)
+    dist = np.sqrt(du2[np.newaxis, :] + dv2[:, np.newaxis])
+    dmax = grid.centre_dist_max(center_u, center_v)
+    dist_norm = dist / dmax if dmax > 0 else dist
 
     phase = (frame_index % 64) / 64.0
     base_color = np.clip(1.0 - dist_norm + 0.25 * np.sin(2.0 * np.pi * phase), 0.0, 1.0)
 
-    rows = np.arange(hq).reshape(-1, 1)
-    cols = np.arange(wq).reshape(1, -1)
-    checker = (rows % 2) ^ (cols % 2)
+    checker = grid.checker()
     checker_f = checker.astype(np.float64)
 
     light_white = 1.0
@@ -84,6 +107,155 @@ def build_colormaps(layout: Dict[str, Any]) -> Dict[str, Any]:
 
     color_map = base_color.copy()
 
+    fields = {
+        "checker": checker_f,
+        "LIGHT": light_map,
+        "SHADE": shade_map,
+        "COLOR": color_map,
+    }
+    if upsample:
+        q_info = layout["quarter"]
+        out_h, out_w = max(1, int(q_info["height"])), max(1, int(q_info["width"]))
+        fields = {k: upsample_field(v, out_h, out_w) for k, v in fields.items()}
+    return fields
+
+
+def allocate_colormap_buffers(wq: int, hq: int) -> Dict[str, np.ndarray]:
+    """
+    Output buffers for build_colormap_fields_banded (reusable per frame).
+    """
+    return {
+        "checker": np.empty((hq, wq), dtype=np.uint8),
+        "LIGHT": np.empty((hq, wq), dtype=np.float32),
+        "SHADE": np.empty((hq, wq), dtype=np.float32),
+        "COLOR": np.empty((hq, wq), dtype=np.float32),
+    }
+
+
+_band_scratch = threading.local()
+
+
+def _scratch(rows: int, wq: int) -> np.ndarray:
+    buf = getattr(_band_scratch, "buf", None)
+    if buf is None or buf.shape[1] != wq or buf.shape[0] < rows:
+        buf = np.empty((rows, wq), dtype=np.float32)
+        _band_scratch.buf = buf
+    return buf[:rows]
+
+
+def _fill_band(out: Dict[str, np.ndarray],
+               r0: int,
+               r1: int,
+               du2: np.ndarray,
+               dv2: np.ndarray,
+               col_parity: np.ndarray,
+               row_parity: np.ndarray,
+               inv_dmax: np.float32,
+               lift: np.float32) -> None:
+    """
+    Fill rows [r0, r1) of every output buffer in place (float32).
+    """
+    rows = r1 - r0
+    base = out["COLOR"][r0:r1]
+    checker = out["checker"][r0:r1]
+    odd = _scratch(rows, du2.shape[0])
+
+    # base = clip(1 - dist / dmax + lift)
+    np.add(dv2[r0:r1, None], du2[None, :], out=base)
+    np.sqrt(base, out=base)
+    base *= -inv_dmax
+    base += np.float32(1.0) + lift
+    np.clip(base, 0.0, 1.0, out=base)
+
+    np.bitwise_xor(row_parity[r0:r1, None], col_parity[None, :], out=checker)
+    odd_mask = checker.view(np.bool_)
+
+    light = out["LIGHT"][r0:r1]
+    np.multiply(base, np.float32(0.65), out=light)
+    light += np.float32(0.35)
+    np.multiply(base, np.float32(0.85), out=odd)
+    odd += np.float32(0.15 * 0.9)
+    np.copyto(light, odd, where=odd_mask)
+    np.clip(light, 0.0, 1.0, out=light)
+
+    shade = out["SHADE"][r0:r1]
+    np.multiply(base, np.float32(0.25), out=shade)
+    np.multiply(base, np.float32(0.6), out=odd)
+    odd += np.float32(0.4 * 0.4)
+    np.copyto(shade, odd, where=odd_mask)
+    np.clip(shade, 0.0, 1.0, out=shade)
+
+
+def build_colormap_fields_banded(layout: Dict[str, Any],
+                                 max_band_bytes: int = DEFAULT_BAND_BYTES,
+                                 workers: Optional[int] = None,
+                                 out: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    Row-band version of build_colormap_fields for very large tiles.
+
+    • float32 math, fused in place, written straight into `out`
+      (allocate_colormap_buffers; pass it back in to reuse it).
+    • Rows are processed in bands sized so that all workers together keep
+      at most max_band_bytes of scratch alive.
+    • Bands run on a thread pool; NumPy releases the GIL inside the ufuncs.
+
+    Tiles are computed at the layout's render size (`out` must match it);
+    stretch with resolution_governor.upsample() when the quarter size is
+    needed. Results match build_colormap_fields(layout, upsample=False) to
+    float32 precision.
+    """
+    wq, hq = render_size(layout)
+    frame_index = int(layout.get("frameIndex", 0))
+
+    if out is None:
+        out = allocate_colormap_buffers(wq, hq)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), hq))
+
+    row_bytes = wq * 4 * BAND_SCRATCH_ROWS
+    band_rows = max(1, int(max_band_bytes) // (row_bytes * workers))
+    band_rows = min(band_rows, max(1, -(-hq // workers)))
+
+    grid = quarter_grid(wq, hq)
+    du2_64, dv2_64 = grid.centre_sq(0.25, 0.25)
+    dmax = grid.centre_dist_max(0.25, 0.25)
+    inv_dmax = np.float32(1.0 / dmax if dmax > 0 else 0.0)
+
+    phase = (frame_index % 64) / 64.0
+    lift = np.float32(0.25 * np.sin(2.0 * np.pi * phase))
+
+    du2, dv2 = grid.derived(("centre_sq32", 0.25, 0.25), lambda g: (
+        du2_64.astype(np.float32), dv2_64.astype(np.float32)))
+    col_parity, row_parity = grid.parity()
+
+    bands = [(r0, min(hq, r0 + band_rows)) for r0 in range(0, hq, band_rows)]
+
+    def run(band):
+        _fill_band(out, band[0], band[1], du2, dv2,
+                   col_parity, row_parity, inv_dmax, lift)
+
+    if workers == 1 or len(bands) == 1:
+        for band in bands:
+            run(band)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, bands))
+
+    return out
+
+
+def build_colormaps(layout: Dict[str, Any]) -> Dict[str, Any]:
+    q_info = layout["quarter"]
+    wq = int(q_info["width"])
+    hq = int(q_info["height"])
+    wr, hr = render_size(layout)
+    frame_index = int(layout.get("frameIndex", 0))
+
+    # Written at render size; readers stretch to width/height_quarter.
+    fields = build_colormap_fields(layout, upsample=False)
+
     def compress(arr: np.ndarray):
         return arr.astype(float).tolist()
 
@@ -92,29 +264,46 @@ def build_colormaps(layout: Dict[str, Any]) -> Dict[str, Any]:
             "width_quarter": wq,
             "height_quarter": hq,
             "frameIndex": frame_index,
+            "render_scale": float((layout.get("render") or {}).get("scale", 1.0)),
+            "width_render": wr,
+            "height_render": hr,
             "note": "Values 0–1 only. Quarter tile mirrored to 4 quadrants; "
-                    "LIGHT / SHADE / COLOR applied per quadrant.",
+                    "LIGHT / SHADE / COLOR applied per quadrant. Maps are "
+                    "width_render x height_render; stretch (nearest) to the quarter size.",
         },
-        "checker": compress(checker_f),
-        "LIGHT": compress(light_map),
-        "SHADE": compress(shade_map),
-        "COLOR": compress(color_map),
+        "checker": compress(fields["checker"]),
+        "LIGHT": compress(fields["LIGHT"]),
+        "SHADE": compress(fields["SHADE"]),
+        "COLOR": compress(fields["COLOR"]),
     }
     return colormaps
 
 
 def main() -> None:
+    sky_profiler.install("screen_colormap_generator")
     layout = load_layout()
+    governor = ResolutionGovernor.load()
+    t0 = time.perf_counter()
     colormaps = build_colormaps(layout)
+    cost_ms = (time.perf_counter() - t0) * 1000.0
     with open(OUT_JSON, "w") as f:
         json.dump(colormaps, f, indent=2)
+    governor.observe(cost_ms)
+    governor.save()
     print("8XD screen colormaps written:")
     print("  Path :", OUT_JSON)
     print("  Quarter size:",
           colormaps["meta"]["width_quarter"],
           "x",
           colormaps["meta"]["height_quarter"])
+    print("  Render size :",
+          colormaps["meta"]["width_render"],
+          "x",
+          colormaps["meta"]["height_render"],
+          "(scale {:g})".format(colormaps["meta"]["render_scale"]))
     print("  Frame:", colormaps["meta"]["frameIndex"])
+    print("  Cost : {:.1f} ms (budget {:g} ms) → next scale {:g}".format(
+        cost_ms, governor.budget_ms, governor.scale))
     print("LIGHT / SHADE / COLOR checker maps ready.")
 
 
@@ -8,7 +8,11 @@ Focus:
        { "width": W, "height": H, "frameIndex": ... }
   • Read screen_quadrant_request.json:
        { "player": "...", "uuid": "...", "width": W, "height": H, "frameIndex": N }
-  • Compute only a quarter grid for TOP_LEFT (base tile).
+  • Compute only a quarter grid for TOP_LEFT (base tile); its bounds come
+    from implicit_grid.py (1-D axes, nothing of size W×H).
+  • Record the render scale picked by resolution_governor.py under
+    layout["render"] (scale, width, height): the colormap stage computes
+    at that size and stretches back to the quarter size.
   • Define 4 quadrants with 3 modes: LIGHT, SHADE, COLOR.
   • Dump screen_quadrant_layout.json for Java + NumPy.
 
@@ -16,14 +20,18 @@ We still only compute 1/4 of the pixel count per frame (conceptually):
   - quarter width  = W / 2
   - quarter height = H / 2
 
-The remaining 3 quadrants mirror or transform this base tile logically.
+The remaining 3 quadrants mirror or transform this base tile logically;
+each quadrant carries mirror_u / mirror_v flags that
+screen_symmetry_engine.py turns into flipped views of the tile.
 """
 
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-import numpy as np
+from .implicit_grid import quarter_grid
+from .resolution_governor import ResolutionGovernor
+from . import sky_profiler
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 PLAYER_RES_JSON = os.path.join(ROOT, "..", "player_resolution.json")
@@ -59,24 +67,13 @@ def compute_quarter_grid(width: int, height: int) -> Dict[str, Any]:
     q_width = max(1, width // 2)
     q_height = max(1, height // 2)
 
-    u = np.linspace(0.0, 0.5, num=q_width, endpoint=False, dtype=np.float64)
-    v = np.linspace(0.0, 0.5, num=q_height, endpoint=False, dtype=np.float64)
+    # Bounds and sample count are analytic; no W×H grid is built.
+    return quarter_grid(q_width, q_height).bounds()
 
-    uu, vv = np.meshgrid(u, v)
 
-    base_tile = {
-        "width": int(q_width),
-        "height": int(q_height),
-        "u_min": float(u.min()),
-        "u_max": float(u.max()),
-        "v_min": float(v.min()),
-        "v_max": float(v.max()),
-        "sample_count": int(uu.size),
-    }
-    return base_tile
-
-
-def build_layout(res: Dict[str, Any], req: Dict[str, Any]) -> Dict[str, Any]:
+def build_layout(res: Dict[str, Any],
+                 req: Dict[str, Any],
+                 governor: Optional[ResolutionGovernor] = None) -> Dict[str, Any]:
     width = int(res.get("width", 1920))
     height = int(res.get("height", 1080))
 
@@ -85,6 +82,10 @@ def build_layout(res: Dict[str, Any], req: Dict[str, Any]) -> Dict[str, Any]:
     uuid = str(req.get("uuid", ""))
 
     quarter = compute_quarter_grid(width, height)
+    if governor is not None:
+        render = governor.render_info(quarter["width"], quarter["height"])
+    else:
+        render = {"scale": 1.0, "width": quarter["width"], "height": quarter["height"]}
 
     layout = {
         "resolution": {"width": width, "height": height},
@@ -92,26 +93,35 @@ def build_layout(res: Dict[str, Any], req: Dict[str, Any]) -> Dict[str, Any]:
         "player": player,
         "uuid": uuid,
         "quarter": quarter,
+        "render": render,
         "quadrants": {
             "TOP_LEFT": {
                 "mode": "LIGHT",
                 "u_range": [0.0, 0.5],
                 "v_range": [0.0, 0.5],
+                "mirror_u": False,
+                "mirror_v": False,
             },
             "TOP_RIGHT": {
                 "mode": "SHADE",
                 "u_range": [0.5, 1.0],
                 "v_range": [0.0, 0.5],
+                "mirror_u": True,
+                "mirror_v": False,
             },
             "BOTTOM_LEFT": {
                 "mode": "COLOR",
                 "u_range": [0.0, 0.5],
                 "v_range": [0.5, 1.0],
+                "mirror_u": False,
+                "mirror_v": True,
             },
             "BOTTOM_RIGHT": {
                 "mode": "COLOR",
                 "u_range": [0.5, 1.0],
                 "v_range": [0.5, 1.0],
+                "mirror_u": True,
+                "mirror_v": True,
             },
         },
     }
@@ -119,9 +129,10 @@ def build_layout(res: Dict[str, Any], req: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def main() -> None:
+    sky_profiler.install("screen_quadrant_mapper")
     res = load_resolution()
     req = load_request()
-    layout = build_layout(res, req)
+    layout = build_layout(res, req, ResolutionGovernor.load())
 
     with open(OUT_JSON, "w") as f:
         json.dump(layout, f, indent=2)
@@ -132,6 +143,8 @@ def main() -> None:
     print("  Res    :", layout["resolution"]["width"], "x", layout["resolution"]["height"])
     q = layout["quarter"]
     print("  1/4    :", q["width"], "x", q["height"], "samples:", q["sample_count"])
+    r = layout["render"]
+    print("  Render :", r["width"], "x", r["height"], "(scale {:g})".format(r["scale"]))
     print("  Frame  :", layout["frameIndex"])
     print("Quadrant modes: LIGHT (TL), SHADE (TR), COLOR (BL/BR).")
 
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+screen_symmetry_engine.py — exact mirror symmetry for the quarter tile.
+
+Focus:
+
+  • The quarter tile field is radial around (0.25, 0.25), so it is
+    mirror-symmetric left/right and top/bottom inside the tile, and — when
+    the tile is square — symmetric across the diagonal as well.
+  • Compute ONLY the fundamental region:
+       - 1/4 of the tile (top-left block up to the centre row/column), or
+       - 1/8 of the tile (upper triangle of that block) when Wq == Hq.
+  • Expose the rest as zero-copy, negative-stride views:
+       - MirroredTile.blocks()   → the 4 blocks of the tile
+       - MirroredTile.tile()     → materialized Wq × Hq tile (on demand)
+       - SymmetricFrame.views()  → 4 screen quadrants, each a flipped view
+       - SymmetricFrame.frame()  → materialized W × H frame (on demand)
+
+Exactness:
+  Offsets from the centre are built from integers,
+
+       du_i = (2·i − Wq) · (0.25 / Wq)
+
+  so du_i == −du_(Wq−i) bit for bit and every mirrored sample is exactly
+  the sample it mirrors (np.linspace − 0.25 is only symmetric to ~1 ulp).
+  The checker parity flips under a mirror when a tile side is odd; those
+  blocks use the parity-swapped variant of the fundamental region.
+"""
+
+import os
+import sys
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+from .screen_colormap_generator import load_layout
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Diagonal (1/8) fill works in row bands of this many rows.
+DIAG_BAND_ROWS = 32
+
+DEFAULT_QUADRANTS = {
+    "TOP_LEFT": {"mode": "LIGHT", "mirror_u": False, "mirror_v": False},
+    "TOP_RIGHT": {"mode": "SHADE", "mirror_u": True, "mirror_v": False},
+    "BOTTOM_LEFT": {"mode": "COLOR", "mirror_u": False, "mirror_v": True},
+    "BOTTOM_RIGHT": {"mode": "COLOR", "mirror_u": True, "mirror_v": True},
+}
+
+
+def centre_offsets(n: int) -> np.ndarray:
+    """
+    Exactly antisymmetric offsets from the tile centre (0.25) for n samples
+    over [0, 0.5): du_i == -du_(n-i).
+    """
+    n = max(1, int(n))
+    i = np.arange(n, dtype=np.float64)
+    return (2.0 * i - n) * (0.25 / n)
+
+
+def fundamental_extent(n: int) -> Tuple[int, int]:
+    """
+    (kept, mirrored) sample counts along one tile side.
+
+    Samples 0..n//2 are computed; samples n//2+1..n-1 mirror n-i.
+    """
+    n = max(1, int(n))
+    kept = n // 2 + 1 if n > 1 else 1
+    return kept, n - kept
+
+
+def _fundamental_dist(du: np.ndarray, dv: np.ndarray, diagonal: bool) -> np.ndarray:
+    """
+    dist over the fundamental block; with diagonal=True only the upper
+    triangle (+ a thin band) is evaluated and the rest is transposed in.
+    """
+    du2 = du * du
+    dv2 = dv * dv
+    if not diagonal:
+        return np.sqrt(dv2[:, None] + du2[None, :])
+
+    n = du2.shape[0]
+    out = np.empty((n, n), dtype=np.float64)
+    for r0 in range(0, n, DIAG_BAND_ROWS):
+        r1 = min(n, r0 + DIAG_BAND_ROWS)
+        band = np.sqrt(dv2[r0:r1, None] + du2[None, r0:])
+        out[r0:r1, r0:] = band
+        out[r0:, r0:r1] = band.T
+    return out
+
+
+class MirroredTile:
+    """
+    One quarter-tile channel held as its fundamental block.
+
+    variants[p] is the fundamental block for checker parity p
+    (p = 1 only exists when an odd tile side flips the checker).
+    """
+
+    def __init__(self,
+                 variants: Dict[int, np.ndarray],
+                 width: int,
+                 height: int):
+        self.variants = variants
+        self.width = int(width)
+        self.height = int(height)
+        self._tile = None
+
+    def _variant(self, flip_u: bool, flip_v: bool) -> np.ndarray:
+        p = 0
+        if flip_u and self.width % 2 == 1:
+            p ^= 1
+        if flip_v and self.height % 2 == 1:
+            p ^= 1
+        return self.variants.get(p, self.variants[0])
+
+    def blocks(self) -> Dict[str, np.ndarray]:
+        """
+        The four tile blocks as views — nothing is copied.
+        """
+        _, mu = fundamental_extent(self.width)
+        _, mv = fundamental_extent(self.height)
+        out = {"TL": self.variants[0]}
+        if mu > 0:
+            out["TR"] = self._variant(True, False)[:, mu:0:-1]
+        if mv > 0:
+            out["BL"] = self._variant(False, True)[mv:0:-1, :]
+        if mu > 0 and mv > 0:
+            out["BR"] = self._variant(True, True)[mv:0:-1, mu:0:-1]
+        return out
+
+    def tile(self) -> np.ndarray:
+        """
+        Materialize the full Hq × Wq tile (cached).
+        """
+        if self._tile is None:
+            b = self.blocks()
+            top = [b["TL"]] + ([b["TR"]] if "TR" in b else [])
+            rows = [top]
+            if "BL" in b:
+                rows.append([b["BL"]] + ([b["BR"]] if "BR" in b else []))
+            self._tile = np.block(rows)
+        return self._tile
+
+    @property
+    def computed_samples(self) -> int:
+        return int(self.variants[0].size)
+
+
+class SymmetricFrame:
+    """
+    LIGHT / SHADE / COLOR mirrored tiles + the quadrant layout.
+    """
+
+    def __init__(self,
+                 tiles: Dict[str, MirroredTile],
+                 quadrants: Dict[str, Dict[str, Any]],
+                 evaluated_samples: int):
+        self.tiles = tiles
+        self.quadrants = quadrants
+        self.evaluated_samples = int(evaluated_samples)
+
+    def views(self) -> Dict[str, np.ndarray]:
+        """
+        Four screen quadrants as negative-stride views of their tiles.
+        """
+        out = {}
+        for name, q in self.quadrants.items():
+            tile = self.tiles[q["mode"]].tile()
+            su = -1 if q.get("mirror_u") else 1
+            sv = -1 if q.get("mirror_v") else 1
+            out[name] = tile[::sv, ::su]
+        return out
+
+    def frame(self) -> np.ndarray:
+        """
+        Materialize the full (2·Hq) × (2·Wq) frame.
+        """
+        v = self.views()
+        return np.block([
+            [v["TOP_LEFT"], v["TOP_RIGHT"]],
+            [v["BOTTOM_LEFT"], v["BOTTOM_RIGHT"]],
+        ])
+
+
+def _quadrants_from_layout(layout: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    quads = {}
+    src = layout.get("quadrants", {})
+    for name, default in DEFAULT_QUADRANTS.items():
+        q = dict(default)
+        q.update({k: v for k, v in src.get(name, {}).items()
+                  if k in ("mode", "mirror_u", "mirror_v")})
+        quads[name] = q
+    return quads
+
+
+def build_symmetric_colormaps(layout: Dict[str, Any]) -> SymmetricFrame:
+    """
+    Same LIGHT / SHADE / COLOR recipe as screen_colormap_generator,
+    evaluated only on the fundamental region.
+    """
+    q_info = layout["quarter"]
+    wq = max(1, int(q_info["width"]))
+    hq = max(1, int(q_info["height"]))
+    frame_index = int(layout.get("frameIndex", 0))
+
+    ku, _ = fundamental_extent(wq)
+    kv, _ = fundamental_extent(hq)
+    du = centre_offsets(wq)[:ku]
+    dv = centre_offsets(hq)[:kv]
+
+    diagonal = wq == hq
+    dist = _fundamental_dist(du, dv, diagonal)
+    if diagonal:
+        evaluated = sum(
+            min(DIAG_BAND_ROWS, kv - r0) * (ku - r0)
+            for r0 in range(0, kv, DIAG_BAND_ROWS)
+        )
+    else:
+        evaluated = dist.size
+
+    # Farthest sample from the centre is always the (0, 0) corner.
+    dmax = float(dist[0, 0])
+    dist_norm = dist / dmax if dmax > 0 else dist
+
+    phase = (frame_index % 64) / 64.0
+    base_color = np.clip(1.0 - dist_norm + 0.25 * np.sin(2.0 * np.pi * phase), 0.0, 1.0)
+
+    rows = np.arange(kv).reshape(-1, 1)
+    cols = np.arange(ku).reshape(1, -1)
+    checker = (rows % 2) ^ (cols % 2)
+
+    light_white_weight = 0.35
+    light_color_weight = 0.85
+    light_even = np.clip(1.0 * light_white_weight + base_color * (1.0 - light_white_weight), 0.0, 1.0)
+    light_odd = np.clip(base_color * light_color_weight + (1.0 - light_color_weight) * 0.9, 0.0, 1.0)
+
+    shade_color_weight = 0.6
+    shade_even = np.clip(base_color * 0.25, 0.0, 1.0)
+    shade_odd = np.clip(base_color * shade_color_weight + (1.0 - shade_color_weight) * 0.4, 0.0, 1.0)
+
+    need_swap = (wq % 2 == 1) or (hq % 2 == 1)
+
+    def variants(even: np.ndarray, odd: np.ndarray) -> Dict[int, np.ndarray]:
+        out = {0: np.where(checker == 0, even, odd)}
+        if need_swap:
+            out[1] = np.where(checker == 0, odd, even)
+        return out
+
+    tiles = {
+        "LIGHT": MirroredTile(variants(light_even, light_odd), wq, hq),
+        "SHADE": MirroredTile(variants(shade_even, shade_odd), wq, hq),
+        "COLOR": MirroredTile({0: base_color}, wq, hq),
+    }
+    return SymmetricFrame(tiles, _quadrants_from_layout(layout), evaluated)
+
+
+def main() -> None:
+    sky_profiler.install("screen_symmetry_engine")
+    layout = load_layout()
+    sym = build_symmetric_colormaps(layout)
+
+    wq = int(layout["quarter"]["width"])
+    hq = int(layout["quarter"]["height"])
+    tile_samples = wq * hq
+
+    print("8XD symmetric quarter tile:")
+    print("  Quarter size : {} x {} ({} samples)".format(wq, hq, tile_samples))
+    print("  Fundamental  : {} samples stored, {} evaluated ({:.1%} of tile)".format(
+        sym.tiles["COLOR"].computed_samples,
+        sym.evaluated_samples,
+        sym.evaluated_samples / float(max(1, tile_samples)),
+    ))
+    print("  Diagonal     :", "yes (1/8 region)" if wq == hq else "no (1/4 region)")
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--frame":
+        out = sys.argv[2]
+        np.save(out, sym.frame())
+        print("  Frame        :", out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+screen_tile_tracker.py — 128x128 map-tile dirty tracking (Layer 3).
+
+Focus:
+
+  • Take the LIGHT / SHADE / COLOR quarter fields from
+    screen_colormap_generator.build_colormap_fields().
+  • Quantize each field to 0–255 bytes (what a map pixel can show).
+  • Split into Minecraft-map-sized 128x128 tiles and hash each tile.
+  • Emit ONLY the tiles whose hash changed since the previous frame,
+    plus a manifest with tile coordinates and generation numbers:
+
+       screen_tiles/manifest.json
+       screen_tiles/<CHANNEL>_<ty>_<tx>.bin   (raw uint8, row-major)
+
+Each tile keeps its own generation counter, bumped only when its bytes
+change, so the data pushed per frame scales with visual change rather
+than with screen size. Tiles that fall off the grid (the resolution
+shrank) are listed under "removed" and their .bin files deleted. Tracker
+state (hash + generation per tile) lives in screen_tiles/state.json
+between runs.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from .screen_colormap_generator import load_layout, build_colormap_fields
+from . import sky_profiler
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TILES_DIR = os.path.join(ROOT, "screen_tiles")
+STATE_JSON = os.path.join(TILES_DIR, "state.json")
+MANIFEST_JSON = os.path.join(TILES_DIR, "manifest.json")
+
+TILE_SIZE = 128
+CHANNELS = ("LIGHT", "SHADE", "COLOR")
+
+
+def quantize_field(field: np.ndarray) -> np.ndarray:
+    """
+    0–1 float field → uint8 bytes (0..255).
+    """
+    q = np.clip(field, 0.0, 1.0) * 255.0
+    return np.rint(q).astype(np.uint8)
+
+
+def iter_tiles(arr: np.ndarray, tile: int = TILE_SIZE):
+    """
+    Yield (ty, tx, view) for every tile; edge tiles may be smaller.
+    """
+    h, w = arr.shape[:2]
+    for ty in range(0, (h + tile - 1) // tile):
+        for tx in range(0, (w + tile - 1) // tile):
+            yield ty, tx, arr[ty * tile:(ty + 1) * tile, tx * tile:(tx + 1) * tile]
+
+
+def tile_hash(view: np.ndarray) -> str:
+    h = hashlib.blake2b(digest_size=8)
+    h.update(np.asarray(view.shape, dtype=np.int32).tobytes())
+    h.update(np.ascontiguousarray(view).tobytes())
+    return h.hexdigest()
+
+
+class TileTracker:
+    """
+    Remembers the last hash + generation of every (channel, ty, tx) tile.
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE):
+        self.tile_size = int(tile_size)
+        self.generation = 0
+        self.tiles: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def key(channel: str, ty: int, tx: int) -> str:
+        return "{}:{}:{}".format(channel, ty, tx)
+
+    @classmethod
+    def load(cls, path: str = STATE_JSON) -> "TileTracker":
+        tracker = cls()
+        if not os.path.isfile(path):
+            return tracker
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception:
+            return tracker
+        if int(data.get("tile_size", TILE_SIZE)) != tracker.tile_size:
+            return tracker
+        tracker.generation = int(data.get("generation", 0))
+        # "file" is manifest-only (older runs leaked it into the state).
+        tracker.tiles = {k: {f: v for f, v in entry.items() if f != "file"}
+                         for k, entry in data.get("tiles", {}).items()}
+        return tracker
+
+    def save(self, path: str = STATE_JSON) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "tile_size": self.tile_size,
+                    "generation": self.generation,
+                    "tiles": self.tiles,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, path)
+
+    def update(self,
+               fields: Dict[str, np.ndarray],
+               frame_index: int = 0) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Hash every tile of every channel and return (changed, manifest).
+
+        changed  : [{"channel", "ty", "tx", "x", "y", "width", "height",
+                     "generation", "hash", "data": uint8 tile}, ...]
+        manifest : JSON-safe summary of ALL tiles (coords + generations),
+                   the changed tile keys for this frame and the keys of
+                   tiles that fell off the grid ("removed").
+        """
+        self.generation += 1
+        changed: List[Dict[str, Any]] = []
+        seen = set()
+        t = self.tile_size
+        shapes: Dict[str, List[int]] = {}
+
+        for channel in CHANNELS:
+            if channel not in fields:
+                continue
+            q = quantize_field(fields[channel])
+            shapes[channel] = [int(q.shape[1]), int(q.shape[0])]
+
+            for ty, tx, view in iter_tiles(q, t):
+                k = self.key(channel, ty, tx)
+                seen.add(k)
+                digest = tile_hash(view)
+                prev = self.tiles.get(k)
+                if prev is not None and prev.get("hash") == digest:
+                    continue
+
+                entry = {
+                    "channel": channel,
+                    "ty": ty,
+                    "tx": tx,
+                    "x": tx * t,
+                    "y": ty * t,
+                    "width": int(view.shape[1]),
+                    "height": int(view.shape[0]),
+                    "generation": self.generation,
+                    "hash": digest,
+                }
+                self.tiles[k] = dict(entry)
+                entry["data"] = view
+                changed.append(entry)
+
+        # Tiles that fell off the grid (resolution shrank) are forgotten.
+        removed = sorted(k for k in self.tiles if k not in seen)
+        for k in removed:
+            del self.tiles[k]
+
+        manifest = {
+            "frameIndex": int(frame_index),
+            "generation": self.generation,
+            "tile_size": t,
+            "channels": shapes,
+            "changed": [self.key(c["channel"], c["ty"], c["tx"]) for c in changed],
+            "removed": removed,
+            "tiles": [dict(self.tiles[k]) for k in sorted(self.tiles)],
+        }
+        return changed, manifest
+
+
+def tile_filename(channel: str, ty: int, tx: int) -> str:
+    return "{}_{}_{}.bin".format(channel, ty, tx)
+
+
+def write_changed(changed: List[Dict[str, Any]], manifest: Dict[str, Any],
+                  out_dir: str = TILES_DIR) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    for c in changed:
+        path = os.path.join(out_dir, tile_filename(c["channel"], c["ty"], c["tx"]))
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(np.ascontiguousarray(c["data"]).tobytes())
+        os.replace(tmp, path)
+
+    for k in manifest.get("removed", ()):
+        channel, ty, tx = k.split(":")
+        try:
+            os.remove(os.path.join(out_dir, tile_filename(channel, int(ty), int(tx))))
+        except FileNotFoundError:
+            pass
+
+    # Copies: the entries may be the tracker's own (saved to state.json).
+    manifest = dict(manifest, tiles=[dict(t, file=tile_filename(t["channel"], t["ty"], t["tx"]))
+                                     for t in manifest["tiles"]])
+
+    path = os.path.join(out_dir, "manifest.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    sky_profiler.install("screen_tile_tracker")
+    layout = load_layout()
+    frame_index = int(layout.get("frameIndex", 0))
+    fields = build_colormap_fields(layout)
+
+    tracker = TileTracker.load(STATE_JSON)
+    changed, manifest = tracker.update(fields, frame_index)
+    write_changed(changed, manifest, TILES_DIR)
+    tracker.save(STATE_JSON)
+
+    total = len(manifest["tiles"])
+    sent = sum(int(c["data"].nbytes) for c in changed)
+    print("8XD screen tiles tracked:")
+    print("  Dir        :", TILES_DIR)
+    print("  Frame      :", frame_index, "generation", manifest["generation"])
+    print("  Tiles      : {} changed / {} total ({} bytes pushed)".format(
+        len(changed), total, sent))
+
+
+if __name__ == "__main__":
+    main()
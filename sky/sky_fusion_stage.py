@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+sky_fusion_stage.py — one writer for bpm_sync.json.
+
+Focus:
+
+  • numpy_core.py, mic_engine_8xd.py and the audiophile / lion engines
+    all wrote bpm_sync.json with different schemas, so whichever wrote
+    last won. This stage owns the file instead:
+       - evolution : engine/numpy_core.evolve14 (time-based phase)
+       - mic       : mic_engine_8xd features, computed in-process from a
+                     sounddevice stream, OR a legacy JSON file written by
+                     any of the old engines (--mic-json; point the engine
+                     at it with SKY_MIC_JSON, never at this stage's --out)
+  • Both sources are laid out in AXES14_KEYS order and blended per axis:
+
+       fused[k] = w[k] · mic[k] + (1 − w[k]) · evolution[k]
+
+    w comes from fusion_weights.json (reloaded when it changes) on top of
+    DEFAULT_MIC_WEIGHTS. A stale or missing mic falls back to w = 0.
+  • Exactly one publish per output tick (FixedStepClock, default 20 Hz).
+
+Unified schema (flat keys first — BeatVoiceBridge takes the first match):
+
+  energy, phase, superposition, lion     floats in [0, 1)
+  vec14, vec8                            lion-engine layout
+  spectrum, spectrum_bank                uint8 band levels as hex (filterbank.py)
+  timestamp, tick
+  axes14, disc_spin, bpm, bands, resolution   numpy_core layout
+  audio     {bpm, phase, energy, bass, mid, high}      NumpyFieldBridge
+  hypercube {a..g, z, y, x, w, v, u, t}                NumpyFieldBridge
+  sources   {mic, mic_age, weights}
+
+Usage:
+
+  sky-fusion                               # mic + evolution
+  sky-fusion --no-mic                      # evolution only
+  SKY_MIC_JSON=sky/lion.json sky-lion &
+  sky-fusion --mic-json sky/lion.json --hz 30
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from threading import Event, Lock
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from . import sky_profiler, sky_metrics, adaptive_blocks, decimator, filterbank
+from .engine import numpy_core
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+JSON_PATH = os.path.join(ROOT, "bpm_sync.json")
+WEIGHTS_JSON = os.path.join(ROOT, "fusion_weights.json")
+RESOLUTION_JSON = os.path.join(ROOT, "client", "resolution.json")
+
+AXES14_KEYS = ("x", "y", "z", "w", "v", "u", "t", "a", "b", "c", "d", "e", "f", "g")
+HYPERCUBE_KEYS = ("a", "b", "c", "d", "e", "f", "g", "z", "y", "x", "w", "v", "u", "t")
+UNIT_MAX = 0.999999999999
+
+# Bands (a..g) and t follow the mic closely. The spatial axes carry
+# mic_engine_8xd's spectral descriptors (centroid, spread, flatness,
+# rolloff, flux, zero-crossing rate), which jump block to block: blend
+# them half and half with the evolution.
+DEFAULT_MIC_WEIGHTS = {
+    "x": 0.5, "y": 0.5, "z": 0.5, "w": 0.5, "v": 0.5, "u": 0.5,
+    "t": 0.8,
+    "a": 0.8, "b": 0.8, "c": 0.8, "d": 0.8, "e": 0.8, "f": 0.8, "g": 0.8,
+}
+
+DEFAULT_HZ = 20.0
+MIC_STALE_SECONDS = 0.5
+
+
+def clamp_unit(v: np.ndarray) -> np.ndarray:
+    v = np.nan_to_num(np.asarray(v, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    return np.clip(v, 0.0, UNIT_MAX)
+
+
+# ---------------------------------------------------------------------------
+# Legacy schema adapters → (14,) float64 in AXES14_KEYS order (NaN = absent)
+# ---------------------------------------------------------------------------
+
+def from_numpy_core(payload: Dict[str, Any]) -> np.ndarray:
+    """
+    {"axes14": [14 floats], ...} — positional, already AXES14 order.
+    """
+    out = np.full(14, np.nan)
+    axes = payload.get("axes14") or []
+    n = min(14, len(axes))
+    out[:n] = np.asarray(axes[:n], dtype=np.float64)
+    return out
+
+
+def from_lion(payload: Dict[str, Any]) -> np.ndarray:
+    """
+    {"vec14": [x..t, a..g], "energy", ...} — lion engine.
+    """
+    out = np.full(14, np.nan)
+    vec = payload.get("vec14") or []
+    n = min(14, len(vec))
+    out[:n] = np.asarray(vec[:n], dtype=np.float64)
+    return out
+
+
+def is_mirror_fold(payload: Dict[str, Any]) -> bool:
+    """
+    numpy_audiophile_engine's vec14: vec8 + vec8[::-1][:6], tagged
+    "vec14_layout": "vec8_mirror" (untagged older writers are recognised
+    by the fold itself). Its entries are energy / phase / superposition
+    summaries, not the 14 axes, so it has no AXES14 adapter.
+    """
+    if payload.get("vec14_layout") == "vec8_mirror":
+        return True
+    vec14, vec8 = payload.get("vec14"), payload.get("vec8")
+    if not (isinstance(vec14, list) and isinstance(vec8, list) and len(vec14) == 14 and len(vec8) == 8):
+        return False
+    return vec14 == vec8 + vec8[::-1][:6] and len(set(vec8)) > 1
+
+
+def from_mic_flat(payload: Dict[str, Any]) -> np.ndarray:
+    """
+    {"time", "z", "y", ..., "a", ..., "g"} — mic_engine_8xd flat keys.
+    """
+    return np.array([float(payload[k]) if k in payload else np.nan for k in AXES14_KEYS])
+
+
+def adapt_legacy(payload: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    Detect which legacy writer produced payload and adapt it (None for
+    the audiophile engine's folded vec14, see is_mirror_fold).
+    """
+    if "vec14" in payload:
+        return None if is_mirror_fold(payload) else from_lion(payload)
+    if "axes14" in payload:
+        return from_numpy_core(payload)
+    if any(k in payload for k in AXES14_KEYS):
+        return from_mic_flat(payload)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+class MicFeed:
+    """
+    Latest mic vector + arrival time, written from the audio callback,
+    and the latest (spectrum hex, bank spec) when the source has one.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._vec: Optional[np.ndarray] = None
+        self._spectrum: Optional[Tuple[str, str]] = None
+        self._at = 0.0
+        self.stream = None
+
+    def push(self,
+             vec: np.ndarray,
+             at: Optional[float] = None,
+             spectrum: Optional[Tuple[str, str]] = None) -> None:
+        with self._lock:
+            self._vec = vec
+            self._spectrum = spectrum
+            self._at = time.monotonic() if at is None else at
+
+    def latest(self):
+        with self._lock:
+            return self._vec, self._at
+
+    def spectrum(self) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            return self._spectrum
+
+    def start_stream(self, metrics: Optional[sky_metrics.EngineMetrics] = None) -> None:
+        """
+        Open a sounddevice stream and run mic_engine_8xd's feature
+        extraction in its callback (imported lazily: sounddevice is
+        optional for --no-mic / --mic-json). metrics default to the
+        process-wide series.
+        """
+        metrics = metrics or sky_metrics.EngineMetrics()
+        import sounddevice as sd
+        from . import mic_engine_8xd as mic
+
+        factor = decimator.factor_from_env()
+        window = decimator.MultiRateWindow(mic.BLOCK_SIZE, 1, factor)
+        flux = mic.SpectralFlux()
+        bank = filterbank.bank_from_env(window.full.size, mic.SAMPLE_RATE)
+
+        def callback(indata, frames, time_info, status):
+            try:
+                full, low = window.push(indata)
+                feats = mic.compute_14_float_from_audio(full, mic.SAMPLE_RATE, flux, low, factor, bank)
+                spectrum_u8 = feats.pop("spectrum", None)
+                self.push(from_mic_flat(feats),
+                          spectrum=None if spectrum_u8 is None else (filterbank.encode(spectrum_u8), bank.spec))
+                metrics.ticks.inc()
+            except Exception:
+                pass
+
+        def open_stream(block, cb):
+            return sd.InputStream(
+                samplerate=mic.SAMPLE_RATE,
+                blocksize=block,
+                channels=1,
+                dtype="float32",
+                callback=cb,
+            )
+
+        self.controller = adaptive_blocks.BlockSizeController(
+            "mic", mic.SAMPLE_RATE, mic.BLOCK_SIZE, adaptive_blocks.latency_bounds_from_env())
+        self.stream = adaptive_blocks.AdaptiveStream(
+            open_stream,
+            sky_metrics.instrument_callback(sky_profiler.wrap(callback), metrics),
+            self.controller,
+        )
+        self.stream.start()
+
+    def stop(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class LegacyJsonFeed(MicFeed):
+    """
+    Mic vector polled from a file written by one of the legacy engines.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.cache = numpy_core.ResolutionCache(path)
+        self._last = None
+
+    def poll(self) -> None:
+        payload = self.cache.get()
+        if payload is None or payload is self._last or not isinstance(payload, dict):
+            return
+        self._last = payload
+        if "sources" in payload:
+            # A fusion frame (ours or another stage's), not mic input.
+            return
+        vec = adapt_legacy(payload)
+        if vec is not None:
+            spectrum = payload.get("spectrum")
+            self.push(vec, spectrum=(spectrum, str(payload.get("spectrum_bank", "")))
+                      if isinstance(spectrum, str) else None)
+
+
+# ---------------------------------------------------------------------------
+# Fusion
+# ---------------------------------------------------------------------------
+
+def weights_vector(overrides: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    w = dict(DEFAULT_MIC_WEIGHTS)
+    if isinstance(overrides, dict):
+        for k, v in overrides.items():
+            if k in w:
+                try:
+                    w[k] = float(v)
+                except (TypeError, ValueError):
+                    pass
+    return np.clip(np.array([w[k] for k in AXES14_KEYS], dtype=np.float64), 0.0, 1.0)
+
+
+def blend(evolution: np.ndarray, mic: Optional[np.ndarray], weights: np.ndarray) -> np.ndarray:
+    """
+    Per-axis blend; axes the mic did not provide (NaN) keep the evolution.
+    """
+    evo = np.asarray(evolution, dtype=np.float64)
+    if mic is None:
+        return clamp_unit(evo)
+    w = np.where(np.isnan(mic), 0.0, weights)
+    return clamp_unit(w * np.nan_to_num(mic) + (1.0 - w) * evo)
+
+
+def _vec8(energy, phase, superposition, movement, balance, halo, lion, energy_slow) -> List[float]:
+    v = np.array([energy, phase, superposition, movement, balance, halo, lion, energy_slow])
+    v = v / (np.linalg.norm(v) + 1e-12)
+    return clamp_unit(v * UNIT_MAX).tolist()
+
+
+def build_frame(fused: np.ndarray,
+                t: float,
+                tick: int,
+                resolution: Any,
+                sources: Dict[str, Any],
+                spectrum: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+    """
+    The unified payload. Flat lion keys come first in insertion order;
+    the mic's spectrum (when fresh) follows vec8.
+    """
+    ax = dict(zip(AXES14_KEYS, (float(v) for v in fused)))
+    phase_rad = numpy_core.PHASE_RATE * t
+    phase = (phase_rad % (2.0 * math.pi)) / (2.0 * math.pi)
+
+    energy = ax["x"]
+    superposition = ax["z"]
+    lion = float(clamp_unit(energy * 0.6 + ax["v"] * 0.4))
+    vec14 = [ax[k] for k in AXES14_KEYS]
+
+    frame = {
+        "energy": energy,
+        "phase": ax["y"],
+        "superposition": superposition,
+        "lion": lion,
+        "vec14": vec14,
+        "vec8": _vec8(energy, ax["y"], superposition, ax["v"], ax["u"], ax["t"], lion, ax["w"]),
+    }
+    if spectrum is not None:
+        frame["spectrum"], frame["spectrum_bank"] = spectrum
+    frame.update({
+        "timestamp": time.time(),
+        "tick": int(tick),
+        "axes14": vec14,
+        "disc_spin": float((numpy_core.SPIN_RATE * t) % 1.0),
+        "bpm": 0.0,
+        "bands": [ax["a"], ax["b"], ax["c"]],
+        "resolution": resolution,
+        "audio": {
+            "bpm": 0.0,
+            "phase": float(phase),
+            "energy": energy,
+            "bass": (ax["a"] + ax["b"]) / 2.0,
+            "mid": (ax["c"] + ax["d"] + ax["e"]) / 3.0,
+            "high": (ax["f"] + ax["g"]) / 2.0,
+        },
+        "hypercube": {k: ax[k] for k in HYPERCUBE_KEYS},
+        "sources": sources,
+    })
+    return frame
+
+
+def same_file(a: str, b: str) -> bool:
+    return os.path.realpath(os.path.expanduser(a)) == os.path.realpath(os.path.expanduser(b))
+
+
+def publish(frame: Dict[str, Any], path: str = JSON_PATH) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(frame, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class FusionStage:
+    def __init__(self,
+                 feed: Optional[MicFeed],
+                 out_path: str = JSON_PATH,
+                 hz: float = DEFAULT_HZ,
+                 weights_path: str = WEIGHTS_JSON,
+                 resolution_path: str = RESOLUTION_JSON,
+                 metrics: Optional[sky_metrics.EngineMetrics] = None):
+        self.feed = feed
+        self.metrics = metrics or sky_metrics.EngineMetrics()
+        self.out_path = out_path
+        self.clock = numpy_core.FixedStepClock(hz)
+        self.weights = numpy_core.ResolutionCache(weights_path)
+        self.resolution = numpy_core.ResolutionCache(resolution_path)
+        self.published = 0
+
+    def step(self) -> Dict[str, Any]:
+        t = self.clock.elapsed()
+        evo = np.asarray(numpy_core.evolve14(numpy_core.PHASE_RATE * t), dtype=np.float64)
+
+        mic, age = None, None
+        if self.feed is not None:
+            if isinstance(self.feed, LegacyJsonFeed):
+                self.feed.poll()
+            vec, at = self.feed.latest()
+            if vec is not None:
+                age = time.monotonic() - at
+                if age <= MIC_STALE_SECONDS:
+                    mic = vec
+
+        w = weights_vector(self.weights.get())
+        fused = blend(evo, mic, w)
+        sources = {
+            "mic": mic is not None,
+            "mic_age": None if age is None else round(age, 3),
+            "weights": [round(float(x), 3) for x in w],
+        }
+        spectrum = self.feed.spectrum() if mic is not None else None
+        frame = build_frame(fused, t, self.clock.tick, self.resolution.get(), sources, spectrum)
+        with self.metrics.publish_seconds.time():
+            publish(frame, self.out_path)
+        if age is not None:
+            self.metrics.frame_age.set(age)
+        self.published += 1
+        return frame
+
+    def run(self,
+            stop: Optional[Event] = None,
+            on_frame: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """
+        Publish on every tick until stop is set (forever when None);
+        on_frame receives each frame in-process (sky_supervisor.py).
+        """
+        meter = sky_metrics.RateMeter(1.0 / self.clock.dt, metrics=self.metrics)
+        dropped = self.clock.dropped
+        while stop is None or not stop.is_set():
+            sky_profiler.tick()
+            frame = self.step()
+            if on_frame is not None:
+                on_frame(frame)
+            meter.tick()
+            self.clock.wait()
+            if self.clock.dropped != dropped:
+                self.metrics.dropped_ticks.inc(self.clock.dropped - dropped)
+                dropped = self.clock.dropped
+
+
+def main() -> None:
+    sky_profiler.install("sky_fusion_stage")
+    sky_metrics.serve("sky_fusion_stage")
+    parser = argparse.ArgumentParser(description="Fuse mic features and the 14-axis evolution.")
+    parser.add_argument("--hz", type=float, default=DEFAULT_HZ)
+    parser.add_argument("--out", default=JSON_PATH)
+    parser.add_argument("--weights", default=WEIGHTS_JSON)
+    parser.add_argument("--no-mic", action="store_true", help="evolution only")
+    parser.add_argument("--mic-json", default=None,
+                        help="read mic features from a legacy engine's JSON instead of a stream")
+    args = parser.parse_args()
+    if args.mic_json and not args.no_mic and same_file(args.mic_json, args.out):
+        parser.error("--mic-json is the --out file; point the legacy engine at "
+                     "another path (SKY_MIC_JSON) and read that")
+
+    if args.no_mic:
+        feed = None
+    elif args.mic_json:
+        feed = LegacyJsonFeed(args.mic_json)
+    else:
+        feed = MicFeed()
+        try:
+            feed.start_stream()
+        except Exception as e:
+            sys.stderr.write("Mic unavailable ({}); running evolution only.\n".format(e))
+            feed = None
+
+    stage = FusionStage(feed, args.out, args.hz, args.weights)
+    print("8XD fusion stage")
+    print("  Out     :", args.out)
+    print("  Rate    : {:g} Hz".format(args.hz))
+    print("  Mic     :", "off" if feed is None else (args.mic_json or "sounddevice"))
+    print("  Weights :", args.weights)
+    try:
+        stage.run()
+    except KeyboardInterrupt:
+        print("\nStopping 8XD fusion stage ({} frames).".format(stage.published))
+    finally:
+        if feed is not None:
+            feed.stop()
+
+
+if __name__ == "__main__":
+    main()
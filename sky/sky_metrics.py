@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+sky_metrics.py — Prometheus text metrics for the engines (stdlib only).
+
+Focus:
+
+  • Counter / Gauge / Histogram with lock-free hot paths: every thread
+    updates its own cell (thread-local list), a scrape sums the cells.
+    The only lock is taken once per thread per metric, on first use.
+  • serve("<engine>") starts a loopback HTTP server on a daemon thread:
+
+       GET http://127.0.0.1:<port>/metrics   (text format 0.0.4)
+
+    Port: $SKY_METRICS_PORT, else DEFAULT_PORTS[engine]; "off" disables.
+    A busy port prints a warning and the engine keeps running.
+  • instrument_callback(fn) wraps a sounddevice callback: duration goes to
+    sky_callback_duration_seconds, a non-empty status counts as an xrun.
+  • RateMeter(target_hz).tick() in a loop keeps sky_ticks_total,
+    sky_tick_rate_hz and sky_drift_percent current.
+  • Collectors (zero-arg callables returning {name: value}) are sampled at
+    scrape time, e.g. the geom frame cache hit / miss counters.
+  • metric.labels(engine="omega_phi") is a child series of the same name
+    with that label added. EngineMetrics("<engine>") bundles the children
+    of the per-engine metrics below, so engines hosted in one process
+    (sky_supervisor.py) each report their own ticks, rate and drift
+    instead of summing into / overwriting the process-wide series; a
+    standalone engine uses EngineMetrics() (the unlabelled series).
+
+Shared metric names:
+
+  sky_callback_duration_seconds   histogram  audio callback wall time
+  sky_xruns_total                 counter    callbacks with over/underflow
+  sky_publish_duration_seconds    histogram  bpm_sync.json write latency
+  sky_frame_age_seconds           gauge      age of the newest input frame
+  sky_ticks_total                 counter    engine loop / rail ticks
+  sky_tick_rate_hz                gauge      measured tick rate
+  sky_drift_percent               gauge      tick rate vs target
+  sky_dropped_ticks_total         counter    ticks skipped by the scheduler
+
+Usage:
+
+  SKY_METRICS_PORT=9470 sky-fusion
+  curl -s 127.0.0.1:9470/metrics
+"""
+
+import bisect
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+ENV_PORT = "SKY_METRICS_PORT"
+HOST = "127.0.0.1"
+
+DEFAULT_PORTS = {
+    "sky_supervisor": 9460,
+    "mic_engine_8xd": 9461,
+    "numpy_audiophile_engine": 9462,
+    "numpy_lion_engine": 9463,
+    "numpy_core": 9464,
+    "sky_fusion_stage": 9465,
+    "omega_phi_8888_engine": 9466,
+    "omega_phi_flame_engine": 9467,
+}
+
+# Seconds: 50 µs … 1 s, dense around audio block times (5–50 ms).
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if v == -math.inf:
+        return "-Inf"
+    if v != v:
+        return "NaN"
+    return repr(float(v))
+
+
+def _labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    items = dict(labels)
+    if extra:
+        items.update(extra)
+    if not items:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                    for k, v in sorted(items.items()))
+    return "{" + body + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._local = threading.local()
+        self._cells: List[list] = []
+        self._reg_lock = threading.Lock()
+        self.label_values: Dict[str, str] = {}
+        self._children: Dict[Tuple[Tuple[str, str], ...], "_Metric"] = {}
+
+    def _new_cell(self) -> list:
+        raise NotImplementedError
+
+    def _spawn(self) -> "_Metric":
+        return type(self)(self.name, self.help)
+
+    def _used(self) -> bool:
+        return bool(self._cells)
+
+    def labels(self, **labels: str) -> "_Metric":
+        """
+        Child series with these labels (the same child for the same labels).
+        """
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._reg_lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._spawn()
+                child.label_values = dict(key)
+                self._children[key] = child
+            return child
+
+    def _cell(self) -> list:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._new_cell()
+            self._local.cell = cell
+            with self._reg_lock:
+                self._cells.append(cell)
+        return cell
+
+    def samples(self, labels: Dict[str, str]) -> List[str]:
+        raise NotImplementedError
+
+    def render(self, labels: Dict[str, str]) -> List[str]:
+        lines = ["# HELP {} {}".format(self.name, self.help),
+                 "# TYPE {} {}".format(self.name, self.kind)]
+        # The unlabelled series is left out once children carry the data.
+        if self._used() or not self._children:
+            lines.extend(self.samples(labels))
+        with self._reg_lock:
+            children = sorted(self._children.items())
+        for _, child in children:
+            lines.extend(child.samples(dict(labels, **child.label_values)))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_cell(self) -> list:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cell()[0] += amount
+
+    def value(self) -> float:
+        return float(sum(c[0] for c in list(self._cells)))
+
+    def samples(self, labels):
+        return ["{}{} {}".format(self.name, _labels(labels), _fmt(self.value()))]
+
+
+class Gauge(_Metric):
+    """
+    Last value written by any thread (a single attribute store).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._value = 0.0
+        self._set = False
+
+    def _used(self) -> bool:
+        return self._set
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+        self._set = True
+
+    def value(self) -> float:
+        return self._value
+
+    def samples(self, labels):
+        return ["{}{} {}".format(self.name, _labels(labels), _fmt(self._value))]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _spawn(self) -> "Histogram":
+        return Histogram(self.name, self.help, self.buckets)
+
+    def _new_cell(self) -> list:
+        # [count per bucket..., +Inf bucket, sum]
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float) -> None:
+        cell = self._cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self):
+        return _Timer(self)
+
+    def samples(self, labels):
+        n = len(self.buckets) + 1
+        counts = [0] * n
+        total = 0.0
+        for cell in list(self._cells):
+            for i in range(n):
+                counts[i] += cell[i]
+            total += cell[-1]
+        out = []
+        cum = 0
+        for bound, c in zip(self.buckets + (math.inf,), counts):
+            cum += c
+            out.append("{}_bucket{} {}".format(self.name, _labels(labels, {"le": _fmt(bound)}), cum))
+        out.append("{}_sum{} {}".format(self.name, _labels(labels), _fmt(total)))
+        out.append("{}_count{} {}".format(self.name, _labels(labels), cum))
+        return out
+
+
+class _Timer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist: Histogram):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.collectors: List[Callable[[], Dict[str, float]]] = []
+        self.labels: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kw):
+        with self._lock:
+            m = self.metrics.get(name)
+            if m is None:
+                m = cls(name, help_text, **kw)
+                self.metrics[name] = m
+            elif not isinstance(m, cls):
+                raise ValueError("metric {} already registered as {}".format(name, m.kind))
+            return m
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str,
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, fn: Callable[[], Dict[str, float]]) -> None:
+        self.collectors.append(fn)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render(self.labels))
+        for fn in list(self.collectors):
+            try:
+                values = fn()
+            except Exception:
+                continue
+            for name, value in sorted(values.items()):
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.append("# TYPE {} {}".format(name, kind))
+                lines.append("{}{} {}".format(name, _labels(self.labels), _fmt(value)))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CALLBACK_SECONDS = REGISTRY.histogram("sky_callback_duration_seconds", "Audio callback wall time.")
+XRUNS = REGISTRY.counter("sky_xruns_total", "Audio callbacks reporting input overflow / output underflow.")
+PUBLISH_SECONDS = REGISTRY.histogram("sky_publish_duration_seconds", "Time to write one bpm_sync.json frame.")
+FRAME_AGE = REGISTRY.gauge("sky_frame_age_seconds", "Age of the newest input frame when published.")
+TICKS = REGISTRY.counter("sky_ticks_total", "Engine loop / timing rail ticks.")
+TICK_RATE = REGISTRY.gauge("sky_tick_rate_hz", "Measured tick rate.")
+DRIFT = REGISTRY.gauge("sky_drift_percent", "Tick rate deviation from the target, in percent.")
+DROPPED_TICKS = REGISTRY.counter("sky_dropped_ticks_total", "Ticks skipped by the fixed-step scheduler.")
+
+
+class EngineMetrics:
+    """
+    One engine's view of the shared metric names: the unlabelled series
+    when engine is None, else their engine="<engine>" children.
+    """
+
+    def __init__(self, engine: Optional[str] = None):
+        self.engine = engine
+
+        def pick(metric):
+            return metric if engine is None else metric.labels(engine=engine)
+
+        self.callback_seconds = pick(CALLBACK_SECONDS)
+        self.xruns = pick(XRUNS)
+        self.publish_seconds = pick(PUBLISH_SECONDS)
+        self.frame_age = pick(FRAME_AGE)
+        self.ticks = pick(TICKS)
+        self.tick_rate = pick(TICK_RATE)
+        self.drift = pick(DRIFT)
+        self.dropped_ticks = pick(DROPPED_TICKS)
+
+
+class RateMeter:
+    """
+    Counts loop ticks and refreshes sky_tick_rate_hz / sky_drift_percent
+    once per window. One meter per loop (not shared between threads).
+    """
+
+    def __init__(self, target_hz: Optional[float] = None, window: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 metrics: Optional[EngineMetrics] = None):
+        self.target_hz = target_hz
+        self.window = float(window)
+        self.clock = clock
+        self.metrics = metrics or EngineMetrics()
+        self._t0: Optional[float] = None
+        self._n = 0
+
+    def tick(self, n: int = 1) -> None:
+        m = self.metrics
+        m.ticks.inc(n)
+        now = self.clock()
+        if self._t0 is None:
+            # Rate counts intervals, so the window opens at the first tick.
+            self._t0 = now
+            return
+        self._n += n
+        span = now - self._t0
+        if span >= self.window:
+            rate = self._n / span
+            m.tick_rate.set(rate)
+            if self.target_hz:
+                m.drift.set((rate - self.target_hz) / self.target_hz * 100.0)
+            self._t0 = now
+            self._n = 0
+
+
+def instrument_callback(fn: Callable, metrics: Optional[EngineMetrics] = None) -> Callable:
+    """
+    Time a sounddevice-style callback(data, frames, time_info, status).
+    """
+    m = metrics or EngineMetrics()
+    xruns, seconds = m.xruns, m.callback_seconds
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        if len(args) >= 4 and args[3]:
+            xruns.inc()
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            seconds.observe(time.perf_counter() - t0)
+    return timed
+
+
+def _handler_class(registry: Registry):
+    # http.server is only imported once an endpoint is actually served.
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+_SERVER = None
+
+
+def serve(engine: str, port: Optional[int] = None):
+    """
+    Start the /metrics endpoint for this process (idempotent).
+    Returns the ThreadingHTTPServer, or None when disabled / not bound.
+    """
+    global _SERVER
+    from http.server import ThreadingHTTPServer
+    if _SERVER is not None:
+        return _SERVER
+    REGISTRY.labels["engine"] = engine
+
+    if port is None:
+        env = os.environ.get(ENV_PORT, "").strip().lower()
+        if env in ("off", "none", "-1"):
+            return None
+        try:
+            port = int(env) if env else DEFAULT_PORTS.get(engine, 0)
+        except ValueError:
+            port = DEFAULT_PORTS.get(engine, 0)
+
+    try:
+        server = ThreadingHTTPServer((HOST, int(port)), _handler_class(REGISTRY))
+    except OSError as e:
+        sys.stderr.write("[metrics] {}: cannot bind {}:{} ({})\n".format(engine, HOST, port, e))
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="sky-metrics", daemon=True).start()
+    _SERVER = server
+    print("[metrics] {} → http://{}:{}/metrics".format(engine, HOST, server.server_address[1]))
+    return server
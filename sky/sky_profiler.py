@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+sky_profiler.py — opt-in cProfile + tracemalloc snapshots for the engines.
+
+Focus:
+
+  • Off unless SKY_PROFILE_DIR is set. When off, install() returns None,
+    wrap() hands back the original function and tick() is one global
+    check — no profiler, no tracing, no thread.
+  • When on, every main() that calls install("<engine>") gets:
+       - a cProfile profile of the calling (main) thread, cut into
+         windows at tick() calls in its hot loop,
+       - per-thread profiles for audio callbacks passed through wrap(),
+       - tracemalloc tracing (SKY_PROFILE_FRAMES frames per trace),
+       - a background thread that every SKY_PROFILE_INTERVAL seconds
+         writes one merged .pstats and one .tracemalloc snapshot, keeping
+         the newest SKY_PROFILE_KEEP of each (older ones are deleted).
+  • Profiles are handed over lock-free: the dumper bumps a generation
+    number and each thread retires its own window on its next call.
+    On Python 3.12+ cProfile is process-wide, so a window started on the
+    main thread already sees callbacks; wrapped calls then run unprofiled.
+
+Environment:
+
+  SKY_PROFILE_DIR        output root (snapshots go to <dir>/<engine>/)
+  SKY_PROFILE_INTERVAL   seconds between snapshots   (default 60)
+  SKY_PROFILE_KEEP       snapshots kept per kind     (default 12)
+  SKY_PROFILE_FRAMES     tracemalloc traceback depth (default 8)
+
+Usage:
+
+  SKY_PROFILE_DIR=/tmp/skyprof sky-fusion
+  sky-profile report /tmp/skyprof/sky_fusion_stage --top 20
+"""
+
+import atexit
+import functools
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+ENV_DIR = "SKY_PROFILE_DIR"
+ENV_INTERVAL = "SKY_PROFILE_INTERVAL"
+ENV_KEEP = "SKY_PROFILE_KEEP"
+ENV_FRAMES = "SKY_PROFILE_FRAMES"
+
+# cProfile / pstats / tracemalloc / glob are imported only once profiling
+# is on (or a report is asked for): importing this module stays cheap.
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_KEEP = 12
+DEFAULT_FRAMES = 8
+
+_SESSION = None
+
+
+def _env_number(key: str, default, cast):
+    try:
+        return cast(os.environ.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ProfileSession:
+    """
+    Profiles + allocation snapshots for one engine process.
+    """
+
+    def __init__(self,
+                 name: str,
+                 out_dir: str,
+                 interval: float = DEFAULT_INTERVAL,
+                 keep: int = DEFAULT_KEEP,
+                 frames: int = DEFAULT_FRAMES):
+        self.name = name
+        self.out_dir = os.path.join(out_dir, name)
+        self.interval = max(1.0, float(interval))
+        self.keep = max(1, int(keep))
+        self.frames = max(1, int(frames))
+        self.generation = 0
+        self.seq = 0
+        self.skipped = 0
+        self._retired = deque()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._dump_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- per-thread windows -------------------------------------------------
+
+    def _window(self) -> "cProfile.Profile":
+        """
+        This thread's current profile, replaced when the generation moved.
+        """
+        import cProfile
+        loc = self._local
+        prof = getattr(loc, "prof", None)
+        if prof is None or loc.gen != self.generation:
+            if prof is not None:
+                self._retired.append(prof)
+            prof = cProfile.Profile()
+            loc.prof = prof
+            loc.gen = self.generation
+        return prof
+
+    def tick(self) -> None:
+        """
+        Continuous profiling of the calling thread, rotated at window ends.
+        """
+        loc = self._local
+        if getattr(loc, "running", False) and loc.gen == self.generation:
+            return
+        if getattr(loc, "running", False):
+            loc.prof.disable()
+            loc.running = False
+        prof = self._window()
+        try:
+            prof.enable()
+            loc.running = True
+        except ValueError:
+            # Another profiler is active (process-wide on 3.12+).
+            self.skipped += 1
+
+    def wrap(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def profiled(*args, **kwargs):
+            loc = self._local
+            if getattr(loc, "running", False):
+                return fn(*args, **kwargs)
+            prof = self._window()
+            try:
+                prof.enable()
+            except ValueError:
+                self.skipped += 1
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.disable()
+        return profiled
+
+    # -- snapshots ----------------------------------------------------------
+
+    def start(self) -> None:
+        import tracemalloc
+        os.makedirs(self.out_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.tick()
+        self._thread = threading.Thread(target=self._loop, name="sky-profiler", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.generation += 1
+            # Give hot threads one beat to hand their windows over.
+            time.sleep(min(1.0, self.interval / 10.0))
+            self.dump()
+
+    def dump(self) -> None:
+        import pstats
+        import tracemalloc
+        with self._dump_lock:
+            profiles = []
+            while self._retired:
+                profiles.append(self._retired.popleft())
+
+            self.seq += 1
+            stem = os.path.join(self.out_dir, "{}.{}.{:06d}".format(self.name, os.getpid(), self.seq))
+
+            stats = None
+            for prof in profiles:
+                prof.create_stats()
+                if not prof.stats:
+                    continue
+                if stats is None:
+                    stats = pstats.Stats(prof)
+                else:
+                    stats.add(prof)
+            if stats is not None:
+                stats.dump_stats(stem + ".pstats")
+
+            if tracemalloc.is_tracing():
+                tracemalloc.take_snapshot().dump(stem + ".tracemalloc")
+
+            for ext in (".pstats", ".tracemalloc"):
+                self._rotate(ext)
+
+    def _rotate(self, ext: str) -> None:
+        import glob
+        files = sorted(glob.glob(os.path.join(self.out_dir, "*" + ext)), key=os.path.getmtime)
+        for path in files[:-self.keep]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        loc = self._local
+        if getattr(loc, "running", False):
+            loc.prof.disable()
+            loc.running = False
+            self._retired.append(loc.prof)
+            loc.prof = None
+        self.dump()
+
+
+def install(name: str) -> Optional[ProfileSession]:
+    """
+    Start profiling this process if SKY_PROFILE_DIR is set.
+    """
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    out_dir = os.environ.get(ENV_DIR, "").strip()
+    if not out_dir:
+        return None
+    session = ProfileSession(
+        name,
+        os.path.expanduser(out_dir),
+        interval=_env_number(ENV_INTERVAL, DEFAULT_INTERVAL, float),
+        keep=_env_number(ENV_KEEP, DEFAULT_KEEP, int),
+        frames=_env_number(ENV_FRAMES, DEFAULT_FRAMES, int),
+    )
+    session.start()
+    _SESSION = session
+    print("[profile] {} → {} (every {:g}s, keep {})".format(
+        name, session.out_dir, session.interval, session.keep))
+    return session
+
+
+def wrap(fn: Callable) -> Callable:
+    """
+    Profile fn (e.g. an audio callback) on whatever thread calls it.
+    Returns fn itself when profiling is off.
+    """
+    if _SESSION is None:
+        return fn
+    return _SESSION.wrap(fn)
+
+
+def tick() -> None:
+    """
+    Mark a hot-loop iteration on the calling thread.
+    """
+    s = _SESSION
+    if s is not None:
+        s.tick()
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def _without_overhead(snapshot: "tracemalloc.Snapshot") -> "tracemalloc.Snapshot":
+    """
+    Drop allocations made by the profiler itself and by the import system.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+
+
+def report(path: str, top: int = 25, sort: str = "cumulative") -> None:
+    import glob
+    import pstats
+    import tracemalloc
+    prof_files = sorted(glob.glob(os.path.join(path, "**", "*.pstats"), recursive=True),
+                        key=os.path.getmtime)
+    snap_files = sorted(glob.glob(os.path.join(path, "**", "*.tracemalloc"), recursive=True),
+                        key=os.path.getmtime)
+
+    print("8XD profile report")
+    print("  Dir        :", path)
+    print("  Profiles   :", len(prof_files))
+    print("  Snapshots  :", len(snap_files))
+
+    if prof_files:
+        stats = pstats.Stats(prof_files[0])
+        for p in prof_files[1:]:
+            stats.add(p)
+        print()
+        print("Top {} functions by {} time (all profiles):".format(top, sort))
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+    if snap_files:
+        last = _without_overhead(tracemalloc.Snapshot.load(snap_files[-1]))
+        print("Top {} allocation sites (latest snapshot):".format(top))
+        for stat in last.statistics("lineno")[:top]:
+            print("  ", stat)
+
+        if len(snap_files) > 1:
+            first = _without_overhead(tracemalloc.Snapshot.load(snap_files[0]))
+            print()
+            print("Top {} allocation growth (first → latest snapshot):".format(top))
+            for stat in last.compare_to(first, "lineno")[:top]:
+                print("  ", stat)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize sky profiler snapshots.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rep = sub.add_parser("report", help="top functions + allocation sites across snapshots")
+    rep.add_argument("path", nargs="?", default=os.environ.get(ENV_DIR, "."))
+    rep.add_argument("--top", type=int, default=25)
+    rep.add_argument("--sort", default="cumulative",
+                     help="pstats sort key: cumulative, tottime, ncalls, ...")
+    args = parser.parse_args(argv)
+    if args.cmd == "report":
+        report(os.path.expanduser(args.path), args.top, args.sort)
+
+
+if __name__ == "__main__":
+    main()
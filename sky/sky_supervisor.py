@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+sky_supervisor.py — one process hosting the sky engines as threads.
+
+Focus:
+
+  • Every engine used to be its own interpreter (own NumPy import, own
+    startup) talking to the others through JSON files in the sky dir.
+    The supervisor imports only the enabled engines and runs each one on
+    a thread, handing NumPy state over in memory:
+       - mic         : sounddevice stream → MicFeed (shared object)
+       - fusion      : FusionStage reading that MicFeed directly; still
+                       writes bpm_sync.json for the Java bridges
+       - geom        : build_geom_frame_cached for the current player
+       - screen      : quadrant layout → colormap fields → dirty tiles,
+                       recomputed only when the resolution / request change;
+                       a ResolutionGovernor keeps each frame under budget_ms
+       - omega_phi   : Phi 8888 Hz audio engine + timing rail
+       - omega_flame : 4-flame noise bed + status rail
+    The newest output of each stage is on SharedState (topic → value,
+    version, time) for the stages after it.
+  • Per-engine restart: a crashed engine is stopped, then restarted after
+    an exponential backoff (reset once it has run healthy_seconds).
+  • Each engine reports under its own engine="<name>" label on the
+    supervisor's /metrics (sky_metrics.EngineMetrics), so ticks, tick rate
+    and drift of the hosted engines stay apart.
+  • SIGINT / SIGTERM set one stop event; every engine leaves its loop,
+    closes its streams and the supervisor joins the threads.
+
+Config (supervisor.json next to this file, merged over DEFAULT_CONFIG):
+
+  {
+    "root": ".",                              # base for relative paths
+    "engines": {"fusion": {"enabled": true, "hz": 20, ...}, ...},
+    "restart": {"backoff": 0.5, "max_backoff": 30.0,
+                "healthy_seconds": 60.0, "max_restarts": 0}
+  }
+
+Usage:
+
+  sky-supervisor                                  # mic + fusion
+  sky-supervisor --enable geom screen --disable mic
+  python3 -m sky.sky_supervisor --list
+"""
+
+import argparse
+import copy
+import importlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import sky_profiler, sky_metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CONFIG_JSON = os.path.join(ROOT, "supervisor.json")
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "root": ROOT,
+    "engines": {
+        "mic": {"enabled": True},
+        "fusion": {
+            "enabled": True,
+            "hz": 20.0,
+            "out": "bpm_sync.json",
+            "weights": "fusion_weights.json",
+            "resolution": "client/resolution.json",
+            "mic_json": None,
+        },
+        "geom": {
+            "enabled": False,
+            "hz": 20.0,
+            "out": "geom_frame.json",
+            "screen": [1920, 1080],
+            "player": {"x": 0.0, "y": 64.0, "z": 369.0, "yaw": 45.0, "pitch": -20.0,
+                       "vx": 0.0, "vy": 0.0, "vz": 0.0},
+        },
+        "screen": {
+            "enabled": False,
+            "hz": 2.0,
+            "resolution": "../player_resolution.json",
+            "request": "../screen_quadrant_request.json",
+            "tiles": "screen_tiles",
+            "budget_ms": 250.0,
+        },
+        "omega_phi": {"enabled": False, "session": "../omega_numpy_container/omega_session_omega.txt"},
+        "omega_flame": {"enabled": False, "session": "../omega_numpy_container/omega_session_omega.txt"},
+    },
+    "restart": {
+        "backoff": 0.5,
+        "max_backoff": 30.0,
+        "healthy_seconds": 60.0,
+        "max_restarts": 0,
+    },
+}
+
+RESTARTS = sky_metrics.REGISTRY.counter("sky_engine_restarts_total", "Engine threads restarted after a crash.")
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+def _merge(base: Dict[str, Any], over: Dict[str, Any]) -> Dict[str, Any]:
+    out = copy.deepcopy(base)
+    for k, v in over.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            out[k] = _merge(out[k], v)
+        else:
+            out[k] = v
+    return out
+
+
+def load_config(path: str = CONFIG_JSON) -> Dict[str, Any]:
+    """
+    DEFAULT_CONFIG with supervisor.json (if present) merged on top;
+    "root" is resolved relative to the config file.
+    """
+    cfg = copy.deepcopy(DEFAULT_CONFIG)
+    if os.path.isfile(path):
+        with open(path, "r") as f:
+            cfg = _merge(cfg, json.load(f))
+        cfg["root"] = os.path.join(os.path.dirname(os.path.abspath(path)), cfg.get("root") or ".")
+    cfg["root"] = os.path.abspath(os.path.expanduser(os.environ.get("SKY_ROOT") or cfg["root"]))
+    return cfg
+
+
+class Context:
+    """
+    What every hosted engine shares: config root, state board, stop event.
+    """
+
+    def __init__(self, root: str, state: "SharedState", stop: threading.Event):
+        self.root = root
+        self.state = state
+        self.stop = stop
+
+    def path(self, p: Optional[str]) -> Optional[str]:
+        if p is None:
+            return None
+        p = os.path.expanduser(p)
+        return p if os.path.isabs(p) else os.path.normpath(os.path.join(self.root, p))
+
+
+# ---------------------------------------------------------------------------
+# Shared in-memory state
+# ---------------------------------------------------------------------------
+
+class SharedState:
+    """
+    Latest value per topic. Values are handed over by reference (NumPy
+    arrays are not copied): writers publish new objects instead of
+    mutating old ones.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._topics: Dict[str, Tuple[Any, int, float]] = {}
+
+    def put(self, topic: str, value: Any) -> int:
+        with self._cond:
+            _, version, _ = self._topics.get(topic, (None, 0, 0.0))
+            version += 1
+            self._topics[topic] = (value, version, time.monotonic())
+            self._cond.notify_all()
+            return version
+
+    def get(self, topic: str) -> Tuple[Any, int, float]:
+        """
+        (value, version, monotonic time); (None, 0, 0.0) when never put.
+        """
+        with self._cond:
+            return self._topics.get(topic, (None, 0, 0.0))
+
+    def wait(self, topic: str, after: int, timeout: Optional[float] = None) -> Tuple[Any, int, float]:
+        """
+        Block until topic's version is past `after` (or timeout).
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._topics.get(topic, (None, 0, 0.0))[1] > after, timeout)
+            return self._topics.get(topic, (None, 0, 0.0))
+
+    def topics(self) -> List[str]:
+        with self._cond:
+            return sorted(self._topics)
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+
+class Engine:
+    """
+    One hosted engine. start() acquires resources, run() loops until
+    ctx.stop is set (raising on failure), stop() releases resources and
+    must be safe to call after a failed start(). metrics are this engine's
+    engine="<name>" series, handed to whatever loop or callback it runs.
+    """
+
+    name = "engine"
+
+    def __init__(self, ctx: Context, opts: Dict[str, Any]):
+        self.ctx = ctx
+        self.opts = opts
+        self.metrics = sky_metrics.EngineMetrics(self.name)
+
+    def start(self) -> None:
+        pass
+
+    def run(self) -> None:
+        self.ctx.stop.wait()
+
+    def stop(self) -> None:
+        pass
+
+
+class MicEngine(Engine):
+    name = "mic"
+
+    def start(self) -> None:
+        fusion = importlib.import_module("sky.sky_fusion_stage")
+        feed, _, _ = self.ctx.state.get("mic_feed")
+        if feed is None:
+            feed = fusion.MicFeed()
+            self.ctx.state.put("mic_feed", feed)
+        self.feed = feed
+        self.feed.start_stream(self.metrics)
+
+    def stop(self) -> None:
+        feed = getattr(self, "feed", None)
+        if feed is not None:
+            feed.stop()
+
+
+class FusionEngine(Engine):
+    name = "fusion"
+
+    def start(self) -> None:
+        fusion = importlib.import_module("sky.sky_fusion_stage")
+        o = self.opts
+        out = self.ctx.path(o.get("out") or fusion.JSON_PATH)
+        if o.get("mic_json"):
+            mic_json = self.ctx.path(o["mic_json"])
+            if fusion.same_file(mic_json, out):
+                raise ValueError("fusion mic_json {} is its own out file".format(mic_json))
+            feed = fusion.LegacyJsonFeed(mic_json)
+        else:
+            # Same object the mic engine pushes into (created here if the
+            # fusion stage starts first; stays silent without a mic).
+            feed, _, _ = self.ctx.state.get("mic_feed")
+            if feed is None:
+                feed = fusion.MicFeed()
+                self.ctx.state.put("mic_feed", feed)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        self.stage = fusion.FusionStage(
+            feed,
+            out,
+            float(o.get("hz", fusion.DEFAULT_HZ)),
+            self.ctx.path(o.get("weights") or fusion.WEIGHTS_JSON),
+            self.ctx.path(o.get("resolution") or fusion.RESOLUTION_JSON),
+            metrics=self.metrics,
+        )
+
+    def run(self) -> None:
+        self.stage.run(self.ctx.stop, on_frame=lambda frame: self.ctx.state.put("frame", frame))
+
+
+class GeomEngine(Engine):
+    name = "geom"
+
+    def start(self) -> None:
+        geom = importlib.import_module("sky.geom_backend")
+        self.geom = geom
+        self.out = self.ctx.path(self.opts.get("out"))
+        w, h = self.opts.get("screen") or (1920, 1080)
+        self.size = (int(w), int(h))
+        self.default_player = geom.PlayerState(**self.opts.get("player", {}))
+
+    def run(self) -> None:
+        numpy_core = importlib.import_module("sky.engine.numpy_core")
+        clock = numpy_core.FixedStepClock(float(self.opts.get("hz", 20.0)))
+        meter = sky_metrics.RateMeter(1.0 / clock.dt, metrics=self.metrics)
+        cache = self.geom._GEOM_CACHE
+        last_key = None
+        while not self.ctx.stop.is_set():
+            sky_profiler.tick()
+            # Another stage (or a future server bridge) may put "player".
+            player, _, _ = self.ctx.state.get("player")
+            if player is None:
+                player = self.default_player
+            elif isinstance(player, dict):
+                player = self.geom.PlayerState(**player)
+            frame = cache.get(player, *self.size)
+            self.ctx.state.put("geom", frame)
+            key = cache.key(player, *self.size)
+            if self.out and key != last_key:
+                with self.metrics.publish_seconds.time():
+                    write_json_atomic(self.out, frame)
+                last_key = key
+            meter.tick()
+            clock.wait()
+
+
+class ScreenEngine(Engine):
+    name = "screen"
+
+    def start(self) -> None:
+        self.mapper = importlib.import_module("sky.screen_quadrant_mapper")
+        self.colormaps = importlib.import_module("sky.screen_colormap_generator")
+        self.tiles = importlib.import_module("sky.screen_tile_tracker")
+        governor = importlib.import_module("sky.resolution_governor")
+        self.governor = governor.ResolutionGovernor(budget_ms=float(self.opts.get("budget_ms", 250.0)))
+        numpy_core = importlib.import_module("sky.engine.numpy_core")
+        self.clock = numpy_core.FixedStepClock(float(self.opts.get("hz", 2.0)))
+        self.res = numpy_core.ResolutionCache(self.ctx.path(self.opts.get("resolution")))
+        self.req = numpy_core.ResolutionCache(self.ctx.path(self.opts.get("request")))
+        self.tiles_dir = self.ctx.path(self.opts.get("tiles"))
+        self.state_json = os.path.join(self.tiles_dir, "state.json")
+        self.tracker = self.tiles.TileTracker.load(self.state_json)
+
+    def run(self) -> None:
+        meter = sky_metrics.RateMeter(1.0 / self.clock.dt, metrics=self.metrics)
+        last = None
+        while not self.ctx.stop.is_set():
+            sky_profiler.tick()
+            res = self.res.get() or {"width": 1920, "height": 1080, "frameIndex": 0}
+            req = self.req.get() or {"player": "Unknown", "uuid": "", "frameIndex": 0}
+            key = (json.dumps(res, sort_keys=True), json.dumps(req, sort_keys=True), self.governor.scale)
+            if key != last:
+                t0 = time.perf_counter()
+                layout = self.mapper.build_layout(res, req, self.governor)
+                fields = self.colormaps.build_colormap_fields(layout)
+                changed, manifest = self.tracker.update(fields, int(layout.get("frameIndex", 0)))
+                self.governor.observe((time.perf_counter() - t0) * 1000.0)
+                with self.metrics.publish_seconds.time():
+                    self.tiles.write_changed(changed, manifest, self.tiles_dir)
+                    self.tracker.save(self.state_json)
+                self.ctx.state.put("screen", {"layout": layout, "fields": fields})
+                last = key
+            meter.tick()
+            self.clock.wait()
+
+
+class OmegaPhiEngine(Engine):
+    name = "omega_phi"
+
+    def start(self) -> None:
+        phi = importlib.import_module("omega_numpy_container.omega_phi_8888_engine")
+        self.phi = phi
+        self.session = phi.load_session(self.ctx.path(self.opts.get("session")) or phi.SESSION_FILE)
+        self.audio = phi.OmegaAudioEngine(phi.SAMPLE_RATE, phi.TARGET_HZ, metrics=self.metrics)
+
+    def run(self) -> None:
+        self.phi.run_rail(self.session, self.audio, stop=self.ctx.stop, metrics=self.metrics)
+
+    def stop(self) -> None:
+        audio = getattr(self, "audio", None)
+        if audio is not None:
+            audio.stop()
+
+
+class OmegaFlameEngine(Engine):
+    name = "omega_flame"
+
+    def start(self) -> None:
+        flame = importlib.import_module("omega_numpy_container.omega_phi_flame_engine")
+        self.flame = flame
+        session = flame.load_session(self.ctx.path(self.opts.get("session")))
+        self.bed = flame.OmegaFourFlameBed(session)
+        self.stream = None
+        if flame.load_sounddevice() is not None:
+            self.stream = flame.open_stream(self.bed, self.metrics)
+            self.stream.start()
+
+    def run(self) -> None:
+        self.flame.status_loop(self.bed, timing_only=self.stream is None, stop=self.ctx.stop,
+                               metrics=self.metrics)
+
+    def stop(self) -> None:
+        stream = getattr(self, "stream", None)
+        if stream is not None:
+            stream.stop()
+            stream.close()
+            self.stream = None
+
+
+ENGINES: Dict[str, Callable[[Context, Dict[str, Any]], Engine]] = {
+    cls.name: cls
+    for cls in (MicEngine, FusionEngine, GeomEngine, ScreenEngine, OmegaPhiEngine, OmegaFlameEngine)
+}
+
+
+# ---------------------------------------------------------------------------
+# Supervision
+# ---------------------------------------------------------------------------
+
+class EngineRunner:
+    """
+    Runs one engine on its own thread and restarts it when it raises.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Engine], ctx: Context,
+                 backoff: float = 0.5, max_backoff: float = 30.0,
+                 healthy_seconds: float = 60.0, max_restarts: int = 0):
+        self.name = name
+        self.factory = factory
+        self.ctx = ctx
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.healthy_seconds = float(healthy_seconds)
+        self.max_restarts = int(max_restarts)
+        self.restarts = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.thread = threading.Thread(target=self._main, name="engine-" + name, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self.thread.join(timeout)
+
+    def _main(self) -> None:
+        stop = self.ctx.stop
+        delay = self.backoff
+        while not stop.is_set():
+            engine = None
+            began = time.monotonic()
+            try:
+                engine = self.factory()
+                engine.start()
+                engine.run()
+                return
+            except ImportError as e:
+                # A missing optional dependency will not fix itself.
+                self.failures += 1
+                self.last_error = "{}: {}".format(type(e).__name__, e)
+                sys.stderr.write("[supervisor] {} unavailable: {}\n".format(self.name, self.last_error))
+                return
+            except Exception as e:
+                self.failures += 1
+                self.last_error = "{}: {}".format(type(e).__name__, e)
+                sys.stderr.write("[supervisor] {} failed: {}\n".format(self.name, self.last_error))
+                traceback.print_exc()
+            finally:
+                if engine is not None:
+                    try:
+                        engine.stop()
+                    except Exception as e:
+                        sys.stderr.write("[supervisor] {} stop failed: {}\n".format(self.name, e))
+
+            if stop.is_set():
+                return
+            if self.max_restarts and self.restarts >= self.max_restarts:
+                sys.stderr.write("[supervisor] {} gave up after {} restarts\n".format(self.name, self.restarts))
+                return
+            if time.monotonic() - began >= self.healthy_seconds:
+                delay = self.backoff
+            sys.stderr.write("[supervisor] restarting {} in {:.1f}s\n".format(self.name, delay))
+            if stop.wait(delay):
+                return
+            delay = min(self.max_backoff, delay * 2.0)
+            self.restarts += 1
+            RESTARTS.inc()
+
+
+class Supervisor:
+    def __init__(self, cfg: Dict[str, Any]):
+        self.cfg = cfg
+        self.stop = threading.Event()
+        self.state = SharedState()
+        self.ctx = Context(cfg["root"], self.state, self.stop)
+        self.runners: List[EngineRunner] = []
+
+    def enabled(self) -> List[str]:
+        engines = self.cfg.get("engines", {})
+        return [name for name in ENGINES if engines.get(name, {}).get("enabled")]
+
+    def start(self) -> None:
+        restart = self.cfg.get("restart", {})
+        for name in self.enabled():
+            opts = self.cfg["engines"][name]
+            runner = EngineRunner(
+                name,
+                lambda cls=ENGINES[name], o=opts: cls(self.ctx, o),
+                self.ctx,
+                backoff=restart.get("backoff", 0.5),
+                max_backoff=restart.get("max_backoff", 30.0),
+                healthy_seconds=restart.get("healthy_seconds", 60.0),
+                max_restarts=restart.get("max_restarts", 0),
+            )
+            self.runners.append(runner)
+            runner.start()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self.stop.set()
+        deadline = time.monotonic() + timeout
+        for r in self.runners:
+            r.join(max(0.0, deadline - time.monotonic()))
+
+    def wait(self) -> None:
+        """
+        Block until stop is set or every engine thread has ended.
+        """
+        while not self.stop.wait(0.5):
+            if not any(r.thread.is_alive() for r in self.runners):
+                break
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    sky_profiler.install("sky_supervisor")
+    parser = argparse.ArgumentParser(description="Host the sky engines in one process.")
+    parser.add_argument("--config", default=CONFIG_JSON)
+    parser.add_argument("--enable", nargs="*", default=[], choices=sorted(ENGINES))
+    parser.add_argument("--disable", nargs="*", default=[], choices=sorted(ENGINES))
+    parser.add_argument("--list", action="store_true", help="print engines + effective config and exit")
+    args = parser.parse_args(argv)
+
+    cfg = load_config(args.config)
+    for name in args.enable:
+        cfg["engines"].setdefault(name, {})["enabled"] = True
+    for name in args.disable:
+        cfg["engines"].setdefault(name, {})["enabled"] = False
+
+    if args.list:
+        print(json.dumps(cfg, indent=2))
+        return
+
+    sky_metrics.serve("sky_supervisor")
+    sup = Supervisor(cfg)
+
+    def on_signal(signum, frame):
+        sup.stop.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    print("8XD supervisor")
+    print("  Root    :", cfg["root"])
+    print("  Engines :", ", ".join(sup.enabled()) or "(none)")
+    sup.start()
+    sup.wait()
+    sup.shutdown()
+    for r in sup.runners:
+        state = "alive" if r.thread.is_alive() else "stopped"
+        print("  {:<12}: {} (restarts {}, failures {})".format(r.name, state, r.restarts, r.failures))
+    print("Stopped 8XD supervisor.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+package com.lukesky;
+
+import org.bukkit.plugin.Plugin;
+import org.json.simple.JSONObject;
+import org.json.simple.parser.JSONParser;
+
+import java.io.DataInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+
+/**
+ * BakedMapTiles
+ *
+ * Loads the pre-quantized map tiles written by map_tile_baker.py
+ * (resources/map_tiles/*.bin + index.json). Level 0 is a raw 128x128
+ * map-palette byte array, so no JPEG decode / scale / quantize happens
+ * at plugin startup.
+ */
+public final class BakedMapTiles {
+
+    private static final int MAGIC = 0x3858444D; // "8XDM"
+
+    private BakedMapTiles() {}
+
+    /**
+     * @param name image stem, e.g. "1" for 1.jpg
+     * @return 128*128 palette bytes (row-major, y then x) or null if missing
+     */
+    public static byte[] load(Plugin plugin, String name) {
+        String file = resolveFile(plugin, name);
+        if (file == null) {
+            return null;
+        }
+        try (InputStream in = plugin.getResource("map_tiles/" + file)) {
+            if (in == null) {
+                return null;
+            }
+            return readLevel0(new DataInputStream(in));
+        } catch (IOException ex) {
+            plugin.getLogger().warning("Failed to read baked map tile " + file + ": " + ex.getMessage());
+            return null;
+        }
+    }
+
+    private static String resolveFile(Plugin plugin, String name) {
+        try (InputStream in = plugin.getResource("map_tiles/index.json")) {
+            if (in == null) {
+                return null;
+            }
+            Object parsed = new JSONParser().parse(new InputStreamReader(in, "UTF-8"));
+            if (!(parsed instanceof JSONObject)) {
+                return null;
+            }
+            JSONObject names = (JSONObject) ((JSONObject) parsed).get("names");
+            if (names == null || names.get(name) == null) {
+                return null;
+            }
+            return names.get(name) + ".bin";
+        } catch (Exception ex) {
+            plugin.getLogger().warning("Failed to read map_tiles/index.json: " + ex.getMessage());
+            return null;
+        }
+    }
+
+    private static byte[] readLevel0(DataInputStream in) throws IOException {
+        if (in.readInt() != MAGIC) {
+            throw new IOException("bad magic");
+        }
+        in.readUnsignedByte(); // version
+        in.readUnsignedByte(); // dither
+        int levels = in.readUnsignedByte();
+        in.readUnsignedByte(); // reserved
+        in.readFully(new byte[32]); // source sha256
+        if (levels < 1) {
+            throw new IOException("no mip levels");
+        }
+        int size = in.readUnsignedShort();
+        if (size != 128) {
+            throw new IOException("level 0 is " + size + "x" + size + ", expected 128x128");
+        }
+        byte[] pixels = new byte[size * size];
+        in.readFully(pixels);
+        return pixels;
+    }
+}
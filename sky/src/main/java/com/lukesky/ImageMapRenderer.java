@@ -12,11 +12,22 @@ import java.awt.image.BufferedImage;
 public class ImageMapRenderer extends MapRenderer {
 
     private final BufferedImage source;
+    private final byte[] baked;
     private boolean rendered = false;
 
     public ImageMapRenderer(BufferedImage src) {
         super(false);
         this.source = scaleToMap(src);
+        this.baked = null;
+    }
+
+    /**
+     * Pre-quantized 128x128 palette bytes from BakedMapTiles (row-major).
+     */
+    public ImageMapRenderer(byte[] bakedPixels) {
+        super(false);
+        this.source = null;
+        this.baked = bakedPixels;
     }
 
     private BufferedImage scaleToMap(BufferedImage original) {
@@ -31,6 +42,15 @@ public class ImageMapRenderer extends MapRenderer {
     @Override
     public void render(MapView map, MapCanvas canvas, Player player) {
         if (rendered) return;
+        if (baked != null) {
+            for (int y = 0; y < 128; y++) {
+                for (int x = 0; x < 128; x++) {
+                    canvas.setPixel(x, y, baked[y * 128 + x]);
+                }
+            }
+            rendered = true;
+            return;
+        }
         for (int x = 0; x < 128; x++) {
             for (int y = 0; y < 128; y++) {
                 int rgb = source.getRGB(x, y);